@@ -7,7 +7,6 @@ Alerts on Telegram for confidence ≥80%
 
 import json
 import sqlite3
-import requests
 import sys
 import os
 from datetime import datetime, timezone
@@ -17,6 +16,10 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from market_filters import should_skip_market
 
+# Shared HTTP client (pooling, rate limiting, retries) lives in workspace/scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'workspace', 'scripts'))
+import http_client
+
 
 # Load environment variables from .env file
 def load_env_file(env_path='/workspace/.env'):
@@ -69,7 +72,7 @@ def get_db():
 def check_market_timing(event_slug):
     """Check if market is in valid time window (7 days to 6 months)"""
     try:
-        response = requests.get(f"https://gamma-api.polymarket.com/events?slug={event_slug}", timeout=5)
+        response = http_client.get(f"https://gamma-api.polymarket.com/events?slug={event_slug}", timeout=5)
         if response.status_code == 200:
             events = response.json()
             if events and len(events) > 0:
@@ -103,7 +106,7 @@ def validate_market(market_slug):
     """Verify market exists on Polymarket before trading"""
     try:
         url = f"https://polymarket.com/event/{market_slug}"
-        response = requests.head(url, timeout=5, allow_redirects=True)
+        response = http_client.head(url, timeout=5, allow_redirects=True)
         
         # Check if market page exists (200 OK)
         if response.status_code == 200:
@@ -176,7 +179,7 @@ def open_position(signal_id, signal_type, confidence, market_slug, market_questi
         
         # Try to get timing info
         try:
-            response = requests.get(f"https://gamma-api.polymarket.com/events?slug={event_slug}", timeout=3)
+            response = http_client.get(f"https://gamma-api.polymarket.com/events?slug={event_slug}", timeout=3)
             if response.status_code == 200:
                 events = response.json()
                 if events and len(events) > 0:
@@ -213,7 +216,7 @@ def open_position(signal_id, signal_type, confidence, market_slug, market_questi
 def log_to_mission_control(action, details, status='success'):
     """Post activity to Mission Control"""
     try:
-        requests.post(MISSION_CONTROL_API, json={
+        http_client.post(MISSION_CONTROL_API, json={
             'type': 'trading',
             'action': action,
             'details': json.dumps(details),
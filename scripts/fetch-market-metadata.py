@@ -4,18 +4,23 @@ Fetch Market Metadata from Polymarket API
 Gets endDate, full questions, and other important market info
 """
 
+import os
+import sys
 import sqlite3
-import requests
 import json
 from datetime import datetime
 
+# Shared HTTP client (pooling, rate limiting, retries) lives in workspace/scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'workspace', 'scripts'))
+import http_client
+
 TRADING_DB = '/workspace/polymarket_runtime/data/trading.db'
 GAMMA_API = 'https://gamma-api.polymarket.com'
 
 def fetch_event_metadata(event_slug):
     """Fetch event metadata from Polymarket API"""
     try:
-        response = requests.get(f"{GAMMA_API}/events?slug={event_slug}")
+        response = http_client.get(f"{GAMMA_API}/events?slug={event_slug}")
         if response.status_code == 200:
             events = response.json()
             if events and len(events) > 0:
@@ -5,11 +5,15 @@ Consults latest news context before opening positions
 """
 
 import os
-import requests
+import sys
 import json
 import re
 from typing import Dict, Optional
 
+# Shared HTTP client (pooling, rate limiting, retries) lives in workspace/scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'workspace', 'scripts'))
+import http_client
+
 
 # Load environment variables from .env file
 import os
@@ -46,7 +50,7 @@ def call_grok(prompt: str, temperature: float = 0.3) -> Optional[str]:
     }
     
     try:
-        response = requests.post(GROK_API_URL, headers=headers, json=payload, timeout=30)
+        response = http_client.post(GROK_API_URL, headers=headers, json=payload, timeout=30)
         response.raise_for_status()
         return response.json()['choices'][0]['message']['content']
     except Exception as e:
@@ -4,9 +4,13 @@ Cheap Grok calls using grok-3-mini for frequent position monitoring
 """
 
 import os
-import requests
+import sys
 from typing import Optional
 
+# Shared HTTP client (pooling, rate limiting, retries) lives in workspace/scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'workspace', 'scripts'))
+import http_client
+
 
 # Load environment variables from .env file
 import os
@@ -42,7 +46,7 @@ def call_grok_mini(prompt: str, temperature: float = 0.3) -> Optional[str]:
     }
     
     try:
-        response = requests.post(GROK_API_URL, headers=headers, json=payload, timeout=20)
+        response = http_client.post(GROK_API_URL, headers=headers, json=payload, timeout=20)
         response.raise_for_status()
         return response.json()['choices'][0]['message']['content']
     except Exception as e:
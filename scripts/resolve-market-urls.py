@@ -5,11 +5,16 @@ The trade feed gives us condition IDs (market slugs) but the website URLs use ev
 This script queries Polymarket's API to find the correct event slug for each market.
 """
 
+import os
+import sys
 import sqlite3
-import requests
 import json
 import time
 
+# Shared HTTP client (pooling, rate limiting, retries) lives in workspace/scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'workspace', 'scripts'))
+import http_client
+
 TRADING_DB = '/workspace/polymarket_runtime/data/trading.db'
 GAMMA_API = 'https://gamma-api.polymarket.com'
 
@@ -21,7 +26,7 @@ def search_event_by_market_question(question):
     
     try:
         # Search events
-        response = requests.get(f"{GAMMA_API}/events?limit=100&active=true")
+        response = http_client.get(f"{GAMMA_API}/events?limit=100&active=true")
         if response.status_code == 200:
             events = response.json()
             
@@ -32,7 +37,7 @@ def search_event_by_market_question(question):
                         return event.get('slug'), event.get('id')
         
         # Try with closed events too
-        response = requests.get(f"{GAMMA_API}/events?limit=100&closed=true")
+        response = http_client.get(f"{GAMMA_API}/events?limit=100&closed=true")
         if response.status_code == 200:
             events = response.json()
             
@@ -5,12 +5,17 @@ Reads signals, opens paper positions automatically for confidence ≥70%
 Alerts on Telegram for confidence ≥80%
 """
 
+import os
+import sys
 import json
 import sqlite3
-import requests
 from datetime import datetime
 from pathlib import Path
 
+# Shared HTTP client (pooling, rate limiting, retries) lives in workspace/scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'workspace', 'scripts'))
+import http_client
+
 # Configuration
 SIGNALS_FILE = '/workspace/signals/aggregated-signals.json'
 TRADING_DB = '/workspace/polymarket_runtime/data/trading.db'  # Shared with dashboard
@@ -35,7 +40,7 @@ def validate_market(market_slug):
     """Verify market exists on Polymarket before trading"""
     try:
         url = f"https://polymarket.com/event/{market_slug}"
-        response = requests.head(url, timeout=5, allow_redirects=True)
+        response = http_client.head(url, timeout=5, allow_redirects=True)
         
         # Check if market page exists (200 OK)
         if response.status_code == 200:
@@ -119,7 +124,7 @@ def open_position(signal_id, signal_type, confidence, market_slug, market_questi
 def log_to_mission_control(action, details, status='success'):
     """Post activity to Mission Control"""
     try:
-        requests.post(MISSION_CONTROL_API, json={
+        http_client.post(MISSION_CONTROL_API, json={
             'type': 'trading',
             'action': action,
             'details': json.dumps(details),
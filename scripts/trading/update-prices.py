@@ -4,11 +4,16 @@ Price Updater - Fetches current market prices and updates P&L for open positions
 Runs every ~30 minutes to keep paper trading P&L accurate
 """
 
+import os
 import sqlite3
-import requests
 import json
+import sys
 from datetime import datetime
 
+# Shared HTTP client (pooling, rate limiting, retries) lives in workspace/scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'workspace', 'scripts'))
+import http_client
+
 # Configuration
 TRADING_DB = '/workspace/polymarket_runtime/data/trading.db'
 POLYMARKET_API = 'https://gamma-api.polymarket.com'
@@ -41,7 +46,7 @@ def fetch_market_price(market_slug, outcome):
     try:
         # Try to get market data from Polymarket
         url = f"{POLYMARKET_API}/markets/{market_slug}"
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=10)
         
         if response.status_code != 200:
             print(f"   ⚠️  Market {market_slug} returned {response.status_code}")
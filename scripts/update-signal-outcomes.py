@@ -3,13 +3,17 @@
 Check resolved markets and update signal outcomes
 Calculates signal accuracy and edge
 """
+import os
 import sqlite3
 import sys
-import requests
 import time
 from pathlib import Path
 from datetime import datetime
 
+# Shared HTTP client (pooling, rate limiting, retries) lives in workspace/scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'workspace', 'scripts'))
+import http_client
+
 # Detect base directory and database location
 if Path("/opt/polymarket/data/trading.db").exists():
     DB_PATH = Path("/opt/polymarket/data/trading.db")
@@ -32,7 +36,7 @@ def get_market_outcome(market_slug):
     """
     try:
         # Try CLOB API first
-        response = requests.get(f"{CLOB_API}/markets/{market_slug}", timeout=10)
+        response = http_client.get(f"{CLOB_API}/markets/{market_slug}", timeout=10)
         if response.status_code == 200:
             data = response.json()
             
@@ -185,9 +189,6 @@ def update_outcomes():
                     WHERE signal_id = ?
                 """, (int(time.time()), signal_id))
                 conn.commit()
-            
-            # Rate limit
-            time.sleep(0.5)
         
         conn.close()
         
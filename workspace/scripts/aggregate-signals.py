@@ -6,9 +6,44 @@ Runs all signal detectors and combines results
 
 import sys
 import json
+import os
+import sqlite3
+import time
+import multiprocessing
+from multiprocessing.connection import wait
 from datetime import datetime
 import importlib.util
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from signal_fusion import fuse_signals
+import confidence_scoring
+import whale_weights
+
+DB_PATH = '/home/clawdbot/polymarket_runtime/data/trades.db'
+SIGNALS_FILE = '/workspace/signals/aggregated-signals.json'
+CACHE_FILE = '/workspace/signals/detector-cache.json'
+
+# (result key, script, function, kwargs, deadline seconds, input windows in seconds, min trade size)
+# The input windows must cover every trade the detector reads and every time
+# cutoff it applies, so an unchanged fingerprint means an unchanged result.
+DETECTORS = [
+    ('whale_clusters', '/workspace/scripts/detect-whale-clusters.py', 'detect_clusters', {'lookback_hours': 2}, 60,
+     (2 * 3600 + 14400, 2 * 3600), 2000),  # lookback + widest cluster window; the cluster-end cutoff
+    ('smart_money_divergence', '/workspace/scripts/detect-smart-money-divergence.py', 'detect_divergence', {'lookback_hours': 4}, 60,
+     (4 * 3600,), 3000),
+    ('momentum_reversals', '/workspace/scripts/detect-momentum-reversal.py', 'detect_reversals', {'lookback_hours': 6}, 90,
+     (6 * 3600,), 0),
+]
+
+# State each detector reads besides its trade window, folded into its fingerprint:
+# file mtimes, and for trades.db summaries the trade_cursors position of their batch job
+SIDE_INPUTS = {
+    'whale_clusters': ('confidence_weights', 'whale_index', 'co_trading', 'wallet_features'),
+    'smart_money_divergence': ('confidence_weights',),
+    'momentum_reversals': ('confidence_weights',),
+}
+SUMMARY_CURSORS = ('co_trading', 'wallet_features')
+
 def load_module(filepath, module_name):
     """Load a Python file as a module"""
     spec = importlib.util.spec_from_file_location(module_name, filepath)
@@ -16,10 +51,180 @@ def load_module(filepath, module_name):
     spec.loader.exec_module(module)
     return module
 
-# Load detectors
-whale_detector = load_module('/workspace/scripts/detect-whale-clusters.py', 'whale_detector')
-divergence_detector = load_module('/workspace/scripts/detect-smart-money-divergence.py', 'divergence_detector')
-reversal_detector = load_module('/workspace/scripts/detect-momentum-reversal.py', 'reversal_detector')
+def _run_detector(filepath, func_name, kwargs, conn):
+    """Child process: load one detector, run it, send (status, result, seconds) back"""
+    start = time.time()
+    try:
+        module = load_module(filepath, func_name)
+        result = getattr(module, func_name)(**kwargs)
+        conn.send(('ok', result, time.time() - start))
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}", time.time() - start))
+    finally:
+        conn.close()
+
+def _mtime(path):
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+def side_input_state(conn, db_path=DB_PATH):
+    """Current version of every SIDE_INPUTS source"""
+    state = {
+        'confidence_weights': _mtime(confidence_scoring.WEIGHTS_FILE),
+        'whale_index': _mtime(whale_weights.default_index_path(db_path)),
+    }
+    state.update(dict.fromkeys(SUMMARY_CURSORS))
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'trade_cursors'").fetchone():
+        state.update(conn.execute(f"""
+            SELECT name, last_rowid FROM trade_cursors
+            WHERE name IN ({', '.join('?' * len(SUMMARY_CURSORS))})
+        """, SUMMARY_CURSORS).fetchall())
+    return state
+
+def input_fingerprints(detectors=DETECTORS, db_path=DB_PATH, now=None):
+    """
+    (newest trade timestamp, trade count, total sizeUsd) of each of a
+    detector's input windows, then the date (market_filters' date rules) and
+    the versions of its SIDE_INPUTS
+    Content-based rather than rowid-based: the collector's INSERT OR REPLACE
+    gives an unchanged trade a new rowid. A trade crossing any window edge -
+    including a detector's cutoff on a quiet market - changes the fingerprint.
+    One range query on the timestamp index covers every detector. Returns {}
+    if trades.db can't be read, which makes every detector run.
+    """
+    now = int(time.time()) if now is None else now
+    
+    columns = []
+    params = []
+    for key, filepath, func_name, kwargs, timeout, windows, min_size in detectors:
+        for window in windows:
+            condition = "timestamp > ? AND sizeUsd >= ?"
+            columns.append(f"MAX(CASE WHEN {condition} THEN timestamp END), "
+                           f"COUNT(CASE WHEN {condition} THEN 1 END), "
+                           f"ROUND(TOTAL(CASE WHEN {condition} THEN sizeUsd END), 2)")
+            params.extend([now - window, min_size] * 3)
+    oldest = now - max(max(detector[5]) for detector in detectors)
+    day = datetime.fromtimestamp(now).date().isoformat()
+    
+    try:
+        conn = sqlite3.connect(db_path)
+        row = conn.execute(f"""
+            SELECT {', '.join(columns)}
+            FROM trades
+            WHERE timestamp > ?
+        """, params + [oldest]).fetchone()
+        side = side_input_state(conn, db_path)
+        conn.close()
+    except (sqlite3.Error, OSError) as e:
+        print(f"⚠️  Could not fingerprint detector inputs: {e}")
+        return {}
+    
+    fingerprints = {}
+    i = 0
+    for detector in detectors:
+        n = 3 * len(detector[5])
+        fingerprints[detector[0]] = (list(row[i:i + n]) + [day]
+                                     + [side[name] for name in SIDE_INPUTS.get(detector[0], ())])
+        i += n
+    return fingerprints
+
+def load_cache():
+    """Last successful result and input fingerprint per detector"""
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    """Write the detector cache atomically"""
+    tmp = CACHE_FILE + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp, CACHE_FILE)
+
+def run_detectors(detectors=DETECTORS, fingerprints=None, cache=None):
+    """
+    Run every detector in its own process, concurrently
+    Detectors whose input fingerprint matches the cached one reuse the cached
+    result without starting a process. Detectors that miss their deadline are
+    terminated; the rest still count.
+    Returns {key: signals} and {key: {'status', 'seconds'}}
+    """
+    fingerprints = fingerprints or {}
+    cache = {} if cache is None else cache
+    start = time.time()
+    results = {key: [] for key, *_ in detectors}
+    timings = {}
+    pending = {}  # receiving end -> (key, process, deadline)
+    
+    for key, filepath, func_name, kwargs, timeout, windows, min_size in detectors:
+        cached = cache.get(key)
+        if key in fingerprints and cached and cached['fingerprint'] == fingerprints[key]:
+            results[key] = cached['signals']
+            timings[key] = {'status': 'cached', 'seconds': 0.0}
+            print(f"   💤 {key}: inputs unchanged, reusing {len(cached['signals'])} signal(s)")
+            continue
+        
+        recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=_run_detector,
+                                          args=(filepath, func_name, kwargs, send_conn), daemon=True)
+        process.start()
+        send_conn.close()
+        pending[recv_conn] = (key, process, start + timeout)
+    
+    while pending:
+        next_deadline = min(deadline for _, _, deadline in pending.values())
+        ready = wait(list(pending), timeout=max(next_deadline - time.time(), 0))
+        
+        for conn in ready:
+            key, process, _ = pending.pop(conn)
+            try:
+                status, payload, seconds = conn.recv()
+            except EOFError:
+                status, payload, seconds = 'error', 'detector process exited without a result', time.time() - start
+            conn.close()
+            process.join()
+            
+            if status == 'ok':
+                results[key] = payload
+                if key in fingerprints:
+                    cache[key] = {'fingerprint': fingerprints[key], 'signals': payload}
+                print(f"   ✅ {key}: {len(payload)} signal(s) in {seconds:.1f}s")
+            else:
+                print(f"   ❌ {key}: {payload}")
+            timings[key] = {'status': status, 'seconds': round(seconds, 2)}
+        
+        # Kill anything past its own deadline
+        now = time.time()
+        for conn, (key, process, deadline) in list(pending.items()):
+            if now >= deadline:
+                process.terminate()
+                process.join()
+                conn.close()
+                del pending[conn]
+                print(f"   ⏱️  {key}: timed out after {now - start:.0f}s")
+                timings[key] = {'status': 'timeout', 'seconds': round(now - start, 2)}
+    
+    return results, timings
+
+def combine_signal(sig_type, sig):
+    """Normalize one detector signal into the top_signals format auto-trader reads"""
+    if sig_type == 'whale_cluster':
+        action, price = sig['side'], sig['avg_price']
+    elif sig_type == 'smart_money_divergence':
+        action, price = sig['divergence']['signal'], sig['divergence']['market_price']
+    else:  # momentum_reversal
+        action, price = sig['reversal']['signal'], sig['current_price']
+    
+    return {
+        'type': sig_type,
+        'confidence': sig['confidence'],
+        'market_slug': sig['market_slug'],
+        'market_question': sig['market_question'],
+        'signal': f"{action} {sig['outcome']}",
+        'price': price,
+        'details': sig
+    }
 
 def aggregate_all_signals():
     """Run all detectors and combine signals"""
@@ -32,77 +237,46 @@ def aggregate_all_signals():
         'top_signals': []
     }
     
-    print("🔍 Running all signal detectors...\n")
+    print("🔍 Running all signal detectors in parallel...\n")
     
-    # Whale Clustering
-    print("1️⃣ Checking whale clusters...")
-    try:
-        whale_signals = whale_detector.detect_clusters(lookback_hours=2)
-        all_signals['whale_clusters'] = whale_signals
-        print(f"   ✅ Found {len(whale_signals)} whale cluster signal(s)")
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
+    start = time.time()
+    fingerprints = input_fingerprints()
+    cache = load_cache()
+    results, timings = run_detectors(fingerprints=fingerprints, cache=cache)
     
-    # Smart Money Divergence
-    print("2️⃣ Checking smart money divergence...")
-    try:
-        divergence_signals = divergence_detector.detect_divergence(lookback_hours=4)
-        all_signals['smart_money_divergence'] = divergence_signals
-        print(f"   ✅ Found {len(divergence_signals)} divergence signal(s)")
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
+    # Nothing new anywhere: keep the existing file instead of rewriting it
+    if all(t['status'] == 'cached' for t in timings.values()) and os.path.exists(SIGNALS_FILE):
+        try:
+            with open(SIGNALS_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
     
-    # Momentum Reversals
-    print("3️⃣ Checking momentum reversals...")
     try:
-        reversal_signals = reversal_detector.detect_reversals(lookback_hours=6)
-        all_signals['momentum_reversals'] = reversal_signals
-        print(f"   ✅ Found {len(reversal_signals)} reversal signal(s)")
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
+        save_cache(cache)
+    except OSError as e:
+        print(f"⚠️  Could not save detector cache: {e}")
+    
+    all_signals.update(results)
+    all_signals['detector_timings'] = timings
+    all_signals['aggregation_seconds'] = round(time.time() - start, 2)
+    
+    whale_signals = results['whale_clusters']
+    divergence_signals = results['smart_money_divergence']
+    reversal_signals = results['momentum_reversals']
     
     # Combine and rank all signals
-    combined = []
-    
-    for sig in whale_signals:
-        combined.append({
-            'type': 'whale_cluster',
-            'confidence': sig['confidence'],
-            'market_slug': sig['market_slug'],
-            'market_question': sig['market_question'],
-            'signal': f"{sig['side']} {sig['outcome']}",
-            'price': sig['avg_price'],
-            'details': sig
-        })
-    
-    for sig in divergence_signals:
-        combined.append({
-            'type': 'smart_money_divergence',
-            'confidence': sig['confidence'],
-            'market_slug': sig['market_slug'],
-            'market_question': sig['market_question'],
-            'signal': f"{sig['divergence']['signal']} {sig['outcome']}",
-            'price': sig['divergence']['market_price'],
-            'details': sig
-        })
-    
-    for sig in reversal_signals:
-        combined.append({
-            'type': 'momentum_reversal',
-            'confidence': sig['confidence'],
-            'market_slug': sig['market_slug'],
-            'market_question': sig['market_question'],
-            'signal': f"{sig['reversal']['signal']} {sig['outcome']}",
-            'price': sig['current_price'],
-            'details': sig
-        })
-    
-    # Sort by confidence
-    combined.sort(key=lambda x: x['confidence'], reverse=True)
-    all_signals['top_signals'] = combined[:10]  # Top 10
+    combined = [combine_signal('whale_cluster', sig) for sig in whale_signals]
+    combined += [combine_signal('smart_money_divergence', sig) for sig in divergence_signals]
+    combined += [combine_signal('momentum_reversal', sig) for sig in reversal_signals]
+    
+    # One signal per market/bet, ranked by fused confidence
+    fused = fuse_signals(combined)
+    all_signals['top_signals'] = fused[:10]  # Top 10
+    all_signals['fused_duplicates'] = len(combined) - len(fused)
     
     # Save to file
-    with open('/workspace/signals/aggregated-signals.json', 'w') as f:
+    with open(SIGNALS_FILE, 'w') as f:
         json.dump(all_signals, f, indent=2)
     
     return all_signals
@@ -129,6 +303,8 @@ def format_summary(signals):
         for i, sig in enumerate(signals['top_signals'][:5], 1):
             emoji = "🔥" if sig['confidence'] >= 85 else "⚡" if sig['confidence'] >= 70 else "📊"
             output += f"{emoji} #{i} - {sig['type'].replace('_', ' ').title()} ({sig['confidence']}%)\n"
+            if len(sig.get('detectors', [])) > 1:
+                output += f"   Confirmed by: {', '.join(d.replace('_', ' ') for d in sig['detectors'][1:])}\n"
             output += f"   Market: {sig['market_question'][:65]}...\n"
             output += f"   Signal: {sig['signal']} @ {sig['price']:.2f}\n"
             output += f"   🔗 polymarket.com/{sig['market_slug']}\n\n"
@@ -138,4 +314,4 @@ def format_summary(signals):
 if __name__ == "__main__":
     signals = aggregate_all_signals()
     print(format_summary(signals))
-    print(f"💾 Saved full results to /workspace/signals/aggregated-signals.json")
+    print(f"💾 Saved full results to {SIGNALS_FILE}")
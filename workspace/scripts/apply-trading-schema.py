@@ -3,6 +3,8 @@
 
 import sqlite3
 
+import as_of
+
 DB_PATH = '/home/clawdbot/polymarket_runtime/data/trading.db'  # Shared with dashboard
 SCHEMA_FILE = '/workspace/projects/polymarket/schema-trading.sql'
 
@@ -15,10 +17,14 @@ def apply_schema():
     conn.commit()
     conn.close()
     
+    # Re-install versioning triggers so they cover any new columns
+    as_of.install(trading_db=DB_PATH)
+    
     print("✅ Trading schema applied successfully")
     print("   - signals table")
     print("   - paper_positions table")
     print("   - portfolio_snapshots table")
+    print("   - row_versions history (as_of.py)")
 
 if __name__ == '__main__':
     apply_schema()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+As-Of Queries
+Point-in-time reads of signals, paper_positions and trades, so a signal or an
+auto-trader decision can be replayed against exactly what the databases held
+at that moment
+
+trading.db: AFTER INSERT/UPDATE/DELETE triggers copy every version of a
+signals / paper_positions row into row_versions (full row as JSON plus a
+valid_from/valid_to interval). Every writer - Python scripts and the
+dashboard alike - is covered without code changes. History starts when the
+triggers are installed; rows that existed then are seeded as of that moment.
+
+trades.db: trades arrive late, and the collector rewrites them with INSERT
+OR REPLACE (a fresh rowid each time), so neither a trade's timestamp nor its
+rowid says when it became visible. trade_first_seen (see trade_cursors)
+records when each trade id first arrived, and an as-of read is
+"arrived_at <= ts" on top of "timestamp <= ts". Trades that predate the log
+count as arriving at their own timestamp.
+
+Usage:
+    python3 as_of.py install                  # (re)create tables and triggers, arm trade_first_seen
+    python3 as_of.py signal <id> [when]       # signal row as of when (default now)
+    python3 as_of.py position <id> [when]
+    python3 as_of.py market <slug> [when]     # signals + positions for a market
+    python3 as_of.py history <table> <id>     # every version of one row
+
+    when: unix seconds or ISO datetime (local time)
+"""
+
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import trade_cursors
+
+TRADING_DB = '/home/clawdbot/polymarket_runtime/data/trading.db'
+TRADES_DB = '/home/clawdbot/polymarket_runtime/data/trades.db'
+
+VERSIONED_TABLES = ('signals', 'paper_positions')
+
+# Unix seconds with sub-second precision (unixepoch('subsec') needs SQLite 3.42)
+NOW_SQL = "((julianday('now') - 2440587.5) * 86400.0)"
+
+
+def install(trading_db=TRADING_DB):
+    """Create the version tables and (re)create triggers; safe to re-run after schema changes"""
+    conn = sqlite3.connect(trading_db)
+    cur = conn.cursor()
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS row_versions (
+            tbl TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            market_slug TEXT,
+            valid_from REAL NOT NULL,
+            valid_to REAL,              -- NULL = current version
+            op TEXT NOT NULL,           -- seed / insert / update
+            data TEXT NOT NULL          -- full row as JSON
+        )
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_row_versions_row
+        ON row_versions(tbl, row_id, valid_from)
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_row_versions_market
+        ON row_versions(tbl, market_slug, valid_from)
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_row_versions_valid_to
+        ON row_versions(tbl, valid_to, valid_from)
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_row_versions_current
+        ON row_versions(tbl, row_id) WHERE valid_to IS NULL
+    """)
+
+    for table in VERSIONED_TABLES:
+        columns = [row[1] for row in cur.execute(f"PRAGMA table_info({table})")]
+        if not columns:
+            continue  # Schema not applied yet
+
+        new_row = "json_object(" + ", ".join(f"'{c}', NEW.{c}" for c in columns) + ")"
+        close_old = f"""
+            UPDATE row_versions SET valid_to = {NOW_SQL}
+            WHERE tbl = '{table}' AND row_id = OLD.id AND valid_to IS NULL;
+        """
+        insert_new = f"""
+            INSERT INTO row_versions (tbl, row_id, market_slug, valid_from, op, data)
+            VALUES ('{table}', NEW.id, NEW.market_slug, {NOW_SQL}, '{{op}}', {new_row});
+        """
+
+        # Recreate so the JSON picks up columns added since the last install
+        for op in ('insert', 'update', 'delete'):
+            cur.execute(f"DROP TRIGGER IF EXISTS {table}_versions_{op}")
+        cur.execute(f"""
+            CREATE TRIGGER {table}_versions_insert AFTER INSERT ON {table}
+            BEGIN {insert_new.format(op='insert')} END
+        """)
+        cur.execute(f"""
+            CREATE TRIGGER {table}_versions_update AFTER UPDATE ON {table}
+            BEGIN {close_old} {insert_new.format(op='update')} END
+        """)
+        cur.execute(f"""
+            CREATE TRIGGER {table}_versions_delete AFTER DELETE ON {table}
+            BEGIN {close_old} END
+        """)
+
+        # Seed rows that have no version yet (history starts now for them)
+        seed_row = "json_object(" + ", ".join(f"'{c}', t.{c}" for c in columns) + ")"
+        cur.execute(f"""
+            INSERT INTO row_versions (tbl, row_id, market_slug, valid_from, op, data)
+            SELECT '{table}', t.id, t.market_slug, {NOW_SQL}, 'seed', {seed_row}
+            FROM {table} t
+            WHERE NOT EXISTS (
+                SELECT 1 FROM row_versions v
+                WHERE v.tbl = '{table}' AND v.row_id = t.id AND v.valid_to IS NULL
+            )
+        """)
+
+    conn.commit()
+    conn.close()
+
+
+def install_trade_log(trades_db=TRADES_DB) -> bool:
+    """
+    Arm the trade_first_seen log on the collector's trades.db
+    Returns False (and writes nothing) until the collector has created trades.
+    """
+    try:
+        conn = sqlite3.connect(f"file:{trades_db}?mode=rw", uri=True)  # Never create trades.db
+    except sqlite3.OperationalError:
+        return False
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'trades'").fetchone():
+        conn.close()
+        return False
+
+    # Superseded by trade_first_seen: drop the per-minute rowid watermarks
+    conn.execute("DROP TRIGGER IF EXISTS trades_arrivals_insert")
+    conn.execute("DROP TABLE IF EXISTS trade_arrivals")
+    trade_cursors.ensure_first_seen(conn)
+    conn.commit()
+    conn.close()
+    return True
+
+
+def _decode(rows) -> List[Dict]:
+    return [json.loads(data) for data, in rows]
+
+
+def get_row(table: str, row_id: int, ts: float, conn=None) -> Optional[Dict]:
+    """One signals / paper_positions row as it was at ts (None if it didn't exist)"""
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(TRADING_DB)
+
+    row = conn.execute("""
+        SELECT data FROM row_versions
+        WHERE tbl = ? AND row_id = ? AND valid_from <= ? AND (valid_to IS NULL OR valid_to > ?)
+        ORDER BY valid_from DESC
+        LIMIT 1
+    """, (table, row_id, ts, ts)).fetchone()
+
+    if own_conn:
+        conn.close()
+    return json.loads(row[0]) if row else None
+
+
+def snapshot(table: str, ts: float, market_slug: Optional[str] = None, conn=None) -> List[Dict]:
+    """Every row of table that was live at ts, optionally for one market"""
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(TRADING_DB)
+
+    if market_slug is not None:
+        rows = conn.execute("""
+            SELECT data FROM row_versions
+            WHERE tbl = ? AND market_slug = ? AND valid_from <= ?
+                AND (valid_to IS NULL OR valid_to > ?)
+            ORDER BY row_id
+        """, (table, market_slug, ts, ts)).fetchall()
+    else:
+        # Two range scans on (tbl, valid_to): still-current rows + rows closed after ts
+        rows = conn.execute("""
+            SELECT data FROM (
+                SELECT row_id, data FROM row_versions
+                WHERE tbl = ? AND valid_to IS NULL AND valid_from <= ?
+                UNION ALL
+                SELECT row_id, data FROM row_versions
+                WHERE tbl = ? AND valid_to > ? AND valid_from <= ?
+            )
+            ORDER BY row_id
+        """, (table, ts, table, ts, ts)).fetchall()
+
+    if own_conn:
+        conn.close()
+    return _decode(rows)
+
+
+def history(table: str, row_id: int, conn=None) -> List[Dict]:
+    """All versions of one row, oldest first, with their validity interval"""
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(TRADING_DB)
+
+    rows = conn.execute("""
+        SELECT op, valid_from, valid_to, data FROM row_versions
+        WHERE tbl = ? AND row_id = ?
+        ORDER BY valid_from
+    """, (table, row_id)).fetchall()
+
+    if own_conn:
+        conn.close()
+    return [{'op': op, 'valid_from': valid_from, 'valid_to': valid_to, 'row': json.loads(data)}
+            for op, valid_from, valid_to, data in rows]
+
+
+def trades_as_of(ts: float, since: int = 0, market_slug: Optional[str] = None,
+                 trades_db=TRADES_DB) -> List[tuple]:
+    """
+    Trades visible at ts with timestamp > since, oldest first
+    (timestamp, trader, marketSlug, outcome, side, price, sizeUsd)
+    Without the first-arrival log only the timestamp bound applies.
+    """
+    conn = sqlite3.connect(trades_db)
+    tracked = conn.execute("""
+        SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'trade_first_seen'
+    """).fetchone()
+
+    if tracked:
+        query = """
+            SELECT t.timestamp, t.trader, t.marketSlug, t.outcome, t.side, t.price, t.sizeUsd
+            FROM trades t
+            JOIN trade_first_seen f ON f.id = t.id
+            WHERE t.timestamp > ? AND t.timestamp <= ? AND f.arrived_at <= ?
+        """
+        params = [since, int(ts), ts]
+        order = " ORDER BY t.timestamp, f.seq"
+    else:
+        query = """
+            SELECT t.timestamp, t.trader, t.marketSlug, t.outcome, t.side, t.price, t.sizeUsd
+            FROM trades t
+            WHERE t.timestamp > ? AND t.timestamp <= ?
+        """
+        params = [since, int(ts)]
+        order = " ORDER BY t.timestamp, t.rowid"
+    if market_slug is not None:
+        query += " AND t.marketSlug = ?"
+        params.append(market_slug)
+
+    rows = conn.execute(query + order, params).fetchall()
+    conn.close()
+    return rows
+
+
+def parse_when(value: str) -> float:
+    """Unix seconds or ISO datetime -> unix seconds"""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    when = parse_when(sys.argv[3]) if len(sys.argv) > 3 else time.time()
+
+    if command == 'install':
+        install()
+        print("✅ Row versioning installed (signals, paper_positions)")
+        if install_trade_log():
+            print("✅ Trade first-arrival log armed on trades.db")
+        else:
+            print("⏭️  trades.db has no trades table yet - run install again once the collector has started")
+    elif command in ('signal', 'position') and len(sys.argv) > 2:
+        table = 'signals' if command == 'signal' else 'paper_positions'
+        row = get_row(table, int(sys.argv[2]), when)
+        print(json.dumps(row, indent=2) if row else f"❌ No {command} #{sys.argv[2]} at {datetime.fromtimestamp(when)}")
+    elif command == 'market' and len(sys.argv) > 2:
+        print(f"🕰️  {sys.argv[2]} as of {datetime.fromtimestamp(when)}")
+        print(json.dumps({
+            'signals': snapshot('signals', when, sys.argv[2]),
+            'paper_positions': snapshot('paper_positions', when, sys.argv[2])
+        }, indent=2))
+    elif command == 'history' and len(sys.argv) > 3:
+        for version in history(sys.argv[2], int(sys.argv[3])):
+            valid_to = datetime.fromtimestamp(version['valid_to']) if version['valid_to'] else 'now'
+            print(f"{version['op']:7} {datetime.fromtimestamp(version['valid_from'])} → {valid_to}")
+            print(f"        {json.dumps(version['row'])}")
+    else:
+        print(__doc__)
@@ -7,7 +7,7 @@ Alerts on Telegram for confidence ≥80%
 
 import json
 import sqlite3
-import requests
+import http_client
 import sys
 import os
 from datetime import datetime, timezone
@@ -16,6 +16,8 @@ from pathlib import Path
 # Add scripts directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from market_filters import should_skip_market
+from signal_fusion import bought_outcome, fuse_signals
+from signal_scheduler import SignalScheduler, signal_time, split_expired
 
 
 # Load environment variables from .env file
@@ -36,6 +38,7 @@ TRADING_DB = '/opt/polymarket/data/trading.db'  # Shared with dashboard
 POSITION_SIZE = 50  # $50 per trade (5% of $1000 portfolio)
 AUTO_TRADE_THRESHOLD = 70  # Auto-trade on ≥70% confidence
 ALERT_THRESHOLD = 80  # Alert on Telegram for ≥80%
+VALIDATION_BATCH = 8  # Signals popped and Grok-validated together (one batched request)
 MISSION_CONTROL_API = 'http://localhost:3001/api/activities'
 
 def translate_to_polymarket_action(signal_action, outcome):
@@ -44,14 +47,8 @@ def translate_to_polymarket_action(signal_action, outcome):
     Polymarket doesn't support shorting - you can only BUY Yes or BUY No.
     To bet against an outcome, you BUY the opposite outcome.
     """
-    if signal_action == 'BUY':
-        return ('BUY', outcome)
-    elif signal_action == 'SELL':
-        # Bet against this outcome = BUY the opposite
-        opposite = 'Yes' if outcome == 'No' else 'No'
-        return ('BUY', opposite)
-    else:
-        return ('BUY', outcome)  # Default to BUY
+    # Bet against an outcome = BUY the opposite (anything else defaults to BUY)
+    return ('BUY', bought_outcome(signal_action, outcome))
 
 
 def load_signals():
@@ -98,6 +95,20 @@ def load_signals():
     
     return {'top_signals': signals}
 
+def retire_signals(signals):
+    """Mark expired signals (and every signal fused into them) so they are not reloaded"""
+    ids = set()
+    for signal in signals:
+        ids.update(s['id'] for s in signal.get('fused_from', []) if 'id' in s)
+        ids.add(signal['id'])
+    
+    conn = get_db()
+    conn.executemany("UPDATE signals SET position_opened = 1 WHERE id = ?", [(i,) for i in ids])
+    conn.commit()
+    conn.close()
+    
+    return len(ids)
+
 def get_db():
     """Get database connection"""
     return sqlite3.connect(TRADING_DB)
@@ -105,7 +116,7 @@ def get_db():
 def check_market_timing(event_slug):
     """Check if market is in valid time window (7 days to 6 months)"""
     try:
-        response = requests.get(f"https://gamma-api.polymarket.com/events?slug={event_slug}", timeout=5)
+        response = http_client.get(f"https://gamma-api.polymarket.com/events?slug={event_slug}", timeout=5)
         if response.status_code == 200:
             events = response.json()
             if events and len(events) > 0:
@@ -139,7 +150,7 @@ def validate_market(market_slug):
     """Verify market exists on Polymarket before trading"""
     try:
         url = f"https://polymarket.com/event/{market_slug}"
-        response = requests.head(url, timeout=5, allow_redirects=True)
+        response = http_client.head(url, timeout=5, allow_redirects=True)
         
         # Check if market page exists (200 OK)
         if response.status_code == 200:
@@ -178,12 +189,13 @@ def has_open_position(market_slug, outcome=None):
     return count > 0
 
 def store_signal(signal_type, confidence, market_slug, market_question, 
-                outcome, direction, price, details):
-    """Store signal in database"""
+                outcome, direction, price, details, timestamp=None):
+    """Store signal in database (timestamp in ms, defaults to now)"""
     conn = get_db()
     cur = conn.cursor()
     
-    timestamp = int(datetime.now().timestamp() * 1000)
+    if timestamp is None:
+        timestamp = int(datetime.now().timestamp() * 1000)
     
     cur.execute("""
         INSERT INTO signals 
@@ -216,7 +228,7 @@ def open_position(signal_id, signal_type, confidence, market_slug, market_questi
         
         # Try to get timing info
         try:
-            response = requests.get(f"https://gamma-api.polymarket.com/events?slug={event_slug}", timeout=3)
+            response = http_client.get(f"https://gamma-api.polymarket.com/events?slug={event_slug}", timeout=3)
             if response.status_code == 200:
                 events = response.json()
                 if events and len(events) > 0:
@@ -253,12 +265,12 @@ def open_position(signal_id, signal_type, confidence, market_slug, market_questi
 def log_to_mission_control(action, details, status='success'):
     """Post activity to Mission Control"""
     try:
-        requests.post(MISSION_CONTROL_API, json={
+        http_client.post(MISSION_CONTROL_API, json={
             'type': 'trading',
             'action': action,
             'details': json.dumps(details),
             'status': status
-        }, timeout=5)
+        }, timeout=5, retries=0)  # Best-effort, never hold up trading
     except Exception as e:
         print(f"⚠️  Failed to log to Mission Control: {e}")
 
@@ -287,25 +299,31 @@ def format_reasoning(signal):
     
     return f"{conf}% confidence signal"
 
-def process_signal(signal):
-    """Process a single signal - store, trade if needed, alert if needed"""
-    signal_type = signal['type']
-    confidence = signal['confidence']
+def get_skip_reason(signal):
+    """Cheap pre-trade filters - returns skip reason or None if signal is tradeable"""
+    skip_reason = market_skip_reason(signal)
+    if skip_reason:
+        return skip_reason
+    
+    # Check if we already have ANY position on this market (prevents taking both sides)
+    if has_open_position(signal['market_slug']):
+        return "already have open position"
+    
+    return None
+
+def market_skip_reason(signal):
+    """Filters that depend only on the signal itself (no database) - reason or None"""
     market_slug = signal['market_slug']
     market_question = signal['market_question']
-    # Parse signal and translate to Polymarket action (BUY only)
-    signal_parts = signal['signal'].split()
-    raw_action = signal_parts[0]  # BUY or SELL from detector
-    raw_outcome = ' '.join(signal_parts[1:])  # Rest is outcome
-    direction, outcome = translate_to_polymarket_action(raw_action, raw_outcome)
-    price = signal['price']
-    details = signal.get('details', {})
+    
+    # Arbitrage signals need both legs filled together - paper trader opens one position
+    if signal['type'] == 'complement_arbitrage':
+        return "Two-leg arbitrage (not a single-position trade)"
     
     # Filter out unwanted markets (past years, high-frequency, sports)
     should_skip, skip_reason = should_skip_market(market_question, market_slug)
     if should_skip:
-        print(f"⏭️  Skipping {market_slug} - {skip_reason}")
-        return None
+        return skip_reason
     
     # Filter out high-frequency markets (too fast for ~30min heartbeat)
     # These markets expire before we can react effectively
@@ -357,34 +375,53 @@ def process_signal(signal):
     slug_lower = market_slug.lower()
     
     if any(pattern in slug_lower or pattern in question_lower for pattern in high_freq_patterns):
-        print(f"⏭️  Skipping {market_slug} - High-frequency market (too fast for our ~30min cycle)")
-        return None
+        return "High-frequency market (too fast for our ~30min cycle)"
     
     if any(pattern in slug_lower or pattern in question_lower for pattern in sports_patterns):
-        print(f"⏭️  Skipping {market_slug} - Sports market (no information edge)")
-        return None
+        return "Sports market (no information edge)"
     
-    # Check if we already have ANY position on this market (prevents taking both sides)
-    if has_open_position(market_slug):
-        print(f"⏭️  Skipping {market_slug} - already have open position")
+    return None
+
+def process_signal(signal, grok_result=None):
+    """Process a single signal - store, trade if needed, alert if needed"""
+    signal_type = signal['type']
+    confidence = signal['confidence']
+    market_slug = signal['market_slug']
+    market_question = signal['market_question']
+    # Parse signal and translate to Polymarket action (BUY only)
+    signal_parts = signal['signal'].split()
+    raw_action = signal_parts[0]  # BUY or SELL from detector
+    raw_outcome = ' '.join(signal_parts[1:])  # Rest is outcome
+    direction, outcome = translate_to_polymarket_action(raw_action, raw_outcome)
+    price = signal['price']
+    details = signal.get('details', {})
+    
+    skip_reason = get_skip_reason(signal)
+    if skip_reason:
+        print(f"⏭️  Skipping {market_slug} - {skip_reason}")
         return None
     
-    # Store signal
+    # Store signal, keeping its emission time so the copy expires with the original
+    emitted = int(signal_time(signal) * 1000) if signal.get('timestamp') else None
     signal_id = store_signal(signal_type, confidence, market_slug, market_question,
-                            outcome, direction, price, details)
+                            outcome, direction, price, details, emitted)
     
     print(f"📊 Signal stored: {signal_type} {confidence}% - {market_question}")
     
     # Auto-trade if confidence ≥70%
     if confidence >= AUTO_TRADE_THRESHOLD:
-        # Validate market exists before opening position
-        if not validate_market(market_slug):
+        # Validate market exists before opening position (run() already checked
+        # every market it pre-validated with Grok)
+        market_valid = grok_result.get('market_valid', True) if grok_result else validate_market(market_slug)
+        if not market_valid:
             print(f"   ⏭️  Skipping position - Market does not exist or is delisted")
             return None
         
         # GROK VALIDATION: Check news context before trading
-        from grok_validator import validate_signal_with_grok
-        grok_result = validate_signal_with_grok(market_question, market_slug, confidence, outcome)
+        # (run() pre-validates in batches; fall back to a single call otherwise)
+        if grok_result is None:
+            from grok_validator import validate_signal_with_grok
+            grok_result = validate_signal_with_grok(market_question, market_slug, confidence, outcome)
         
         if not grok_result['should_trade']:
             print(f"   🛑 Grok validation failed: {grok_result['reasoning']}")
@@ -432,6 +469,54 @@ def process_signal(signal):
     
     return None
 
+def prevalidate_with_grok(signals, markets=None):
+    """
+    Validate tradeable signals with batched Grok requests (signal id -> result)
+    Markets are checked first, so paid Grok calls skip delisted markets, and only
+    the first signal per market is sent - the run can open one position there
+    (later ones are deferred to the next run rather than validated one by one).
+    Pass the same markets set across batches to carry that rule through a run.
+    """
+    candidates = []
+    results = {}
+    markets = set() if markets is None else markets
+    for signal in signals:
+        if signal['confidence'] < AUTO_TRADE_THRESHOLD or get_skip_reason(signal):
+            continue
+        if signal['market_slug'] in markets:
+            results[signal['id']] = {
+                'should_trade': False,
+                'reasoning': 'Deferred - a higher-priority signal on this market goes first',
+                'grok_available': False
+            }
+            continue
+        markets.add(signal['market_slug'])
+        
+        if not validate_market(signal['market_slug']):
+            results[signal['id']] = {
+                'should_trade': False,
+                'market_valid': False,
+                'reasoning': 'Market does not exist or is delisted',
+                'grok_available': False
+            }
+            continue
+        
+        raw_action, _, raw_outcome = signal['signal'].partition(' ')
+        _, outcome = translate_to_polymarket_action(raw_action, raw_outcome)
+        candidates.append({
+            'id': signal['id'],
+            'market_question': signal['market_question'],
+            'market_slug': signal['market_slug'],
+            'confidence': signal['confidence'],
+            'outcome': outcome
+        })
+    
+    if candidates:
+        from grok_validator import validate_signals_batch
+        print(f"   🧠 Grok-validating {len(candidates)} signals in batches...")
+        results.update(validate_signals_batch(candidates))
+    return results
+
 def run():
     """Main auto-trading loop"""
     print("🤖 Auto-Trader Running...")
@@ -440,27 +525,57 @@ def run():
     print(f"   Alert threshold: ≥{ALERT_THRESHOLD}%")
     print()
     
-    # Load signals
+    # Load signals and retire the stale ones before anything touches the network
     data = load_signals()
-    signals = data.get('top_signals', [])
-    
-    if not signals:
+    loaded = data.get('top_signals', [])
+    live, expired = split_expired(loaded)
+    if expired:
+        print(f"   ⌛ Retired {retire_signals(expired)} expired signals (past TTL or market deadline)")
+    
+    # Signals auto-trader would never act on (two-leg arbitrage, filtered
+    # markets) must not corroborate the ones it would
+    tradeable = [s for s in live if not market_skip_reason(s)]
+    if len(tradeable) < len(live):
+        print(f"   ⏭️  Skipping {len(live) - len(tradeable)} signal(s) on untradeable markets")
+    
+    # One signal per market/bet (detectors agreeing on a bet are fused),
+    # queued by expected value x freshness
+    queue = SignalScheduler(fuse_signals(tradeable))
+    
+    if not len(queue):
         print("   No signals detected")
         return []
     
-    print(f"   Processing {len(signals)} signals...")
+    print(f"   Processing {len(queue)} signals...")
+    if len(queue) < len(tradeable):
+        print(f"   (fused {len(tradeable) - len(queue)} duplicate signal(s) from agreeing detectors)")
     print()
     
-    # Process each signal
+    # Best-first until the queue or the cycle's time budget runs out: each
+    # batch is market-checked and Grok-validated only when its turn comes, so
+    # signals deferred to the next cycle cost no HEAD requests or Grok calls
+    queue.start()
     alerts = []
-    for signal in signals:
-        result = process_signal(signal)
-        if result and result['confidence'] >= ALERT_THRESHOLD:
-            alerts.append(result)
+    validated_markets = set()
+    for batch in queue.batches(VALIDATION_BATCH):
+        grok_results = prevalidate_with_grok(batch, validated_markets)
+        for signal in batch:
+            result = process_signal(signal, grok_results.get(signal['id']))
+            if result and result['confidence'] >= ALERT_THRESHOLD:
+                alerts.append(result)
+    
+    if queue.expired:
+        print(f"   ⌛ Retired {retire_signals(queue.expired)} signals that expired during the cycle")
+    if queue.deferred:
+        print(f"   ⏳ Time budget spent - {len(queue.deferred)} live signals left for the next cycle")
     
     print()
     print(f"✅ Auto-trader complete: {len(alerts)} high-confidence positions opened")
     
+    metrics = http_client.format_metrics()
+    if metrics:
+        print(metrics)
+    
     return alerts
 
 if __name__ == '__main__':
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Detector Backtest
+Replays trades.db in timestamp order through the same per-market evaluators
+the detector daemon runs, and paper-trades the resulting signals the way
+auto-trader.py would, so threshold changes can be scored on past data
+
+Strict as-of: a tick at time T sees only trades with timestamp <= T, and only
+the markets that traded since the previous tick are re-evaluated. Positions
+settle at $1/$0 once their market's resolution is on record, otherwise at the
+last traded price when max_hold runs out or the replay ends.
+
+Whale weights, syndicates and wallet features are built from full history, so
+the replay runs without them (no syndicate or established-wallet bonus) rather
+than leak the future into the past.
+Grok validation is not simulated.
+
+Usage:
+    python3 backtest.py            # last 30 days, 30 minute cadence
+    python3 backtest.py 7 15       # last 7 days, 15 minute cadence
+"""
+
+import os
+import sqlite3
+import sys
+import time
+import functools
+import importlib.util
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+TRADES_DB = '/home/clawdbot/polymarket_runtime/data/trades.db'
+DEFAULT_DAYS = 30
+DEFAULT_CADENCE = 1800       # Seconds between detector runs (auto-trader's ~30min cycle)
+FETCH_SIZE = 50000           # Trades pulled from the cursor at a time
+PRUNE_INTERVAL = 6 * 3600    # Drop idle markets from memory every 6 replayed hours
+MMAP_SIZE = 1 << 30          # Read trades through mmap (shared page cache across processes)
+CALIBRATION_BUCKETS = (70, 80, 90, 101)
+
+def load_module(filepath, module_name):
+    """Load a Python file as a module"""
+    spec = importlib.util.spec_from_file_location(module_name, filepath)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+daemon_module = load_module(os.path.join(SCRIPTS_DIR, 'detector-daemon.py'), 'detector_daemon')
+aggregator = load_module(os.path.join(SCRIPTS_DIR, 'aggregate-signals.py'), 'aggregator')
+auto_trader = load_module(os.path.join(SCRIPTS_DIR, 'auto-trader.py'), 'auto_trader')
+import market_filters
+
+# Modules whose constants a run can override, e.g. {'whale_detector.MIN_WHALES': 4}
+# or a whole band table: {'scoring.SCORECARDS': {...}}
+PARAM_MODULES = {
+    'whale_detector': daemon_module.whale_detector,
+    'divergence_detector': daemon_module.divergence_detector,
+    'reversal_detector': daemon_module.reversal_detector,
+    'daemon': daemon_module,
+    'auto_trader': auto_trader,
+    'scoring': daemon_module.whale_detector.confidence_scoring,
+}
+
+class _NoWeights:
+    """Stand-in for the whale weight index during a replay"""
+
+    def lookup_many(self, traders):
+        return [0.0 for _ in traders]
+
+def apply_params(params):
+    """Set module constants from {'module.NAME': value}; returns the previous values"""
+    previous = {}
+    for name, value in (params or {}).items():
+        module_key, attr = name.split('.', 1)
+        module = PARAM_MODULES[module_key]
+        if not hasattr(module, attr):
+            raise AttributeError(f"{module_key} has no parameter {attr}")
+        previous[name] = getattr(module, attr)
+        setattr(module, attr, value)
+    return previous
+
+class Backtester:
+    """Time-ordered replay of trades.db through the detectors and a paper trader"""
+
+    def __init__(self, trades_db=TRADES_DB, cadence=DEFAULT_CADENCE,
+                 max_hold: Optional[int] = None, params: Optional[Dict] = None):
+        self.trades_db = trades_db
+        self.cadence = cadence
+        self.max_hold = max_hold
+        self.params = params or {}
+
+    def run(self, start: int, end: int) -> Dict:
+        """Replay (start, end] and return the report"""
+        # Market filters judge dates against the replay clock, not the wall
+        # clock; their answer only changes with the day, so memoize per day
+        self.clock = start
+        skip_on = functools.lru_cache(maxsize=None)(
+            lambda question, slug, day: market_filters.should_skip_market(
+                question, slug, now=datetime.fromtimestamp(self.clock)))
+
+        def skip(question, slug):
+            return skip_on(question, slug, datetime.fromtimestamp(self.clock).date())
+
+        overrides = {f"{name}.should_skip_market": skip
+                     for name in ('whale_detector', 'divergence_detector', 'auto_trader')}
+        overrides.update(self.params)
+
+        previous = apply_params(overrides)
+        try:
+            return self._replay(start, end)
+        finally:
+            apply_params(previous)
+
+    def _replay(self, start, end):
+        started_at = time.time()
+        self.daemon = daemon_module.DetectorDaemon(self.trades_db)
+        self.daemon.weights = _NoWeights()
+        self.daemon.syndicates = {}
+        self.daemon.features = None
+        self.resolutions = self._load_resolutions()
+        self.last_price = {}       # (slug, outcome) -> last traded price as of the replay clock
+        self.open_positions = {}   # slug -> position (one per market, like auto-trader)
+        self.closed = []
+        self.emitted = set()
+        self.signal_counts = defaultdict(int)
+
+        conn = sqlite3.connect(self.trades_db)
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        rows = conn.execute("""
+            SELECT marketSlug, outcome, timestamp, trader, side, price, sizeUsd,
+                   COALESCE(marketQuestion, 'Unknown')
+            FROM trades
+            WHERE timestamp > ? AND timestamp <= ? AND marketSlug IS NOT NULL
+            ORDER BY timestamp, rowid
+        """, (start - daemon_module.MAX_LOOKBACK, end))
+
+        tick = start
+        pruned_at = start
+        touched = set()
+        replayed = 0
+        for batch in iter(lambda: rows.fetchmany(FETCH_SIZE), []):
+            for slug, outcome, ts, *trade in batch:
+                # Close every tick that ends before this trade
+                while ts > tick:
+                    self._tick(tick, touched)
+                    touched = set()
+                    tick += self.cadence
+                    if tick - pruned_at > PRUNE_INTERVAL:
+                        self.daemon.prune(tick)
+                        pruned_at = tick
+
+                key = (slug, outcome)
+                self.daemon.markets[key].append((ts, *trade))
+                self.last_price[key] = trade[2]
+                if ts > start:
+                    touched.add(key)
+                    replayed += 1
+        conn.close()
+
+        while tick <= end:
+            self._tick(tick, touched)
+            touched = set()
+            tick += self.cadence
+
+        for slug in list(self.open_positions):
+            self._close(slug, end, final=True)
+
+        return self._report(start, end, replayed, time.time() - started_at)
+
+    def _load_resolutions(self):
+        """slug -> (winning outcome, time the resolution was recorded)"""
+        conn = sqlite3.connect(self.trades_db)
+        try:
+            rows = conn.execute("""
+                SELECT market_slug, winning_outcome, resolution_date
+                FROM market_resolutions
+                WHERE resolved = 1 AND winning_outcome IS NOT NULL
+            """).fetchall()
+        except sqlite3.OperationalError:
+            rows = []  # trader_performance.py hasn't created the cache yet
+        conn.close()
+        return {slug: (winner, resolved_at) for slug, winner, resolved_at in rows}
+
+    def _tick(self, now, touched):
+        """Run the detectors on markets that traded since the last tick, then settle"""
+        self.clock = now
+        fresh = []
+        for sig_type, sig in self.daemon.evaluate(sorted(touched), now):
+            if self._is_new(sig_type, sig, now):
+                fresh.append(aggregator.combine_signal(sig_type, sig))
+
+        # auto-trader loads signals at/above its threshold and fuses agreeing detectors
+        candidates = [s for s in fresh if s['confidence'] >= auto_trader.AUTO_TRADE_THRESHOLD]
+        for signal in auto_trader.fuse_signals(candidates):
+            self._enter(signal, now)
+
+        for slug, position in list(self.open_positions.items()):
+            resolution = self.resolutions.get(slug)
+            if resolution and resolution[1] and resolution[1] <= now:
+                self._close(slug, now)
+            elif self.max_hold and now - position['entry_time'] >= self.max_hold:
+                self._close(slug, now)
+
+    def _is_new(self, sig_type, sig, now):
+        """Dedup per type/market/outcome/day like the daemon"""
+        day = datetime.fromtimestamp(now).strftime('%Y-%m-%d')
+        dedup_key = (sig_type, sig['market_slug'], sig['outcome'], day)
+        if dedup_key in self.emitted:
+            return False
+        self.emitted.add(dedup_key)
+        self.signal_counts[sig_type] += 1
+        return True
+
+    def _enter(self, signal, now):
+        """Apply auto-trader's entry rules to one (fused) signal"""
+        slug = signal['market_slug']
+        if (signal['confidence'] < auto_trader.AUTO_TRADE_THRESHOLD
+                or slug in self.open_positions
+                or auto_trader.market_skip_reason(signal)):
+            return
+
+        raw_action, raw_outcome = signal['signal'].split(' ', 1)
+        direction, outcome = auto_trader.translate_to_polymarket_action(raw_action, raw_outcome)
+
+        # Enter at the bought outcome's own last price, not the signal's
+        price = self.last_price.get((slug, outcome))
+        if price is None:
+            opposite = self.last_price.get((slug, 'No' if outcome == 'Yes' else 'Yes'))
+            price = 1 - opposite if opposite is not None else signal['price']
+        if not 0 < price < 1:
+            return
+
+        self.open_positions[slug] = {
+            'type': signal['type'],
+            'confidence': signal['confidence'],
+            'market_slug': slug,
+            'outcome': outcome,
+            'entry_price': price,
+            'entry_time': now,
+            'size': auto_trader.POSITION_SIZE
+        }
+
+    def _close(self, slug, now, final=False):
+        """Settle at the resolution payoff if known, otherwise at the last price"""
+        position = self.open_positions.pop(slug)
+        resolution = self.resolutions.get(slug)
+
+        if resolution and (final or (resolution[1] and resolution[1] <= now)):
+            exit_price = 1.0 if resolution[0] == position['outcome'] else 0.0
+            reason = 'resolved'
+        else:
+            exit_price = self.last_price.get((slug, position['outcome']), position['entry_price'])
+            reason = 'end' if final else 'max_hold'
+
+        pnl = (exit_price - position['entry_price']) * (position['size'] / position['entry_price'])
+        position.update({
+            'exit_price': exit_price,
+            'exit_time': now,
+            'pnl': round(pnl, 2),
+            'roi': round(pnl / position['size'], 4),
+            'close_reason': reason
+        })
+        self.closed.append(position)
+
+    def _report(self, start, end, replayed, elapsed):
+        positions = self.closed
+        invested = sum(p['size'] for p in positions)
+        total_pnl = sum(p['pnl'] for p in positions)
+        wins = sum(1 for p in positions if p['pnl'] > 0)
+
+        by_type = {}
+        for sig_type in sorted(set(self.signal_counts) | {p['type'] for p in positions}):
+            typed = [p for p in positions if p['type'] == sig_type]
+            by_type[sig_type] = {
+                'signals': self.signal_counts[sig_type],
+                **summarize(typed)
+            }
+
+        return {
+            'start': datetime.fromtimestamp(start).isoformat(),
+            'end': datetime.fromtimestamp(end).isoformat(),
+            'cadence_minutes': self.cadence // 60,
+            'params': self.params,
+            'trades_replayed': replayed,
+            'signals': sum(self.signal_counts.values()),
+            'positions': len(positions),
+            'wins': wins,
+            'win_rate': round(wins / len(positions), 3) if positions else None,
+            'total_pnl': round(total_pnl, 2),
+            'roi': round(total_pnl / invested, 4) if invested else None,
+            'resolved_share': round(sum(1 for p in positions if p['close_reason'] == 'resolved')
+                                    / len(positions), 3) if positions else None,
+            'brier_score': brier_score(positions),
+            'by_type': by_type,
+            'calibration': calibration(positions),
+            'elapsed_seconds': round(elapsed, 1)
+        }
+
+def summarize(positions: List[Dict]) -> Dict:
+    """Count / win rate / P&L for a group of closed positions"""
+    wins = sum(1 for p in positions if p['pnl'] > 0)
+    return {
+        'positions': len(positions),
+        'win_rate': round(wins / len(positions), 3) if positions else None,
+        'total_pnl': round(sum(p['pnl'] for p in positions), 2)
+    }
+
+def brier_score(positions: List[Dict]) -> Optional[float]:
+    """Mean (confidence - won)^2, same scoring as calibration-tracker.py"""
+    if not positions:
+        return None
+    return round(sum((p['confidence'] / 100 - (1 if p['pnl'] > 0 else 0)) ** 2
+                     for p in positions) / len(positions), 4)
+
+def calibration(positions: List[Dict]) -> List[Dict]:
+    """Predicted vs realized win rate per confidence bucket"""
+    buckets = []
+    for low, high in zip(CALIBRATION_BUCKETS, CALIBRATION_BUCKETS[1:]):
+        group = [p for p in positions if low <= p['confidence'] < high]
+        if not group:
+            continue
+        buckets.append({
+            'bucket': f"{low}-{min(high - 1, 100)}",
+            'avg_confidence': round(sum(p['confidence'] for p in group) / len(group), 1),
+            **summarize(group)
+        })
+    return buckets
+
+def format_report(report):
+    """Format a backtest report for output"""
+    output = "\n" + "="*60 + "\n"
+    output += f"📼 BACKTEST {report['start'][:16]} → {report['end'][:16]} (every {report['cadence_minutes']}m)\n"
+    output += "="*60 + "\n\n"
+    if report['params']:
+        output += "Params: " + ", ".join(f"{k}={v}" for k, v in report['params'].items()) + "\n"
+    output += f"Replayed {report['trades_replayed']:,} trades in {report['elapsed_seconds']}s\n"
+    output += f"Signals: {report['signals']} → positions: {report['positions']}\n\n"
+
+    if not report['positions']:
+        output += "❌ No positions opened\n"
+        return output
+
+    output += f"💰 P&L: ${report['total_pnl']:+,.2f} (ROI {report['roi']:+.1%}, win rate {report['win_rate']:.0%})\n"
+    output += f"🎯 Brier: {report['brier_score']:.3f} ({report['resolved_share']:.0%} settled on resolution)\n\n"
+
+    for sig_type, stats in report['by_type'].items():
+        win_rate = f"{stats['win_rate']:.0%}" if stats['win_rate'] is not None else "-"
+        output += (f"   • {sig_type.replace('_', ' ').title()}: {stats['signals']} signals, "
+                   f"{stats['positions']} positions, {win_rate} wins, ${stats['total_pnl']:+,.2f}\n")
+
+    output += "\n📏 Calibration:\n"
+    for bucket in report['calibration']:
+        output += (f"   {bucket['bucket']}%: predicted {bucket['avg_confidence']:.0f}%, "
+                   f"won {bucket['win_rate']:.0%} of {bucket['positions']}\n")
+
+    return output
+
+if __name__ == '__main__':
+    days = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DAYS
+    cadence = int(float(sys.argv[2]) * 60) if len(sys.argv) > 2 else DEFAULT_CADENCE
+
+    end = int(time.time())
+    start = end - int(days * 86400)
+    print(f"🔁 Replaying {days:g} day(s) of trades through the detectors...")
+    report = Backtester(cadence=cadence).run(start, end)
+    print(format_report(report))
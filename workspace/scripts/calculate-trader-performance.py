@@ -1,12 +1,10 @@
 #!/usr/bin/env python3
 """
 Calculate Trader Performance
-Matches BUY/SELL pairs to determine which traders are profitable
+Matches BUY/SELL lots (FIFO, partial fills) to determine which traders are profitable
 """
 
-import sqlite3
-from collections import defaultdict
-from datetime import datetime
+from lot_matching import LotMatcher
 
 TRADES_DB = '/home/clawdbot/polymarket_runtime/data/trades.db'
 MIN_TRADES = 1  # Minimum closed positions to be ranked (lowered from 5 due to recent data)
@@ -14,61 +12,13 @@ MIN_TRADES = 1  # Minimum closed positions to be ranked (lowered from 5 due to r
 def calculate_trader_performance():
     """Calculate P&L for all traders with closed positions"""
     
-    conn = sqlite3.connect(TRADES_DB)
-    cur = conn.cursor()
+    # FIFO lot books are kept in trades.db - only new trades get matched here
+    matcher = LotMatcher(TRADES_DB)
+    matcher.update()
     
-    # Get all trades, grouped by trader
-    cur.execute("""
-        SELECT trader, marketSlug, outcome, side, price, sizeUsd, timestamp
-        FROM trades
-        WHERE sizeUsd >= 1000
-        ORDER BY trader, marketSlug, outcome, timestamp
-    """)
-    
-    trades = cur.fetchall()
-    
-    # Group trades by trader -> market -> outcome
-    trader_positions = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
-    
-    for trader, market, outcome, side, price, size, timestamp in trades:
-        trader_positions[trader][market][outcome].append({
-            'side': side,
-            'price': price,
-            'size': size,
-            'timestamp': timestamp
-        })
-    
-    # Calculate P&L for each trader
     trader_stats = {}
     
-    for trader, markets in trader_positions.items():
-        closed_positions = 0
-        total_pnl = 0
-        wins = 0
-        total_volume = 0
-        
-        for market, outcomes in markets.items():
-            for outcome, trades_list in outcomes.items():
-                # Simple matching: pair first BUY with first SELL, etc.
-                buys = [t for t in trades_list if t['side'] == 'BUY']
-                sells = [t for t in trades_list if t['side'] == 'SELL']
-                
-                # Match buy/sell pairs
-                for i in range(min(len(buys), len(sells))):
-                    buy_price = buys[i]['price']
-                    sell_price = sells[i]['price']
-                    size = min(buys[i]['size'], sells[i]['size'])
-                    
-                    # P&L = (sell_price - buy_price) * size
-                    pnl = (sell_price - buy_price) * size
-                    
-                    total_pnl += pnl
-                    closed_positions += 1
-                    total_volume += size
-                    
-                    if pnl > 0:
-                        wins += 1
-        
+    for trader, (total_pnl, closed_positions, wins, total_volume) in matcher.get_all_realized().items():
         if closed_positions >= MIN_TRADES:
             win_rate = wins / closed_positions if closed_positions > 0 else 0
             roi = (total_pnl / total_volume) if total_volume > 0 else 0
@@ -83,8 +33,6 @@ def calculate_trader_performance():
                 'total_volume': round(total_volume, 2)
             }
     
-    conn.close()
-    
     # Sort by total P&L
     sorted_traders = sorted(
         trader_stats.items(),
@@ -9,7 +9,7 @@ that will be enhanced once we have the correct API documentation.
 
 import json
 import os
-import requests
+import http_client
 from datetime import datetime
 
 # Load Moltbook credentials
@@ -25,7 +25,7 @@ def check_moltbook_profile():
     """Check our Moltbook profile for activity"""
     try:
         # Try to fetch our profile page
-        response = requests.get(PROFILE_URL, timeout=10)
+        response = http_client.get(PROFILE_URL, timeout=10)
         if response.status_code == 200:
             return {
                 'status': 'claimed',
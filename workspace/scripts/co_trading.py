@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Co-Trading Graph
+Sparse wallet-to-wallet graph of whales that repeatedly take the same side of
+the same market/outcome within a short window of each other
+
+Edges live in trades.db and are updated from a trade arrival cursor: each run
+only pairs new whale trades with their neighbours inside the window, so cost
+is O(new trades x window) instead of rebuilding the graph. Connected groups of
+strong edges are exposed as "syndicates".
+
+Only this script's batch run writes the graph; detectors open it with
+readonly=True and just read syndicates, so the detection path never takes a
+write lock on trades.db.
+
+Usage:
+    python3 co_trading.py            # fold in new trades (batch job)
+    python3 co_trading.py rebuild    # recompute from full history
+    python3 co_trading.py syndicates # list current syndicates
+"""
+
+import sqlite3
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+import trade_cursors
+
+TRADES_DB = '/home/clawdbot/polymarket_runtime/data/trades.db'
+CURSOR_NAME = 'co_trading'
+WHALE_THRESHOLD = 2000     # Same whale cutoff as detect-whale-clusters.py
+CO_TRADE_WINDOW = 3600     # Trades this close together count as co-movement
+MIN_CO_MARKETS = 3         # Distinct markets shared before an edge joins a syndicate
+
+
+class CoTradingGraph:
+    """Incrementally maintained co-trading edges and syndicate lookup"""
+
+    def __init__(self, trades_db=TRADES_DB, readonly=False):
+        self.trades_db = trades_db
+        self.readonly = readonly
+        if not readonly:
+            self._ensure_tables()
+
+    def _connect(self):
+        if self.readonly:
+            return sqlite3.connect(f"file:{self.trades_db}?mode=ro", uri=True)
+        return sqlite3.connect(self.trades_db)
+
+    def _has_graph(self, conn) -> bool:
+        """False until the batch job has created the edge tables"""
+        return conn.execute("""
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'wallet_edges'
+        """).fetchone() is not None
+
+    def _ensure_tables(self):
+        conn = sqlite3.connect(self.trades_db)
+        cur = conn.cursor()
+
+        # One row per unordered wallet pair (wallet_a < wallet_b)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS wallet_edges (
+                wallet_a TEXT NOT NULL,
+                wallet_b TEXT NOT NULL,
+                co_trades INTEGER DEFAULT 0,
+                co_markets INTEGER DEFAULT 0,
+                last_ts INTEGER,
+                PRIMARY KEY (wallet_a, wallet_b)
+            )
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_wallet_edges_b ON wallet_edges(wallet_b)
+        """)
+
+        # Which market/outcomes each pair has shared (keeps co_markets distinct)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS wallet_edge_markets (
+                wallet_a TEXT NOT NULL,
+                wallet_b TEXT NOT NULL,
+                market_slug TEXT NOT NULL,
+                outcome TEXT,
+                PRIMARY KEY (wallet_a, wallet_b, market_slug, outcome)
+            )
+        """)
+        trade_cursors.ensure_table(conn)
+
+        conn.commit()
+        conn.close()
+
+    def update(self, conn=None) -> int:
+        """Pair whale trades added since the last run; returns new whale trades processed"""
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(self.trades_db)
+
+        try:
+            processed = trade_cursors.consume(conn, CURSOR_NAME, self._apply)
+        finally:
+            if own_conn:
+                conn.close()
+
+        return processed
+
+    def rebuild(self) -> int:
+        """Drop the graph and replay every whale trade"""
+        conn = sqlite3.connect(self.trades_db)
+        trade_cursors.reset(conn, CURSOR_NAME, ('wallet_edges', 'wallet_edge_markets'))
+
+        processed = self.update(conn)
+        conn.close()
+        return processed
+
+    def _apply(self, conn, start: int, end: int) -> int:
+        """Add edges for whale trades with start < seq <= end"""
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT MIN(timestamp), MAX(timestamp), COUNT(*)
+            FROM {trade_cursors.ARRIVED}
+                AND sizeUsd >= ? AND marketSlug IS NOT NULL
+        """, (start, end, WHALE_THRESHOLD))
+        min_ts, max_ts, new_count = cur.fetchone()
+        if not new_count:
+            return 0
+
+        # New trades plus already-processed neighbours inside the window
+        cur.execute("""
+            SELECT f.seq, trader, marketSlug, outcome, side, timestamp
+            FROM trades t
+            JOIN trade_first_seen f ON f.id = t.id
+            WHERE timestamp BETWEEN ? AND ?
+                AND f.seq <= ? AND sizeUsd >= ? AND marketSlug IS NOT NULL
+        """, (min_ts - CO_TRADE_WINDOW, max_ts + CO_TRADE_WINDOW, end, WHALE_THRESHOLD))
+
+        groups = defaultdict(list)
+        for seq, trader, market, outcome, side, ts in cur.fetchall():
+            groups[(market, outcome, side)].append((ts, seq, trader))
+
+        # Each trade pair is counted once, by whichever trade arrived later,
+        # and only when that trade is new in this chunk
+        pairs = defaultdict(lambda: [0, 0])  # (a, b, market, outcome) -> co_trades, last_ts
+        for (market, outcome, side), trades in groups.items():
+            trades.sort()
+            lo = 0
+            for i, (ts, seq, trader) in enumerate(trades):
+                while trades[lo][0] < ts - CO_TRADE_WINDOW:
+                    lo += 1
+                for other_ts, other_seq, other in trades[lo:i]:
+                    if other == trader or max(seq, other_seq) <= start:
+                        continue
+                    a, b = (trader, other) if trader < other else (other, trader)
+                    pair = pairs[(a, b, market, outcome)]
+                    pair[0] += 1
+                    pair[1] = max(pair[1], ts)
+
+        if not pairs:
+            return new_count
+
+        edges = defaultdict(lambda: [0, 0])  # (a, b) -> co_trades, last_ts
+        for (a, b, market, outcome), (co_trades, last_ts) in pairs.items():
+            edge = edges[(a, b)]
+            edge[0] += co_trades
+            edge[1] = max(edge[1], last_ts)
+
+        cur.executemany("""
+            INSERT OR IGNORE INTO wallet_edge_markets (wallet_a, wallet_b, market_slug, outcome)
+            VALUES (?, ?, ?, ?)
+        """, list(pairs))
+
+        # co_markets is recounted from wallet_edge_markets, now holding this chunk's pairs
+        cur.executemany("""
+            INSERT INTO wallet_edges (wallet_a, wallet_b, co_trades, co_markets, last_ts)
+            SELECT ?, ?, ?, COUNT(*), ?
+            FROM wallet_edge_markets
+            WHERE wallet_a = ? AND wallet_b = ?
+            ON CONFLICT(wallet_a, wallet_b) DO UPDATE SET
+                co_trades = co_trades + excluded.co_trades,
+                co_markets = excluded.co_markets,
+                last_ts = MAX(COALESCE(last_ts, 0), excluded.last_ts)
+        """, [(a, b, co_trades, last_ts, a, b) for (a, b), (co_trades, last_ts) in edges.items()])
+
+        return new_count
+
+    def get_neighbors(self, wallet: str, min_co_markets: int = 1) -> Dict[str, int]:
+        """wallet -> shared market count for everyone this wallet co-trades with"""
+        conn = self._connect()
+        if not self._has_graph(conn):
+            conn.close()
+            return {}
+        rows = conn.execute("""
+            SELECT wallet_b, co_markets FROM wallet_edges WHERE wallet_a = ? AND co_markets >= ?
+            UNION ALL
+            SELECT wallet_a, co_markets FROM wallet_edges WHERE wallet_b = ? AND co_markets >= ?
+        """, (wallet, min_co_markets, wallet, min_co_markets)).fetchall()
+        conn.close()
+        return dict(rows)
+
+    def get_syndicates(self, min_co_markets: int = MIN_CO_MARKETS) -> List[Set[str]]:
+        """Connected components over edges shared across >= min_co_markets markets"""
+        conn = self._connect()
+        if not self._has_graph(conn):
+            conn.close()
+            return []
+        rows = conn.execute("""
+            SELECT wallet_a, wallet_b FROM wallet_edges WHERE co_markets >= ?
+        """, (min_co_markets,)).fetchall()
+        conn.close()
+
+        # Union-find
+        parent = {}
+
+        def find(x):
+            root = x
+            while parent[root] != root:
+                root = parent[root]
+            while parent[x] != root:
+                parent[x], x = root, parent[x]
+            return root
+
+        for a, b in rows:
+            parent.setdefault(a, a)
+            parent.setdefault(b, b)
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[rb] = ra
+
+        components = defaultdict(set)
+        for wallet in parent:
+            components[find(wallet)].add(wallet)
+
+        return sorted(components.values(), key=len, reverse=True)
+
+    def syndicate_index(self, min_co_markets: int = MIN_CO_MARKETS) -> Dict[str, int]:
+        """wallet -> syndicate id (position in get_syndicates())"""
+        return {
+            wallet: i
+            for i, members in enumerate(self.get_syndicates(min_co_markets))
+            for wallet in members
+        }
+
+
+def largest_syndicate_share(traders: Iterable[str], index: Dict[str, int]) -> int:
+    """Most wallets in `traders` that belong to one syndicate (0 if none do)"""
+    counts = defaultdict(int)
+    for trader in set(traders):
+        syndicate = index.get(trader)
+        if syndicate is not None:
+            counts[syndicate] += 1
+    return max(counts.values(), default=0)
+
+
+if __name__ == '__main__':
+    graph = CoTradingGraph()
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'rebuild':
+        print("🔁 Rebuilding co-trading graph from full trade history...")
+        print(f"✅ Processed {graph.rebuild()} whale trades")
+    elif len(sys.argv) > 1 and sys.argv[1] == 'syndicates':
+        syndicates = graph.get_syndicates()
+        print(f"🕸️  {len(syndicates)} syndicate(s) (edges across ≥{MIN_CO_MARKETS} markets)\n")
+        for i, members in enumerate(syndicates[:20], 1):
+            wallets = ', '.join(f"{w[:6]}...{w[-4:]}" for w in sorted(members)[:8])
+            more = f" +{len(members) - 8} more" if len(members) > 8 else ""
+            print(f"   #{i}: {len(members)} wallets - {wallets}{more}")
+    else:
+        print(f"✅ Paired {graph.update()} new whale trades")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Confidence Scoring
+Declarative band tables for detector confidence scores, shared by the whale
+cluster, smart money divergence and momentum reversal detectors
+
+Each scorecard is a list of per-feature bands; a candidate earns the points of
+the strongest band it clears and the card total is capped at 100. Bands are
+looked up with bisect over sorted thresholds, one feature column at a time,
+so a whole batch of candidates is scored in a single call.
+
+If WEIGHTS_FILE has fitted logistic weights for a signal type, they replace
+that type's bands:
+    {"whale_cluster": {"intercept": -2.1,
+                       "coefficients": {"whale_count": 0.35, "total_size": 0.4},
+                       "transforms": {"total_size": "log1p"}}}
+"""
+
+import bisect
+import json
+import math
+import os
+from typing import Dict, List, Sequence, Tuple
+
+WEIGHTS_FILE = '/workspace/memory/confidence-weights.json'
+MAX_SCORE = 100
+
+# signal type -> [(feature, comparison, [(threshold, points), ...], default points)]
+# Bands are listed strongest first, exactly as the old if/elif ladders read.
+# 'outside' thresholds are (low, high): price below low or above high.
+SCORECARDS = {
+    'whale_cluster': [
+        ('whale_count', '>=', [(5, 50), (4, 35)], 20),
+        ('total_size', '>', [(50000, 30), (25000, 20), (15000, 15), (10000, 10)], 0),
+        ('time_span', '<', [(1, 25), (5, 20), (15, 15), (30, 10)], 0),       # minutes
+        ('syndicate_members', '>=', [(3, 15), (2, 5)], 0),
+        ('established_whales', '>=', [(3, 10), (2, 5)], 0),   # wallet_features history
+    ],
+    'smart_money_divergence': [
+        ('whale_size', '>', [(50000, 35), (25000, 25), (15000, 20)], 10),
+        ('whale_count', '>=', [(5, 25), (3, 15)], 5),
+        ('price_extremity', '>', [(0.35, 25), (0.25, 20), (0.15, 15)], 5),   # |price - 0.5|
+        ('ratio', '>', [(5, 15), (3, 10), (2, 5)], 0),                      # buy/sell lopsidedness
+    ],
+    'momentum_reversal': [
+        ('whale_size', '>', [(40000, 35), (20000, 25), (10000, 15)], 10),
+        ('whale_count', '>=', [(4, 20), (3, 15)], 10),
+        ('price_move', '>', [(0.30, 30), (0.20, 20), (0.15, 15)], 10),
+        ('current_price', 'outside', [((0.20, 0.80), 15), ((0.30, 0.70), 10)], 0),
+    ],
+}
+
+TRANSFORMS = {
+    'log1p': math.log1p,
+    'identity': lambda x: x,
+}
+
+_compiled = {}   # signal type -> (scorecard it was built from, compiled bands)
+_weights = {}    # path -> (mtime, weights)
+
+
+def _compile(card):
+    """Turn bands into (feature, lookup function) pairs"""
+    compiled = []
+    for feature, op, bands, default in card:
+        if op == 'outside':
+            compiled.append((feature, _outside(bands, default)))
+            continue
+
+        ordered = sorted(bands)
+        edges = [threshold for threshold, _ in ordered]
+        points = [p for _, p in ordered]
+        if op in ('>=', '>'):
+            # Count of thresholds cleared -> points of the highest one
+            table = [default] + points
+            find = bisect.bisect_right if op == '>=' else bisect.bisect_left
+        elif op in ('<', '<='):
+            # Count of thresholds at/below x -> points of the lowest one still above it
+            table = points + [default]
+            find = bisect.bisect_right if op == '<' else bisect.bisect_left
+        else:
+            raise ValueError(f"Unknown comparison {op!r} for {feature}")
+        compiled.append((feature, lambda x, edges=edges, table=table, find=find: table[find(edges, x)]))
+    return compiled
+
+
+def _outside(bands, default):
+    def lookup(x):
+        for (low, high), points in bands:
+            if x < low or x > high:
+                return points
+        return default
+    return lookup
+
+
+def _bands(signal_type):
+    card = SCORECARDS[signal_type]
+    cached = _compiled.get(signal_type)
+    if cached is None or cached[0] is not card:
+        cached = _compiled[signal_type] = (card, _compile(card))
+    return cached[1]
+
+
+def load_weights(path=None) -> Dict:
+    """Fitted logistic weights per signal type (cached per process by mtime)"""
+    path = path or WEIGHTS_FILE
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    cached = _weights.get(path)
+    if cached is None or cached[0] != mtime:
+        weights = {}
+        if mtime is not None:
+            try:
+                with open(path) as f:
+                    weights = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring confidence weights in {path}: {e}")
+        _weights[path] = (mtime, weights)
+    return _weights[path][1]
+
+
+def score_batch(signal_type: str, features: Dict[str, Sequence[float]]) -> List[int]:
+    """
+    Score many candidates at once
+    features: feature name -> one value per candidate (every card feature required)
+    """
+    n = len(next(iter(features.values()))) if features else 0
+    model = load_weights().get(signal_type)
+
+    if model:
+        z = [model.get('intercept', 0.0)] * n
+        transforms = model.get('transforms', {})
+        for feature, coef in model.get('coefficients', {}).items():
+            transform = TRANSFORMS[transforms.get(feature, 'identity')]
+            z = [acc + coef * transform(x) for acc, x in zip(z, features[feature])]
+        return [min(round(MAX_SCORE / (1 + math.exp(-v))), MAX_SCORE) for v in z]
+
+    totals = [0] * n
+    for feature, lookup in _bands(signal_type):
+        totals = [acc + lookup(x) for acc, x in zip(totals, features[feature])]
+    return [min(total, MAX_SCORE) for total in totals]
+
+
+def score_candidates(signal_type: str, candidates: List[Tuple[Dict, Dict]]) -> List[Dict]:
+    """
+    Score (signal, features) candidates in one batch, filling in each signal's
+    'confidence'; returns the signals in input order
+    """
+    if not candidates:
+        return []
+    columns = {name: [features[name] for _, features in candidates] for name in candidates[0][1]}
+    for (signal, _), confidence in zip(candidates, score_batch(signal_type, columns)):
+        signal['confidence'] = confidence
+    return [signal for signal, _ in candidates]
+
+
+def score(signal_type: str, **features) -> int:
+    """Score one candidate"""
+    return score_batch(signal_type, {name: [value] for name, value in features.items()})[0]
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Binary Complement Arbitrage Scanner
+Pairs the latest YES and NO trade prices per market from the local trade tape
+to find candidate markets where YES + NO is off $1.00 by more than fees, then
+prices each candidate from the live CLOB order books of both legs
+(Python counterpart of src/strategies/arbitrage_detector.ts, which polls the
+CLOB API market by market)
+
+YES + NO asks < 1: buy both legs, one of them pays $1
+YES + NO bids > 1: mint a pair for $1 and sell both legs
+
+The tape only holds whale-sized prints, so its prices are a cheap screen and
+can be minutes old; edge, prices and confidence all come from the books.
+"""
+
+import sqlite3
+import sys
+import os
+import time
+from datetime import datetime
+
+# Add path for market filters
+sys.path.insert(0, '/home/clawdbot/clawd/scripts')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import http_client
+from market_filters import should_skip_market
+import signal_store
+
+DB_PATH = '/home/clawdbot/polymarket_runtime/data/trades.db'
+CLOB_API = 'https://clob.polymarket.com'
+MAX_PRICE_AGE = 900        # Both legs must have traded in the last 15 minutes
+MAX_LEG_GAP = 300          # ...and within 5 minutes of each other
+MIN_EDGE_PERCENT = 0.5     # Net edge after fees (same default as the TS detector)
+SLIPPAGE_BUFFER = 0.005    # Per-pair allowance for crossing the spread on two legs
+
+def leg_fee(price, fee_rate_bps):
+    """Per-share taker fee for one leg (Polymarket charges on min(p, 1 - p))"""
+    return (fee_rate_bps or 0) / 10000 * min(price, 1 - price)
+
+def net_edge(combined, fees):
+    """(side, net edge per pair, edge as % of capital) for a YES + NO total"""
+    if combined < 1:
+        edge = 1 - combined - fees - SLIPPAGE_BUFFER
+        capital = combined + fees
+        side = 'BUY'
+    else:
+        edge = combined - 1 - fees - SLIPPAGE_BUFFER
+        capital = 1.0
+        side = 'SELL'
+    return side, edge, (edge / capital * 100 if capital > 0 else 0)
+
+def fetch_quote(token_id):
+    """Best bid and ask (price, size) for one outcome token, or None"""
+    try:
+        response = http_client.get(f"{CLOB_API}/book", params={'token_id': token_id}, timeout=5)
+        if response.status_code != 200:
+            return None
+        book = response.json()
+    except Exception as e:
+        print(f"⚠️  Order book fetch failed for {token_id[:12]}...: {e}")
+        return None
+
+    # Levels aren't guaranteed best-first, so take the extremes
+    bids = [(float(level['price']), float(level['size'])) for level in book.get('bids', [])]
+    asks = [(float(level['price']), float(level['size'])) for level in book.get('asks', [])]
+    return {
+        'bid': max(bids) if bids else None,
+        'ask': min(asks) if asks else None,
+    }
+
+def live_pair(yes_token, no_token, side):
+    """(yes_price, no_price, fillable pairs) at the top of both books for this side, or None"""
+    yes_quote, no_quote = fetch_quote(yes_token), fetch_quote(no_token)
+    if not yes_quote or not no_quote:
+        return None
+    level = 'ask' if side == 'BUY' else 'bid'  # Buy both at the asks, sell both at the bids
+    yes_level, no_level = yes_quote[level], no_quote[level]
+    if not yes_level or not no_level:
+        return None
+    return yes_level[0], no_level[0], min(yes_level[1], no_level[1])
+
+def detect_arbitrage(max_price_age=MAX_PRICE_AGE):
+    """Screen recently traded binary markets on the tape, confirm each against the live books"""
+
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
+
+    # Latest YES and NO print per market, paired in one query (timestamp index)
+    cur.execute("""
+        WITH latest AS (
+            SELECT marketSlug, marketQuestion, marketId, outcome, price, feeRateBps,
+                   MAX(timestamp) as ts
+            FROM trades
+            WHERE timestamp > ?
+                AND outcome IN ('Yes', 'No')
+                AND marketSlug IS NOT NULL
+            GROUP BY marketSlug, outcome
+        )
+        SELECT y.marketSlug, COALESCE(y.marketQuestion, n.marketQuestion, 'Unknown'),
+               y.marketId, n.marketId, y.price, n.price, y.feeRateBps, n.feeRateBps, y.ts, n.ts
+        FROM latest y
+        JOIN latest n ON n.marketSlug = y.marketSlug AND n.outcome = 'No'
+        WHERE y.outcome = 'Yes'
+            AND ABS(y.ts - n.ts) <= ?
+    """, (int(time.time()) - max_price_age, MAX_LEG_GAP))
+    pairs = cur.fetchall()
+
+    conn.close()
+
+    signals = []
+    for (market_slug, market_question, yes_token, no_token, yes_print, no_print,
+         yes_fee, no_fee, yes_ts, no_ts) in pairs:
+        # Screen on the tape: skip markets whose last prints show no edge
+        side, _, tape_edge = net_edge(yes_print + no_print,
+                                      leg_fee(yes_print, yes_fee) + leg_fee(no_print, no_fee))
+        if tape_edge < MIN_EDGE_PERCENT:
+            continue
+
+        # Apply market filters BEFORE creating signal
+        should_skip, reason = should_skip_market(market_question, market_slug)
+        if should_skip:
+            continue
+
+        # Re-price from the books (trades.marketId is the outcome token id)
+        quote = live_pair(yes_token, no_token, side)
+        if not quote:
+            continue
+        yes_price, no_price, fillable = quote
+        combined = yes_price + no_price
+        fees = leg_fee(yes_price, yes_fee) + leg_fee(no_price, no_fee)
+        book_side, edge, edge_percent = net_edge(combined, fees)
+        if book_side != side or edge_percent < MIN_EDGE_PERCENT:
+            continue  # Gone, or the books flipped to the side we didn't quote
+
+        leg_gap = abs(yes_ts - no_ts)
+        signals.append({
+            'market_slug': market_slug,
+            'market_question': market_question,
+            'outcome': 'Yes+No',
+            'side': side,
+            'yes_price': yes_price,
+            'no_price': no_price,
+            'combined_price': round(combined, 4),
+            'fees': round(fees, 4),
+            'edge_per_share': round(edge, 4),
+            'edge_percent': round(edge_percent, 2),
+            'fillable_pairs': round(fillable, 2),
+            'leg_gap_seconds': leg_gap,
+            'last_trade': datetime.fromtimestamp(max(yes_ts, no_ts)).strftime('%Y-%m-%d %H:%M:%S'),
+            'confidence': calculate_arb_score(edge_percent, fillable)
+        })
+
+    signals.sort(key=lambda x: x['edge_percent'], reverse=True)
+    return signals
+
+def calculate_arb_score(edge_percent, fillable):
+    """Calculate confidence score 0-100"""
+    score = 0
+
+    # Bigger edge survives more slippage
+    if edge_percent >= 5:
+        score += 60
+    elif edge_percent >= 2:
+        score += 45
+    elif edge_percent >= 1:
+        score += 35
+    else:
+        score += 25
+
+    # Depth at the top of both books (pairs) - thin quotes vanish first
+    if fillable >= 1000:
+        score += 35
+    elif fillable >= 200:
+        score += 25
+    else:
+        score += 10
+
+    return min(score, 100)
+
+def format_signals(signals):
+    """Format signals for output"""
+    if not signals:
+        return None
+
+    output = f"🦀 **COMPLEMENT ARBITRAGE** ({len(signals)} market(s))\n\n"
+
+    for sig in signals[:5]:
+        action = "Buy both legs" if sig['side'] == 'BUY' else "Mint + sell both legs"
+
+        output += f"💰 **{action}** ({sig['edge_percent']:.2f}% net edge)\n"
+        output += f"**Market:** {sig['market_question'][:70]}...\n"
+        output += f"**Prices:** YES {sig['yes_price']:.4f} + NO {sig['no_price']:.4f} = {sig['combined_price']:.4f} (fees {sig['fees']:.4f})\n"
+        output += f"**Depth:** {sig['fillable_pairs']:,.0f} pairs at the top of both books (last print {sig['last_trade']})\n"
+        output += f"🔗 polymarket.com/{sig['market_slug']}\n\n"
+
+    return output
+
+def signal_row(sig):
+    """Direction, price and details columns for a saved signal"""
+    # Two legs, no single entry price: both quotes live in details
+    return f"{sig['side']} {sig['outcome']}", None, {
+        'yes_price': sig['yes_price'],
+        'no_price': sig['no_price'],
+        'fees': sig['fees'],
+        'edge_per_share': sig['edge_per_share'],
+        'edge_percent': sig['edge_percent'],
+        'fillable_pairs': sig['fillable_pairs'],
+        'leg_gap_seconds': sig['leg_gap_seconds'],
+        'explanation': f"YES+NO = {sig['combined_price']:.4f} on the books, {sig['edge_percent']:.2f}% net edge after fees"
+    }
+
+def save_signals_to_db(signals):
+    """Save signals to trading database (with deduplication)"""
+    signal_store.save_signals(signals, 'complement_arbitrage', signal_row)
+
+if __name__ == "__main__":
+    print("🔍 Screening recent trades for complement arbitrage, confirming on the books...")
+    signals = detect_arbitrage()
+
+    if signals:
+        print(f"\n✅ Found {len(signals)} arbitrage opportunity(ies)!\n")
+        print(format_signals(signals))
+
+        # Save to database
+        save_signals_to_db(signals)
+    else:
+        print("❌ No complement mispricings above fees.")
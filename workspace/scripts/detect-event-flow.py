@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Event Flow Signal Detector
+Finds whale flow spread across sibling markets of one event that points at
+a single outcome (e.g. BUY Yes on candidate A while selling Yes / buying No
+on candidates B and C)
+
+Theory: Per-market detectors only see a slice of this. Summed at the event
+        level, scattered whale trades can add up to one strong conviction bet.
+        Only neg-risk events qualify: there exactly one sibling resolves Yes,
+        so flow against the others is flow toward the target. In independent
+        multi-market events (e.g. price ladders) it says nothing.
+"""
+
+import sqlite3
+import sys
+import os
+import time
+
+# Add path for market filters
+sys.path.insert(0, '/home/clawdbot/clawd/scripts')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import http_client
+from market_filters import should_skip_market
+import signal_store
+from event_flow import EventFlow, net_yes_flow
+
+DB_PATH = '/home/clawdbot/polymarket_runtime/data/trades.db'
+LOOKBACK_HOURS = 6
+MIN_EVENT_FLOW = 20000     # Minimum gross whale volume across the event
+MIN_SIBLINGS = 2           # Flow must touch at least this many sibling markets
+MIN_CONCENTRATION = 0.5    # Share of event flow pointing at the top market
+GAMMA_API = 'https://gamma-api.polymarket.com'
+
+def fetch_neg_risk(event_slug):
+    """Whether an event's markets are mutually exclusive (None if the lookup fails)"""
+    try:
+        response = http_client.get(f"{GAMMA_API}/events?slug={event_slug}", timeout=5)
+        if response.status_code == 200:
+            events = response.json()
+            if events:
+                return bool(events[0].get('negRisk'))
+    except Exception as e:
+        print(f"Error fetching event {event_slug}: {e}")
+    return None
+
+def exclusive_events(flow, event_slugs):
+    """Subset of events that are neg-risk, looking up (and caching) unknown ones"""
+    flags = flow.get_exclusivity(event_slugs)
+    fetched = {}
+    for slug in event_slugs:
+        if slug not in flags:
+            neg_risk = fetch_neg_risk(slug)
+            if neg_risk is not None:  # Failed lookups are retried next run
+                fetched[slug] = neg_risk
+    flow.set_exclusivity(fetched)
+    flags.update(fetched)
+    return {slug for slug, neg_risk in flags.items() if neg_risk}
+
+def detect_event_flow(lookback_hours=LOOKBACK_HOURS):
+    """Detect events where whale flow across siblings converges on one market"""
+
+    flow = EventFlow(DB_PATH)
+    flow.update()
+
+    now = int(time.time())
+    events = flow.get_event_flows(lookback_hours, now)
+
+    eligible = [slug for slug, event in events.items()
+                if event['total_volume'] >= MIN_EVENT_FLOW and len(event['markets']) >= MIN_SIBLINGS]
+    exclusive = exclusive_events(flow, eligible)
+
+    candidates = []
+    for event_slug in eligible:
+        if event_slug not in exclusive:
+            continue
+        event = events[event_slug]
+        markets = event['markets']
+
+        # Flow "toward" a market: its own net Yes flow plus net No flow on its siblings
+        total_net = sum(m['net_yes'] for m in markets.values())
+        best_slug, best_support = None, 0.0
+        for slug, market in markets.items():
+            against_siblings = -(total_net - market['net_yes'])
+            support = max(market['net_yes'], 0) + max(against_siblings, 0)
+            if support > best_support:
+                best_slug, best_support = slug, support
+
+        concentration = best_support / event['total_volume']
+        if best_slug is None or concentration < MIN_CONCENTRATION:
+            continue
+
+        candidates.append((event_slug, event, best_slug, best_support, concentration))
+
+    if not candidates:
+        return []
+
+    # Only now touch raw trades, one indexed query per candidate event
+    since = now - lookback_hours * 3600
+    conn = sqlite3.connect(DB_PATH)
+
+    signals = []
+    for event_slug, event, best_slug, support, concentration in candidates:
+        trades = flow.get_event_trades(event_slug, since, conn)
+        target = [t for t in trades if t[1] == best_slug]
+        if not target:
+            continue
+
+        question = target[-1][2]
+        should_skip, reason = should_skip_market(question, best_slug)
+        if should_skip:
+            continue
+
+        yes_prices = [t[5] for t in target if t[3] == 'Yes']
+        no_prices = [t[5] for t in target if t[3] == 'No']
+        if yes_prices:
+            price = yes_prices[-1]
+        elif no_prices:
+            price = round(1 - no_prices[-1], 4)
+        else:
+            continue
+
+        wallets = {t[0] for t in trades if net_yes_flow(t[3], t[4], 1) != 0}
+        siblings = len(event['markets'])
+
+        signals.append({
+            'event_slug': event_slug,
+            'market_slug': best_slug,
+            'market_question': question,
+            'outcome': 'Yes',
+            'side': 'BUY',
+            'price': price,
+            'event_volume': round(event['total_volume'], 2),
+            'supporting_volume': round(support, 2),
+            'concentration': round(concentration, 3),
+            'sibling_markets': siblings,
+            'whale_wallets': len(wallets),
+            'confidence': calculate_event_score(support, concentration, siblings, len(wallets))
+        })
+
+    conn.close()
+
+    signals.sort(key=lambda x: x['confidence'], reverse=True)
+    return signals
+
+def calculate_event_score(support, concentration, siblings, wallets):
+    """Calculate confidence score 0-100"""
+    score = 0
+
+    # Volume behind the outcome
+    if support > 100000:
+        score += 35
+    elif support > 50000:
+        score += 25
+    else:
+        score += 15
+
+    # How one-sided the event flow is
+    if concentration >= 0.85:
+        score += 30
+    elif concentration >= 0.7:
+        score += 20
+    else:
+        score += 10
+
+    # Conviction expressed across several siblings is harder to fake
+    if siblings >= 4:
+        score += 15
+    elif siblings >= 3:
+        score += 10
+
+    # Distinct wallets involved
+    if wallets >= 5:
+        score += 20
+    elif wallets >= 3:
+        score += 10
+
+    return min(score, 100)
+
+def format_signals(signals):
+    """Format signals for output"""
+    if not signals:
+        return None
+
+    output = f"🗳️ **EVENT FLOW SIGNALS** ({len(signals)} event(s))\n\n"
+
+    for sig in signals[:5]:
+        emoji = "🔥" if sig['confidence'] >= 80 else "⚡"
+
+        output += f"{emoji} **{sig['side']} {sig['outcome']}** ({sig['confidence']}% confidence)\n"
+        output += f"**Market:** {sig['market_question'][:70]}...\n"
+        output += f"**Event:** {sig['event_slug']} ({sig['sibling_markets']} markets with whale flow)\n"
+        output += f"**Flow:** ${sig['supporting_volume']:,.0f} of ${sig['event_volume']:,.0f} ({sig['concentration']:.0%}) from {sig['whale_wallets']} wallets\n"
+        output += f"**Price:** {sig['price']:.2f}\n"
+        output += f"🔗 polymarket.com/{sig['market_slug']}\n\n"
+
+    return output
+
+def signal_row(sig):
+    """Direction, price and details columns for a saved signal"""
+    return f"{sig['side']} {sig['outcome']}", sig['price'], {
+        'event_slug': sig['event_slug'],
+        'event_volume': sig['event_volume'],
+        'supporting_volume': sig['supporting_volume'],
+        'concentration': sig['concentration'],
+        'sibling_markets': sig['sibling_markets'],
+        'whale_wallets': sig['whale_wallets'],
+        'explanation': f"{sig['concentration']:.0%} of ${sig['event_volume']:,.0f} whale flow across {sig['sibling_markets']} sibling markets"
+    }
+
+def save_signals_to_db(signals):
+    """Save signals to trading database (with deduplication)"""
+    signal_store.save_signals(signals, 'event_flow', signal_row)
+
+if __name__ == "__main__":
+    print("🔍 Scanning event-level whale flow...")
+    signals = detect_event_flow()
+
+    if signals:
+        print(f"\n✅ Found {len(signals)} event flow signal(s)!\n")
+        print(format_signals(signals))
+
+        # Save to database
+        save_signals_to_db(signals)
+    else:
+        print(f"❌ No event-level flow signals in the last {LOOKBACK_HOURS} hours.")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Fresh Wallet Whale Detector
+Flags big bets from wallets that have never traded before (or are only days old)
+
+Theory: A brand-new wallet placing a large bet is a classic insider tell -
+        someone with information funding a fresh address to act on it.
+
+Wallet history comes from the memory-mapped seen-wallet set (first-time check)
+and the wallet feature store (wallet age), which is only read here - the
+wallet_features.py batch job folds new trades in. Each run only looks at
+trades added since the previous run, so it can be scheduled as often as
+every minute.
+"""
+
+import sqlite3
+import sys
+import os
+from datetime import datetime
+
+# Add path for market filters
+sys.path.insert(0, '/home/clawdbot/clawd/scripts')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from market_filters import should_skip_market
+import signal_store
+import seen_wallets
+import trade_cursors
+from wallet_features import WalletFeatureStore
+
+DB_PATH = '/home/clawdbot/polymarket_runtime/data/trades.db'
+WHALE_THRESHOLD = 5000     # Minimum bet size for a fresh-wallet signal
+YOUNG_WALLET_DAYS = 3      # Wallets first seen this recently count as "young"
+YOUNG_MAX_TRADES = 5       # ...as long as they have only a handful of trades
+MIN_CONFIDENCE = 60
+
+def detect_fresh_wallets(trades_db=DB_PATH):
+    """Scan trades added since the last run for whale bets from new wallets"""
+
+    seen = seen_wallets.SeenWalletSet(seen_wallets.default_set_path(trades_db))
+    if not seen.loaded:
+        # First run: everything so far is history, nothing is fresh
+        print("📦 Building seen-wallet set from trade history...")
+        seen.close()
+        seen_wallets.rebuild(trades_db)
+        return []
+
+    # Scan by first arrival so trades the collector re-inserts aren't seen twice
+    conn = sqlite3.connect(trades_db)
+    trade_cursors.ensure_first_seen(conn)
+    end = trade_cursors.max_seq(conn)
+    cur = conn.cursor()
+    cur.execute(f"""
+        SELECT t.trader, t.marketSlug,
+               COALESCE(t.marketQuestion, 'Unknown') as marketQuestion,
+               t.outcome, t.side, t.price, t.sizeUsd, t.timestamp
+        FROM {trade_cursors.ARRIVED}
+        ORDER BY f.seq
+    """, (seen.last_seq, end))
+    trades = cur.fetchall()
+    conn.close()
+
+    if not trades:
+        seen.close()
+        return []
+
+    # Read-only: feature writes stay in the batch job, off the collector's write path.
+    # A wallet the store hasn't folded in yet is newer than its last run (young).
+    features = WalletFeatureStore(trades_db, readonly=True)
+
+    candidates = []
+    for trader, slug, question, outcome, side, price, size, ts in trades:
+        first_time = trader not in seen
+        seen.add(trader)
+
+        if side != 'BUY' or size < WHALE_THRESHOLD or not slug:
+            continue
+        candidates.append((first_time, trader, slug, question, outcome, price, size, ts))
+
+    wallet_info = features.get_many({c[1] for c in candidates})
+
+    signals = []
+    for first_time, trader, slug, question, outcome, price, size, ts in candidates:
+        info = wallet_info.get(trader)
+        age_days = (ts - info['first_seen']) / 86400 if info else 0
+        trade_count = info['trade_count'] if info else 1
+
+        young = age_days <= YOUNG_WALLET_DAYS and trade_count <= YOUNG_MAX_TRADES
+        if not first_time and not young:
+            continue
+
+        # Apply market filters BEFORE creating signal
+        should_skip, reason = should_skip_market(question, slug)
+        if should_skip:
+            continue
+
+        confidence = calculate_fresh_wallet_score(size, first_time, age_days, price)
+        if confidence < MIN_CONFIDENCE:
+            continue
+
+        signals.append({
+            'market_slug': slug,
+            'market_question': question,
+            'outcome': outcome,
+            'side': side,
+            'price': price,
+            'trader': trader,
+            'size': round(size, 2),
+            'first_time': first_time,
+            'wallet_age_days': round(age_days, 2),
+            'wallet_trade_count': trade_count,
+            'trade_time': datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S'),
+            'confidence': confidence
+        })
+
+    seen.last_seq = end
+    seen.save()
+    seen.close()
+
+    signals.sort(key=lambda x: x['confidence'], reverse=True)
+    return signals
+
+def calculate_fresh_wallet_score(size, first_time, age_days, price):
+    """Calculate confidence score 0-100"""
+    score = 0
+
+    # Bet size
+    if size > 25000:
+        score += 40
+    elif size > 10000:
+        score += 30
+    else:
+        score += 20
+
+    # Freshness (brand-new wallet is the strongest tell)
+    if first_time:
+        score += 35
+    elif age_days < 1:
+        score += 25
+    else:
+        score += 15
+
+    # Long-shot prices: fresh money on unlikely outcomes is more suspicious
+    if price < 0.20:
+        score += 20
+    elif price < 0.35:
+        score += 10
+
+    return min(score, 100)
+
+def format_signals(signals):
+    """Format signals for output"""
+    if not signals:
+        return None
+
+    output = f"🆕 **FRESH WALLET WHALES** ({len(signals)} signal(s))\n\n"
+
+    for sig in signals[:5]:
+        emoji = "🔥" if sig['confidence'] >= 85 else "⚡"
+        wallet = f"{sig['trader'][:6]}...{sig['trader'][-4:]}"
+        freshness = "first trade ever" if sig['first_time'] else f"{sig['wallet_age_days']:.1f} days old"
+
+        output += f"{emoji} **{sig['side']} {sig['outcome']}** ({sig['confidence']}% confidence)\n"
+        output += f"**Market:** {sig['market_question'][:70]}...\n"
+        output += f"**Wallet:** {wallet} ({freshness})\n"
+        output += f"**Bet:** ${sig['size']:,.0f} @ {sig['price']:.2f}\n"
+        output += f"🔗 polymarket.com/{sig['market_slug']}\n\n"
+
+    return output
+
+def signal_row(sig):
+    """Direction, price and details columns for a saved signal"""
+    freshness = "first trade ever" if sig['first_time'] else f"wallet {sig['wallet_age_days']:.1f} days old"
+    return f"{sig['side']} {sig['outcome']}", sig['price'], {
+        'trader': sig['trader'],
+        'size': sig['size'],
+        'first_time': sig['first_time'],
+        'wallet_age_days': sig['wallet_age_days'],
+        'wallet_trade_count': sig['wallet_trade_count'],
+        'explanation': f"${sig['size']:,.0f} bet from {freshness}"
+    }
+
+def save_signals_to_db(signals):
+    """Save signals to trading database (with deduplication)"""
+    signal_store.save_signals(signals, 'fresh_wallet', signal_row)
+
+if __name__ == "__main__":
+    print("🔍 Scanning for fresh-wallet whale bets...")
+    signals = detect_fresh_wallets()
+
+    if signals:
+        print(f"\n✅ Found {len(signals)} fresh-wallet signal(s)!\n")
+        print(format_signals(signals))
+
+        # Save to database
+        save_signals_to_db(signals)
+    else:
+        print("❌ No fresh-wallet whale bets detected.")
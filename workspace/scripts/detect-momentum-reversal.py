@@ -8,9 +8,15 @@ Theory: Sharp price moves often overshoot. If whales enter opposite the momentum
 """
 
 import sqlite3
+import sys
+import os
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import confidence_scoring
+import signal_store
+
 DB_PATH = '/home/clawdbot/polymarket_runtime/data/trades.db'
 WHALE_THRESHOLD = 3000
 LOOKBACK_HOURS = 6
@@ -56,124 +62,99 @@ def detect_reversals(lookback_hours=LOOKBACK_HOURS):
             'timestamp': ts
         })
     
-    signals = []
+    candidates = []
     
     for (slug, outcome), trades_list in market_data.items():
-        if len(trades_list) < 5:  # Need enough data points
-            continue
-        
-        # Calculate price movement
-        early_trades = trades_list[:len(trades_list)//2]
-        recent_trades = trades_list[len(trades_list)//2:]
-        
-        avg_early_price = sum(t['price'] for t in early_trades) / len(early_trades)
-        avg_recent_price = sum(t['price'] for t in recent_trades) / len(recent_trades)
-        
-        price_move = avg_recent_price - avg_early_price
-        
-        # Check if price moved significantly
-        if abs(price_move) < MIN_PRICE_MOVE:
-            continue
-        
-        # Now check if whales are betting against the momentum
-        recent_whale_trades = [t for t in recent_trades if t['size'] >= WHALE_THRESHOLD]
-        
-        if len(recent_whale_trades) < 2:
-            continue
-        
-        # Calculate whale direction vs price momentum
-        whale_buy_size = sum(t['size'] for t in recent_whale_trades if t['side'] == 'BUY')
-        whale_sell_size = sum(t['size'] for t in recent_whale_trades if t['side'] == 'SELL')
-        
-        reversal = None
-        
-        # Price went UP, whales selling (bearish reversal)
-        if price_move > MIN_PRICE_MOVE and whale_sell_size > whale_buy_size * 1.5:
-            reversal = {
-                'type': 'bearish_reversal',
-                'signal': 'SELL',
-                'price_move': price_move,
-                'momentum': 'bullish',
-                'whale_position': 'bearish',
-                'whale_size': whale_sell_size,
-                'explanation': f'Price rose +{price_move:.1%} but whales selling ${whale_sell_size:,.0f}'
-            }
-        
-        # Price went DOWN, whales buying (bullish reversal)
-        elif price_move < -MIN_PRICE_MOVE and whale_buy_size > whale_sell_size * 1.5:
-            reversal = {
-                'type': 'bullish_reversal',
-                'signal': 'BUY',
-                'price_move': price_move,
-                'momentum': 'bearish',
-                'whale_position': 'bullish',
-                'whale_size': whale_buy_size,
-                'explanation': f'Price fell {price_move:.1%} but whales buying ${whale_buy_size:,.0f}'
-            }
-        
-        if reversal:
-            confidence = calculate_reversal_score(
-                reversal['whale_size'],
-                len(recent_whale_trades),
-                abs(price_move),
-                avg_recent_price
-            )
-            
-            if confidence >= MIN_CONFIDENCE:
-                signal = {
-                    'market_slug': slug,
-                    'market_question': trades_list[0]['question'],
-                    'outcome': outcome,
-                    'reversal': reversal,
-                    'whale_count': len(recent_whale_trades),
-                    'current_price': avg_recent_price,
-                    'confidence': confidence,
-                    'timestamp': datetime.now().isoformat()
-                }
-                signals.append(signal)
+        candidate = market_candidate(slug, outcome, trades_list)
+        if candidate:
+            candidates.append(candidate)
+    
+    signals = score_candidates(candidates)
     
     signals.sort(key=lambda x: x['confidence'], reverse=True)
     return signals
 
-def calculate_reversal_score(whale_size, whale_count, price_move, current_price):
-    """Calculate confidence for reversal signal"""
-    score = 0
-    
-    # Whale size
-    if whale_size > 40000:
-        score += 35
-    elif whale_size > 20000:
-        score += 25
-    elif whale_size > 10000:
-        score += 15
-    else:
-        score += 10
+def market_candidate(slug, outcome, trades_list):
+    """
+    Check one market/outcome for a reversal: unscored (signal, scoring features), or None
+    trades_list: trade dicts (question, side, price, size, timestamp), oldest first
+    """
+    if len(trades_list) < 5:  # Need enough data points
+        return None
     
-    # Whale count
-    if whale_count >= 4:
-        score += 20
-    elif whale_count >= 3:
-        score += 15
-    else:
-        score += 10
-    
-    # Price move magnitude (bigger move = stronger reversal signal)
-    if price_move > 0.30:  # 30%+ move
-        score += 30
-    elif price_move > 0.20:
-        score += 20
-    elif price_move > 0.15:
-        score += 15
-    else:
-        score += 10
+    # Calculate price movement
+    early_trades = trades_list[:len(trades_list)//2]
+    recent_trades = trades_list[len(trades_list)//2:]
+    
+    avg_early_price = sum(t['price'] for t in early_trades) / len(early_trades)
+    avg_recent_price = sum(t['price'] for t in recent_trades) / len(recent_trades)
+    
+    price_move = avg_recent_price - avg_early_price
     
-    # Price position (extremes mean more room to reverse)
-    if current_price > 0.80 or current_price < 0.20:
-        score += 15
-    elif current_price > 0.70 or current_price < 0.30:
-        score += 10
+    # Check if price moved significantly
+    if abs(price_move) < MIN_PRICE_MOVE:
+        return None
+    
+    # Now check if whales are betting against the momentum
+    recent_whale_trades = [t for t in recent_trades if t['size'] >= WHALE_THRESHOLD]
+    
+    if len(recent_whale_trades) < 2:
+        return None
     
-    return min(score, 100)
+    # Calculate whale direction vs price momentum
+    whale_buy_size = sum(t['size'] for t in recent_whale_trades if t['side'] == 'BUY')
+    whale_sell_size = sum(t['size'] for t in recent_whale_trades if t['side'] == 'SELL')
+    
+    reversal = None
+    
+    # Price went UP, whales selling (bearish reversal)
+    if price_move > MIN_PRICE_MOVE and whale_sell_size > whale_buy_size * 1.5:
+        reversal = {
+            'type': 'bearish_reversal',
+            'signal': 'SELL',
+            'price_move': price_move,
+            'momentum': 'bullish',
+            'whale_position': 'bearish',
+            'whale_size': whale_sell_size,
+            'explanation': f'Price rose +{price_move:.1%} but whales selling ${whale_sell_size:,.0f}'
+        }
+    
+    # Price went DOWN, whales buying (bullish reversal)
+    elif price_move < -MIN_PRICE_MOVE and whale_buy_size > whale_sell_size * 1.5:
+        reversal = {
+            'type': 'bullish_reversal',
+            'signal': 'BUY',
+            'price_move': price_move,
+            'momentum': 'bearish',
+            'whale_position': 'bullish',
+            'whale_size': whale_buy_size,
+            'explanation': f'Price fell {price_move:.1%} but whales buying ${whale_buy_size:,.0f}'
+        }
+    
+    if reversal:
+        signal = {
+            'market_slug': slug,
+            'market_question': trades_list[0]['question'],
+            'outcome': outcome,
+            'reversal': reversal,
+            'whale_count': len(recent_whale_trades),
+            'current_price': avg_recent_price,
+            'confidence': None,
+            'timestamp': datetime.now().isoformat()
+        }
+        return signal, {
+            'whale_size': reversal['whale_size'],
+            'whale_count': len(recent_whale_trades),
+            'price_move': abs(price_move),
+            'current_price': avg_recent_price
+        }
+    
+    return None
+
+def score_candidates(candidates):
+    """Score a batch of reversal candidates, keeping those at MIN_CONFIDENCE (bands in confidence_scoring.SCORECARDS)"""
+    signals = confidence_scoring.score_candidates('momentum_reversal', candidates)
+    return [s for s in signals if s['confidence'] >= MIN_CONFIDENCE]
 
 def format_signals(signals):
     """Format signals for output"""
@@ -195,6 +176,19 @@ def format_signals(signals):
     
     return output
 
+def signal_row(sig):
+    """Direction, price and details columns for a saved signal"""
+    reversal = sig.get('reversal', {})
+    return f"{reversal.get('signal', 'BUY')} {sig['outcome']}", sig['current_price'], {
+        'whale_count': sig['whale_count'],
+        'reversal': reversal,
+        'explanation': reversal.get('explanation', 'No explanation')
+    }
+
+def save_signals_to_db(signals):
+    """Save signals to trading database (with deduplication)"""
+    signal_store.save_signals(signals, 'momentum_reversal', signal_row)
+
 if __name__ == "__main__":
     print("🔍 Scanning for momentum reversals...")
     signals = detect_reversals()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Order Flow Imbalance Signal Detector
+Fires when a market's exponentially weighted whale buy/sell imbalance jumps
+well outside its own baseline (z-score crossing)
+
+Theory: Sustained one-sided whale flow relative to total volume shows up
+        before the price has fully moved. State is streaming (O(1) per trade),
+        so detection latency is bounded by how often this runs, not by a
+        lookback window recomputed from scratch.
+"""
+
+import sys
+import os
+import time
+from datetime import datetime
+
+# Add path for market filters
+sys.path.insert(0, '/home/clawdbot/clawd/scripts')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from market_filters import should_skip_market
+import signal_store
+from order_flow import OrderFlowState
+
+DB_PATH = '/home/clawdbot/polymarket_runtime/data/trades.db'
+MAX_SIGNAL_AGE = 3600      # Ignore crossings older than this (backfills, first run)
+MIN_CONFIDENCE = 60
+
+def detect_order_flow():
+    """Fold new trades into the flow state and return fresh imbalance crossings"""
+
+    state = OrderFlowState(DB_PATH)
+    crossings = state.update(emit_since=int(time.time()) - MAX_SIGNAL_AGE)
+
+    # Keep the latest crossing per market/outcome
+    latest = {}
+    for crossing in crossings:
+        latest[(crossing['market_slug'], crossing['outcome'])] = crossing
+
+    signals = []
+    for crossing in latest.values():
+        # Apply market filters BEFORE creating signal
+        should_skip, reason = should_skip_market(crossing['market_question'], crossing['market_slug'])
+        if should_skip:
+            continue
+
+        confidence = calculate_flow_score(crossing['z_score'], crossing['imbalance'],
+                                          crossing['signed_flow'])
+        if confidence < MIN_CONFIDENCE:
+            continue
+
+        signals.append({
+            **crossing,
+            'trade_time': datetime.fromtimestamp(crossing['timestamp']).strftime('%Y-%m-%d %H:%M:%S'),
+            'confidence': confidence
+        })
+
+    signals.sort(key=lambda x: x['confidence'], reverse=True)
+    return signals
+
+def calculate_flow_score(z_score, imbalance, signed_flow):
+    """Calculate confidence score 0-100"""
+    score = 0
+
+    # Distance from the market's own baseline
+    z = abs(z_score)
+    if z >= 5:
+        score += 40
+    elif z >= 4:
+        score += 30
+    else:
+        score += 20
+
+    # How one-sided recent volume is
+    if abs(imbalance) >= 0.7:
+        score += 30
+    elif abs(imbalance) >= 0.5:
+        score += 20
+    elif abs(imbalance) >= 0.3:
+        score += 10
+
+    # Size of the (decayed) whale flow behind it
+    if abs(signed_flow) > 50000:
+        score += 30
+    elif abs(signed_flow) > 20000:
+        score += 20
+    elif abs(signed_flow) > 5000:
+        score += 10
+
+    return min(score, 100)
+
+def format_signals(signals):
+    """Format signals for output"""
+    if not signals:
+        return None
+
+    output = f"📊 **ORDER FLOW IMBALANCE** ({len(signals)} signal(s))\n\n"
+
+    for sig in signals[:5]:
+        emoji = "🔥" if sig['confidence'] >= 80 else "⚡"
+
+        output += f"{emoji} **{sig['side']} {sig['outcome']}** ({sig['confidence']}% confidence)\n"
+        output += f"**Market:** {sig['market_question'][:70]}...\n"
+        output += f"**Imbalance:** {sig['imbalance']:+.0%} vs baseline {sig['baseline']:+.0%} (z={sig['z_score']:+.1f})\n"
+        output += f"**Whale flow:** ${sig['signed_flow']:+,.0f} of ${sig['total_flow']:,.0f} @ {sig['price']:.2f}\n"
+        output += f"🔗 polymarket.com/{sig['market_slug']}\n\n"
+
+    return output
+
+def signal_row(sig):
+    """Direction, price and details columns for a saved signal"""
+    return f"{sig['side']} {sig['outcome']}", sig['price'], {
+        'z_score': sig['z_score'],
+        'imbalance': sig['imbalance'],
+        'baseline': sig['baseline'],
+        'signed_flow': sig['signed_flow'],
+        'total_flow': sig['total_flow'],
+        'explanation': f"Whale flow imbalance {sig['imbalance']:+.0%} (z={sig['z_score']:+.1f})"
+    }
+
+def save_signals_to_db(signals):
+    """Save signals to trading database (with deduplication)"""
+    signal_store.save_signals(signals, 'order_flow', signal_row)
+
+if __name__ == "__main__":
+    print("🔍 Updating order flow state...")
+    signals = detect_order_flow()
+
+    if signals:
+        print(f"\n✅ Found {len(signals)} order flow signal(s)!\n")
+        print(format_signals(signals))
+
+        # Save to database
+        save_signals_to_db(signals)
+    else:
+        print("❌ No order flow imbalance crossings.")
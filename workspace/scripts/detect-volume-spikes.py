@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Volume Spike Signal Detector
+Finds markets whose last hour of volume is far above their rolling hourly
+baseline (Python port of src/strategies/volume_spike_detector.ts, working
+off the local trade tape instead of polling the Gamma API)
+
+Theory: A sudden burst of volume means new information is entering the
+        market. Net flow during the burst gives the direction.
+"""
+
+import sys
+import os
+import math
+
+# Add path for market filters
+sys.path.insert(0, '/home/clawdbot/clawd/scripts')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from market_filters import should_skip_market
+import signal_store
+from volume_baselines import VolumeBaselines
+
+DB_PATH = '/home/clawdbot/polymarket_runtime/data/trades.db'
+SPIKE_WINDOW = 3600          # Compare the last hour against the hourly baseline
+MIN_SPIKE_MULTIPLIER = 2.0   # Same default as the TypeScript detector
+MIN_Z_SCORE = 3.0
+MIN_BASELINE_HOURS = 24      # Need a day of history before trusting a baseline
+MIN_AVG_HOURLY = 200         # ~$5K/day average - spikes on quiet markets are noise
+MIN_SPIKE_VOLUME = 5000
+MIN_NET_SHARE = 0.2          # Net directional flow as a share of spike volume
+
+def detect_volume_spikes(window_seconds=SPIKE_WINDOW):
+    """Fold in new trades and scan every active market against its baseline"""
+
+    baselines = VolumeBaselines(DB_PATH)
+    baselines.update()
+
+    signals = []
+    for market in baselines.get_recent_activity(window_seconds):
+        mean = market['baseline_mean']
+        volume = market['volume']
+        if (market['baseline_hours'] < MIN_BASELINE_HOURS or mean < MIN_AVG_HOURLY
+                or volume < MIN_SPIKE_VOLUME):
+            continue
+
+        # Scale the hourly baseline to the scan window
+        expected = mean * window_seconds / 3600
+        std = market['baseline_std'] * math.sqrt(window_seconds / 3600)
+        multiplier = volume / expected
+        z_score = (volume - expected) / std if std > 0 else float('inf')
+        if multiplier < MIN_SPIKE_MULTIPLIER or z_score < MIN_Z_SCORE:
+            continue
+
+        net_share = market['net_yes'] / volume
+        if abs(net_share) < MIN_NET_SHARE or market['yes_price'] is None:
+            continue
+
+        # Apply market filters BEFORE creating signal
+        should_skip, reason = should_skip_market(market['market_question'], market['market_slug'])
+        if should_skip:
+            continue
+
+        outcome = 'Yes' if net_share > 0 else 'No'
+        price = market['yes_price'] if outcome == 'Yes' else round(1 - market['yes_price'], 4)
+
+        signals.append({
+            'market_slug': market['market_slug'],
+            'market_question': market['market_question'],
+            'outcome': outcome,
+            'side': 'BUY',
+            'price': price,
+            'volume': round(volume, 2),
+            'avg_volume': round(expected, 2),
+            'spike_multiplier': round(multiplier, 2),
+            'z_score': round(min(z_score, 99), 2),
+            'net_share': round(net_share, 3),
+            'trades': market['trades'],
+            'confidence': calculate_spike_score(multiplier, z_score, abs(net_share), volume)
+        })
+
+    signals.sort(key=lambda x: x['confidence'], reverse=True)
+    return signals
+
+def calculate_spike_score(multiplier, z_score, net_share, volume):
+    """Calculate confidence score 0-100"""
+    score = 0
+
+    # Size of the spike relative to normal
+    if multiplier >= 10:
+        score += 35
+    elif multiplier >= 5:
+        score += 25
+    else:
+        score += 15
+
+    if z_score >= 6:
+        score += 15
+    elif z_score >= 4:
+        score += 10
+
+    # One-sided spikes carry direction
+    if net_share >= 0.6:
+        score += 30
+    elif net_share >= 0.4:
+        score += 20
+    else:
+        score += 10
+
+    if volume > 50000:
+        score += 20
+    elif volume > 20000:
+        score += 10
+
+    return min(score, 100)
+
+def format_signals(signals):
+    """Format signals for output"""
+    if not signals:
+        return None
+
+    output = f"🔥 **VOLUME SPIKES** ({len(signals)} market(s))\n\n"
+
+    for sig in signals[:5]:
+        emoji = "🔥" if sig['confidence'] >= 80 else "⚡"
+
+        output += f"{emoji} **{sig['side']} {sig['outcome']}** ({sig['confidence']}% confidence)\n"
+        output += f"**Market:** {sig['market_question'][:70]}...\n"
+        output += f"**Volume:** ${sig['volume']:,.0f} vs ${sig['avg_volume']:,.0f} normal ({sig['spike_multiplier']:.1f}x)\n"
+        output += f"**Net flow:** {sig['net_share']:+.0%} toward Yes @ {sig['price']:.2f}\n"
+        output += f"🔗 polymarket.com/{sig['market_slug']}\n\n"
+
+    return output
+
+def signal_row(sig):
+    """Direction, price and details columns for a saved signal"""
+    return f"{sig['side']} {sig['outcome']}", sig['price'], {
+        'volume': sig['volume'],
+        'avg_volume': sig['avg_volume'],
+        'spike_multiplier': sig['spike_multiplier'],
+        'z_score': sig['z_score'],
+        'net_share': sig['net_share'],
+        'explanation': f"{sig['spike_multiplier']:.1f}x normal hourly volume, {abs(sig['net_share']):.0%} net {sig['outcome']}"
+    }
+
+def save_signals_to_db(signals):
+    """Save signals to trading database (with deduplication)"""
+    signal_store.save_signals(signals, 'volume_spike', signal_row)
+
+if __name__ == "__main__":
+    print("🔍 Scanning for volume spikes...")
+    signals = detect_volume_spikes()
+
+    if signals:
+        print(f"\n✅ Found {len(signals)} volume spike signal(s)!\n")
+        print(format_signals(signals))
+
+        # Save to database
+        save_signals_to_db(signals)
+    else:
+        print("❌ No volume spikes detected.")
@@ -7,118 +7,208 @@ Finds when multiple whales bet on the same market/outcome within a short timefra
 import sqlite3
 import json
 import sys
+import os
 from datetime import datetime, timedelta
 
 # Add path for market filters
 sys.path.insert(0, '/home/clawdbot/clawd/scripts')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from market_filters import should_skip_market
+import signal_store
+import whale_weights
+import confidence_scoring
+from co_trading import CoTradingGraph, largest_syndicate_share
+from wallet_features import WalletFeatureStore
 
 # Configuration
 WHALE_THRESHOLD = 2000  # Minimum trade size to be considered a whale
-CLUSTER_WINDOW = 3600   # Time window in seconds (1 hour)
-MIN_WHALES = 3          # Minimum number of whales to trigger signal
 HIGH_CONFIDENCE_WHALES = 5  # 5+ whales = very strong signal
+ESTABLISHED_MIN_AGE_DAYS = 7  # Wallet history before a whale counts as established
+ESTABLISHED_MIN_MARKETS = 3   # ...and distinct markets it has traded
 DB_PATH = '/home/clawdbot/polymarket_runtime/data/trades.db'
 
-def detect_clusters(lookback_hours=2):
-    """Detect whale clusters in the last N hours"""
+# (window seconds, minimum distinct whales) - evaluated together, tightest first
+CLUSTER_WINDOWS = (
+    (60, 3),       # 1 min
+    (300, 3),      # 5 min
+    (900, 3),      # 15 min
+    (3600, 3),     # 1 hour
+    (14400, 5),    # 4 hours - needs more whales to mean anything
+)
+CLUSTER_WINDOW = 3600   # Default window (kept for callers that read it)
+MIN_WHALES = 3          # Smallest threshold across CLUSTER_WINDOWS
+
+def find_clusters(trades, windows=CLUSTER_WINDOWS, since=0):
+    """
+    Multi-window sliding scan over one market/outcome/side's whale trades
+    
+    trades: (timestamp, trader, size, price) sorted by timestamp
+    Keeps one left pointer per window over a single pass. A window qualifies
+    when it holds >= its minimum of distinct wallets and ends after `since`.
+    Returns the best cluster per qualifying window, tightest window first.
+    """
+    n_windows = len(windows)
+    lefts = [0] * n_windows
+    wallets = [dict() for _ in windows]   # trader -> trades inside the window
+    sizes = [0.0] * n_windows
+    notionals = [0.0] * n_windows         # size * price, for the average price
+    best = [None] * n_windows
+    
+    for right, (ts, trader, size, price) in enumerate(trades):
+        for w, (window, min_whales) in enumerate(windows):
+            counts = wallets[w]
+            counts[trader] = counts.get(trader, 0) + 1
+            sizes[w] += size
+            notionals[w] += size * price
+            
+            # Slide this window's left edge
+            left = lefts[w]
+            while trades[left][0] < ts - window:
+                _, old_trader, old_size, old_price = trades[left]
+                counts[old_trader] -= 1
+                if counts[old_trader] == 0:
+                    del counts[old_trader]
+                sizes[w] -= old_size
+                notionals[w] -= old_size * old_price
+                left += 1
+            lefts[w] = left
+            
+            if len(counts) < min_whales or ts <= since:
+                continue
+            
+            key = (len(counts), sizes[w])
+            if best[w] is None or key > best[w]['key']:
+                best[w] = {
+                    'key': key,
+                    'window': window,
+                    'whale_count': len(counts),
+                    'total_size': sizes[w],
+                    'avg_price': notionals[w] / sizes[w] if sizes[w] else 0,
+                    'first_trade': trades[left][0],
+                    'last_trade': ts,
+                    'traders': list(counts),
+                }
+    
+    return [b for b in best if b is not None]
+
+def detect_clusters(lookback_hours=2, windows=CLUSTER_WINDOWS):
+    """Detect whale clusters ending in the last N hours, across all windows in one pass"""
     
     conn = sqlite3.connect(DB_PATH)
     cur = conn.cursor()
     
-    # Get recent whale trades grouped by market and outcome
-    query = """
-    SELECT 
-        marketSlug,
-        COALESCE(marketQuestion, 'Unknown') as marketQuestion,
-        outcome,
-        side,
-        COUNT(*) as whale_count,
-        SUM(sizeUsd) as total_size,
-        AVG(price) as avg_price,
-        MIN(timestamp) as first_trade,
-        MAX(timestamp) as last_trade,
-        GROUP_CONCAT(sizeUsd || '@' || datetime(timestamp, 'unixepoch'), ' | ') as trades
-    FROM trades
-    WHERE 
-        sizeUsd >= ?
-        AND timestamp > ?
-    GROUP BY marketSlug, outcome, side
-    HAVING whale_count >= ?
-        AND (MAX(timestamp) - MIN(timestamp)) <= ?
-    ORDER BY whale_count DESC, total_size DESC
-    """
-    
     cutoff_time = int((datetime.now() - timedelta(hours=lookback_hours)).timestamp())
+    max_window = max(window for window, _ in windows)
     
-    cur.execute(query, (WHALE_THRESHOLD, cutoff_time, MIN_WHALES, CLUSTER_WINDOW))
-    clusters = cur.fetchall()
+    # One sorted pass of whale trades (plus enough history for the widest window)
+    cur.execute("""
+        SELECT 
+            marketSlug,
+            COALESCE(marketQuestion, 'Unknown') as marketQuestion,
+            outcome,
+            side,
+            trader,
+            sizeUsd,
+            price,
+            timestamp
+        FROM trades
+        WHERE 
+            sizeUsd >= ?
+            AND timestamp > ?
+            AND marketSlug IS NOT NULL
+        ORDER BY marketSlug, outcome, side, timestamp
+    """, (WHALE_THRESHOLD, cutoff_time - max_window))
+    rows = cur.fetchall()
     
     conn.close()
     
-    signals = []
-    for cluster in clusters:
-        (market_slug, market_question, outcome, side, whale_count, 
-         total_size, avg_price, first_trade, last_trade, trades) = cluster
-        
-        # Apply market filters BEFORE creating signal
-        should_skip, reason = should_skip_market(market_question, market_slug)
-        if should_skip:
-            continue  # Skip sports/entertainment/expired markets
-        
-        time_span_minutes = (last_trade - first_trade) / 60
-        
-        signal = {
-            'market_slug': market_slug,
-            'market_question': market_question,
-            'outcome': outcome,
-            'side': side,
-            'whale_count': whale_count,
-            'total_size': round(total_size, 2),
-            'avg_price': round(avg_price, 4),
-            'time_span_minutes': round(time_span_minutes, 1),
-            'first_trade': datetime.fromtimestamp(first_trade).strftime('%Y-%m-%d %H:%M:%S'),
-            'last_trade': datetime.fromtimestamp(last_trade).strftime('%Y-%m-%d %H:%M:%S'),
-            'confidence': calculate_confidence(whale_count, total_size, time_span_minutes)
-        }
-        
-        signals.append(signal)
+    groups = {}
+    questions = {}
+    for market_slug, market_question, outcome, side, trader, size, price, ts in rows:
+        groups.setdefault((market_slug, outcome, side), []).append((ts, trader, size, price))
+        questions[market_slug] = market_question
+    
+    # Track-record weights of the wallets involved (precomputed index, no queries)
+    weights = whale_weights.load_index(DB_PATH)
+    
+    # Wallets that keep trading together across markets (graph maintained by co_trading.py)
+    syndicates = CoTradingGraph(DB_PATH, readonly=True).syndicate_index()
+    
+    # Per-wallet history (feature store maintained by wallet_features.py)
+    features = WalletFeatureStore(DB_PATH, readonly=True)
+    
+    candidates = []
+    for (market_slug, outcome, side), trades in groups.items():
+        candidate = cluster_candidate(market_slug, questions[market_slug], outcome, side, trades,
+                                      cutoff_time, weights, syndicates, windows, features)
+        if candidate:
+            candidates.append(candidate)
     
+    signals = score_candidates(candidates)
+    signals.sort(key=lambda x: (x['whale_count'], x['total_size']), reverse=True)
     return signals
 
-def calculate_confidence(whale_count, total_size, time_span):
-    """Calculate confidence score 0-100"""
-    score = 0
-    
-    # More whales = higher confidence
-    if whale_count >= 5:
-        score += 50  # Very strong signal
-    elif whale_count >= 4:
-        score += 35
-    else:  # 3 whales
-        score += 20
-    
-    # Larger total size = higher confidence
-    if total_size > 50000:
-        score += 30
-    elif total_size > 25000:
-        score += 20
-    elif total_size > 15000:
-        score += 15
-    elif total_size > 10000:
-        score += 10
-    
-    # Faster clustering = MUCH higher confidence (coordinated action)
-    if time_span < 1:  # Same minute = coordinated
-        score += 25
-    elif time_span < 5:  # Within 5 min = very fast
-        score += 20
-    elif time_span < 15:
-        score += 15
-    elif time_span < 30:
-        score += 10
-    
-    return min(score, 100)
+def cluster_candidate(market_slug, market_question, outcome, side, trades, since,
+                      weights, syndicates, windows=CLUSTER_WINDOWS, features=None):
+    """
+    Build the unscored (signal, scoring features) pair for one market/outcome/side,
+    or None - score_candidates() fills in the confidence for a whole batch
+    trades: (timestamp, trader, size, price) whale trades sorted by timestamp
+    features: WalletFeatureStore for wallet history (None skips it)
+    """
+    clusters = find_clusters(trades, windows, since=since)
+    if not clusters:
+        return None
+    
+    # Apply market filters BEFORE creating signal
+    should_skip, reason = should_skip_market(market_question, market_slug)
+    if should_skip:
+        return None  # Skip sports/entertainment/expired markets
+    
+    # Report the tightest qualifying window
+    cluster = clusters[0]
+    whale_count = cluster['whale_count']
+    total_size = cluster['total_size']
+    traders = cluster['traders']
+    time_span_minutes = (cluster['last_trade'] - cluster['first_trade']) / 60
+    syndicate_members = largest_syndicate_share(traders, syndicates)
+    established_whales = count_established(features.get_many(traders)) if features else 0
+    
+    signal = {
+        'market_slug': market_slug,
+        'market_question': market_question,
+        'outcome': outcome,
+        'side': side,
+        'whale_count': whale_count,
+        'total_size': round(total_size, 2),
+        'avg_price': round(cluster['avg_price'], 4),
+        'time_span_minutes': round(time_span_minutes, 1),
+        'window_minutes': cluster['window'] // 60,
+        'qualifying_windows': [c['window'] // 60 for c in clusters],
+        'first_trade': datetime.fromtimestamp(cluster['first_trade']).strftime('%Y-%m-%d %H:%M:%S'),
+        'last_trade': datetime.fromtimestamp(cluster['last_trade']).strftime('%Y-%m-%d %H:%M:%S'),
+        'smart_money_weight': round(sum(weights.lookup_many(traders)), 2),
+        'syndicate_members': syndicate_members,
+        'established_whales': established_whales,
+        'confidence': None
+    }
+    return signal, {
+        'whale_count': whale_count,
+        'total_size': total_size,
+        'time_span': time_span_minutes,
+        'syndicate_members': syndicate_members,
+        'established_whales': established_whales,
+    }
+
+def count_established(profiles):
+    """Wallets with enough history across markets to not be one-off accounts"""
+    return sum(1 for f in profiles.values()
+               if f['wallet_age_days'] >= ESTABLISHED_MIN_AGE_DAYS
+               and f['markets_touched'] >= ESTABLISHED_MIN_MARKETS)
+
+def score_candidates(candidates):
+    """Confidence 0-100 for a batch of cluster candidates (bands in confidence_scoring.SCORECARDS)"""
+    return confidence_scoring.score_candidates('whale_cluster', candidates)
 
 def format_alert(signals):
     """Format signals for Telegram alert"""
@@ -134,78 +224,30 @@ def format_alert(signals):
         alert += f"**Market:** {sig['market_question'][:80]}...\n" if len(sig['market_question']) > 80 else f"**Market:** {sig['market_question']}\n"
         alert += f"**Direction:** {sig['side']} {sig['outcome']}\n"
         alert += f"**Whales:** {sig['whale_count']} traders | ${sig['total_size']:,.0f} total\n"
-        alert += f"**Timing:** {sig['time_span_minutes']} min window\n"
+        alert += f"**Timing:** {sig['time_span_minutes']} min (≤{sig['window_minutes']} min window)\n"
+        if sig.get('syndicate_members', 0) >= 2:
+            alert += f"**Syndicate:** {sig['syndicate_members']} wallets with a co-trading history\n"
         alert += f"**Avg Price:** {sig['avg_price']:.4f}\n"
         alert += f"🔗 polymarket.com/{sig['market_slug']}\n\n"
     
     return alert
 
+def signal_row(sig):
+    """Direction, price and details columns for a saved signal"""
+    return f"{sig['side']} {sig['outcome']}", sig['avg_price'], {
+        'whale_count': sig['whale_count'],
+        'total_size': sig['total_size'],
+        'time_span_minutes': sig['time_span_minutes'],
+        'window_minutes': sig.get('window_minutes'),
+        'smart_money_weight': sig.get('smart_money_weight', 0),
+        'syndicate_members': sig.get('syndicate_members', 0),
+        'established_whales': sig.get('established_whales', 0),
+        'explanation': f"{sig['whale_count']} whales, ${sig['total_size']:,.0f} in {sig['time_span_minutes']} min"
+    }
+
 def save_signals_to_db(signals):
     """Save signals to trading database (with deduplication)"""
-    if not signals:
-        return
-    
-    TRADING_DB = '/home/clawdbot/polymarket_runtime/data/trading.db'
-    
-    try:
-        conn = sqlite3.connect(TRADING_DB)
-        cur = conn.cursor()
-        
-        inserted_count = 0
-        skipped_count = 0
-        
-        for sig in signals:
-            # Check if signal already exists for this market today
-            # Handle both second and millisecond timestamps
-            cur.execute("""
-                SELECT id FROM signals 
-                WHERE market_slug = ? 
-                AND type = 'whale_cluster'
-                AND (
-                    DATE(timestamp, 'unixepoch') = DATE('now')
-                    OR DATE(timestamp/1000, 'unixepoch') = DATE('now')
-                )
-                LIMIT 1
-            """, (sig['market_slug'],))
-            
-            if cur.fetchone():
-                skipped_count += 1
-                continue  # Skip duplicate
-            
-            # Insert new signal
-            cur.execute("""
-                INSERT INTO signals (
-                    timestamp, type, market_slug, market_question, 
-                    outcome, confidence, direction, price, details
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                int(datetime.now().timestamp()),
-                'whale_cluster',
-                sig['market_slug'],
-                sig['market_question'],
-                sig['outcome'],
-                sig['confidence'],
-                f"{sig['side']} {sig['outcome']}",
-                sig['avg_price'],
-                json.dumps({
-                    'whale_count': sig['whale_count'],
-                    'total_size': sig['total_size'],
-                    'time_span_minutes': sig['time_span_minutes'],
-                    'explanation': f"{sig['whale_count']} whales, ${sig['total_size']:,.0f} in {sig['time_span_minutes']} min"
-                })
-            ))
-            inserted_count += 1
-        
-        conn.commit()
-        conn.close()
-        
-        if inserted_count > 0:
-            print(f"✅ Saved {inserted_count} new signals to trading.db")
-        if skipped_count > 0:
-            print(f"⏭️  Skipped {skipped_count} duplicate signals (already exist today)")
-        
-    except Exception as e:
-        print(f"⚠️ Failed to save to database: {e}")
+    signal_store.save_signals(signals, 'whale_cluster', signal_row)
 
 if __name__ == "__main__":
     print("🔍 Scanning for whale clusters...")
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Detector Daemon
+Tails trades.db by first-arrival seq and re-evaluates only the markets that just traded,
+so whale cluster / divergence / reversal signals are written seconds after the
+trade lands instead of on the next cron run.
+
+Keeps the last few hours of trades per (market, outcome) in memory and hands
+each touched market to the same per-market evaluators the batch detectors use.
+New trades are read from the trade_first_seen log (see trade_cursors), so a
+trade the collector re-inserts with INSERT OR REPLACE is only counted once.
+The collector writes in WAL mode, so every commit changes trades.db-wal; the
+loop wakes as soon as that file changes and otherwise polls every
+POLL_INTERVAL seconds. The daemon reads trades.db and never writes it.
+"""
+
+import json
+import os
+import signal
+import sqlite3
+import time
+import importlib.util
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Configuration
+DB_PATH = '/home/clawdbot/polymarket_runtime/data/trades.db'
+POLL_INTERVAL = 5            # Seconds between polls when the WAL hasn't changed
+MAX_BATCH = 10000            # Trades read per poll
+STATE_REFRESH = 600          # Reload whale weights / syndicates every 10 minutes
+PRUNE_INTERVAL = 300         # Drop idle markets from memory every 5 minutes
+HEARTBEAT_FILE = Path("/workspace/runtime/detector-daemon-heartbeat.json")
+PID_FILE = Path("/workspace/runtime/detector-daemon.pid")
+WAL_FILE = Path(DB_PATH + '-wal')   # Collector commits land here first
+
+# Ensure runtime directory exists
+HEARTBEAT_FILE.parent.mkdir(parents=True, exist_ok=True)
+
+running = True
+
+def load_module(filepath, module_name):
+    """Load a Python file as a module"""
+    spec = importlib.util.spec_from_file_location(module_name, filepath)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# Same detectors the aggregator runs - only their per-market evaluators are used here
+whale_detector = load_module(os.path.join(SCRIPTS_DIR, 'detect-whale-clusters.py'), 'whale_detector')
+divergence_detector = load_module(os.path.join(SCRIPTS_DIR, 'detect-smart-money-divergence.py'), 'divergence_detector')
+reversal_detector = load_module(os.path.join(SCRIPTS_DIR, 'detect-momentum-reversal.py'), 'reversal_detector')
+import signal_store
+import trade_cursors
+
+CLUSTER_LOOKBACK = 2 * 3600
+CLUSTER_HISTORY = CLUSTER_LOOKBACK + max(window for window, _ in whale_detector.CLUSTER_WINDOWS)
+DIVERGENCE_LOOKBACK = divergence_detector.LOOKBACK_HOURS * 3600
+REVERSAL_LOOKBACK = reversal_detector.LOOKBACK_HOURS * 3600
+MAX_LOOKBACK = max(CLUSTER_HISTORY, DIVERGENCE_LOOKBACK, REVERSAL_LOOKBACK)
+
+def signal_handler(sig, frame):
+    """Handle shutdown gracefully"""
+    global running
+    print(f"\n🛑 Received signal {sig}, shutting down gracefully...")
+    running = False
+
+def update_heartbeat(daemon):
+    """Write heartbeat timestamp for health monitoring"""
+    try:
+        HEARTBEAT_FILE.write_text(json.dumps({
+            "last_check": int(time.time()),
+            "last_check_iso": datetime.now().isoformat(),
+            "last_seq": daemon.cursor,
+            "markets_tracked": len(daemon.markets),
+            "signals_written": daemon.signals_written,
+            "pid": os.getpid()
+        }, indent=2))
+    except Exception as e:
+        print(f"⚠️  Warning: Could not update heartbeat file: {e}")
+
+def write_pid():
+    """Write PID file"""
+    try:
+        PID_FILE.write_text(str(os.getpid()))
+    except Exception as e:
+        print(f"⚠️  Warning: Could not write PID file: {e}")
+
+def remove_pid():
+    """Remove PID file on shutdown"""
+    try:
+        if PID_FILE.exists():
+            PID_FILE.unlink()
+    except Exception as e:
+        print(f"⚠️  Warning: Could not remove PID file: {e}")
+
+class DetectorDaemon:
+    """Per-market rolling trade windows fed from a trade_first_seen.seq cursor"""
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+        self.cursor = 0
+        # (slug, outcome) -> deque of (timestamp, trader, side, price, size, question)
+        self.markets = defaultdict(deque)
+        self.emitted = set()         # (type, slug, outcome, date) already written
+        self.signals_written = 0
+        self.weights = None
+        self.syndicates = {}
+        self.features = None
+        self.state_loaded_at = 0
+        self.pruned_at = time.time()
+
+    def warm_start(self):
+        """Load the last MAX_LOOKBACK of trades without emitting anything"""
+        # Arm the first-arrival log (a no-op once any batch job has); the only
+        # write the daemon makes, on its own short-lived connection
+        setup = sqlite3.connect(self.db_path)
+        trade_cursors.ensure_first_seen(setup)
+        setup.close()
+
+        self.cursor = trade_cursors.max_seq(self.conn)
+        rows = self.conn.execute("""
+            SELECT t.marketSlug, t.outcome, t.timestamp, t.trader, t.side, t.price, t.sizeUsd,
+                   COALESCE(t.marketQuestion, 'Unknown')
+            FROM trades t
+            JOIN trade_first_seen f ON f.id = t.id
+            WHERE t.timestamp > ? AND f.seq <= ? AND t.marketSlug IS NOT NULL
+            ORDER BY t.timestamp
+        """, (int(time.time()) - MAX_LOOKBACK, self.cursor)).fetchall()
+
+        for slug, outcome, *trade in rows:
+            self.markets[(slug, outcome)].append(tuple(trade))
+
+        self.refresh_state(force=True)
+        return len(rows)
+
+    def refresh_state(self, force=False):
+        """Reload slow-moving context (whale weights, syndicates, wallet features)"""
+        if not force and time.time() - self.state_loaded_at < STATE_REFRESH:
+            return
+        self.weights = whale_detector.whale_weights.load_index(self.db_path)
+        self.syndicates = whale_detector.CoTradingGraph(self.db_path, readonly=True).syndicate_index()
+        self.features = whale_detector.WalletFeatureStore(self.db_path, readonly=True)
+        self.state_loaded_at = time.time()
+
+    def poll(self):
+        """Read one batch of newly arrived trades; returns (keys that traded, more pending)"""
+        newest = trade_cursors.max_seq(self.conn)
+        end = min(newest, self.cursor + MAX_BATCH)
+        if end <= self.cursor:
+            return set(), False
+
+        rows = self.conn.execute(f"""
+            SELECT t.marketSlug, t.outcome, t.timestamp, t.trader, t.side, t.price, t.sizeUsd,
+                   COALESCE(t.marketQuestion, 'Unknown')
+            FROM {trade_cursors.ARRIVED}
+                AND t.marketSlug IS NOT NULL
+            ORDER BY f.seq
+        """, (self.cursor, end)).fetchall()
+
+        touched = set()
+        for slug, outcome, *trade in rows:
+            self.markets[(slug, outcome)].append(tuple(trade))
+            touched.add((slug, outcome))
+        self.cursor = end
+        return touched, end < newest
+
+    def evaluate(self, keys, now):
+        """
+        Run every detector on these market/outcomes; returns [(type, signal)]
+        Candidates are collected across all keys and each type is scored in
+        one batch, then emitted in key order.
+        """
+        candidates = [(sig_type, candidate) for key in keys
+                      for sig_type, candidate in self.candidates(key, now)]
+
+        scorers = {
+            'whale_cluster': whale_detector.score_candidates,
+            'smart_money_divergence': divergence_detector.score_candidates,
+            'momentum_reversal': reversal_detector.score_candidates,
+        }
+        kept = set()
+        for sig_type, scorer in scorers.items():
+            batch = [candidate for t, candidate in candidates if t == sig_type]
+            kept.update(id(sig) for sig in scorer(batch))
+
+        return [(sig_type, sig) for sig_type, (sig, _) in candidates if id(sig) in kept]
+
+    def candidates(self, key, now):
+        """Unscored (type, (signal, features)) candidates for one market/outcome"""
+        slug, outcome = key
+        window = self.markets[key]
+        while window and window[0][0] <= now - MAX_LOOKBACK:
+            window.popleft()
+
+        trades = sorted(window, key=lambda t: t[0])  # Late arrivals can be out of order
+        if not trades:
+            return []
+        question = trades[-1][5]
+        candidates = []
+
+        # Whale clusters (per side)
+        for side in ('BUY', 'SELL'):
+            whales = [(ts, trader, size, price) for ts, trader, s, price, size, _ in trades
+                      if s == side and size >= whale_detector.WHALE_THRESHOLD
+                      and ts > now - CLUSTER_HISTORY]
+            candidate = whale_detector.cluster_candidate(slug, question, outcome, side, whales,
+                                                         now - CLUSTER_LOOKBACK, self.weights, self.syndicates,
+                                                         whale_detector.CLUSTER_WINDOWS, self.features)
+            if candidate:
+                candidates.append(('whale_cluster', candidate))
+
+        # Smart money divergence (whale trades, most recent first)
+        whales = [{'side': s, 'price': price, 'size': size, 'timestamp': ts}
+                  for ts, trader, s, price, size, _ in reversed(trades)
+                  if size >= divergence_detector.WHALE_THRESHOLD and ts > now - DIVERGENCE_LOOKBACK]
+        candidate = divergence_detector.market_candidate(slug, outcome, question, whales)
+        if candidate:
+            candidates.append(('smart_money_divergence', candidate))
+
+        # Momentum reversal (all trades, oldest first)
+        recent = [{'question': q, 'side': s, 'price': price, 'size': size, 'timestamp': ts}
+                  for ts, trader, s, price, size, q in trades if ts > now - REVERSAL_LOOKBACK]
+        candidate = reversal_detector.market_candidate(slug, outcome, recent)
+        if candidate:
+            candidates.append(('momentum_reversal', candidate))
+
+        return candidates
+
+    def save(self, signals):
+        """Write signals not already written today with each detector's row format"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        rows = {
+            'whale_cluster': whale_detector.signal_row,
+            'smart_money_divergence': divergence_detector.signal_row,
+            'momentum_reversal': reversal_detector.signal_row,
+        }
+
+        by_type = defaultdict(list)
+        for sig_type, sig in signals:
+            key = (sig_type, sig['market_slug'], sig['outcome'], today)
+            if key in self.emitted:
+                continue
+            self.emitted.add(key)
+            by_type[sig_type].append(sig)
+
+        for sig_type, sigs in by_type.items():
+            print(f"🚨 {len(sigs)} {sig_type.replace('_', ' ')} signal(s): "
+                  + ', '.join(s['market_slug'] for s in sigs[:3]))
+            signal_store.save_signals(sigs, sig_type, rows[sig_type])
+            self.signals_written += len(sigs)
+
+        # Forget previous days
+        self.emitted = {key for key in self.emitted if key[3] == today}
+
+    def prune(self, now):
+        """Drop markets with no trades inside MAX_LOOKBACK"""
+        stale = [key for key, window in self.markets.items()
+                 if not window or window[-1][0] <= now - MAX_LOOKBACK]
+        for key in stale:
+            del self.markets[key]
+        self.pruned_at = time.time()
+
+    def run_once(self):
+        """One poll + evaluate cycle; returns number of markets evaluated"""
+        touched = set()
+        while True:
+            keys, more = self.poll()
+            touched |= keys
+            if not more:
+                break
+        if not touched:
+            return 0
+
+        self.refresh_state()
+        now = int(time.time())
+        self.save(self.evaluate(touched, now))
+
+        if time.time() - self.pruned_at > PRUNE_INTERVAL:
+            self.prune(now)
+        return len(touched)
+
+def wal_state():
+    """(mtime, size) of the collector's WAL - changes on every commit"""
+    try:
+        stat = WAL_FILE.stat()
+        return stat.st_mtime_ns, stat.st_size
+    except FileNotFoundError:
+        return None
+
+def wait_for_trades(last_wal):
+    """Sleep up to POLL_INTERVAL, waking early once the collector commits"""
+    deadline = time.time() + POLL_INTERVAL
+    while running and time.time() < deadline:
+        state = wal_state()
+        if state != last_wal:
+            return state
+        time.sleep(0.2)
+    return last_wal
+
+def main():
+    """Main daemon loop"""
+    global running
+
+    # Setup signal handlers
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    write_pid()
+
+    print(f"🤖 Detector Daemon Starting")
+    print(f"   Poll interval: {POLL_INTERVAL}s (or on {WAL_FILE} change)")
+    print(f"   Rolling window: {MAX_LOOKBACK / 3600:.0f}h per market")
+    print(f"   Heartbeat file: {HEARTBEAT_FILE}")
+    print(f"   PID file: {PID_FILE}")
+    print(f"   Started at: {datetime.now().isoformat()}\n")
+
+    daemon = DetectorDaemon()
+    warm = daemon.warm_start()
+    print(f"🔥 Warm start: {warm} trades across {len(daemon.markets)} markets (seq {daemon.cursor})")
+
+    last_wal = wal_state()
+    try:
+        while running:
+            check_start = time.time()
+            try:
+                evaluated = daemon.run_once()
+                if evaluated:
+                    print(f"⏰ [{datetime.now().strftime('%H:%M:%S')}] Evaluated {evaluated} market(s) "
+                          f"up to seq {daemon.cursor} ({(time.time() - check_start) * 1000:.0f}ms)")
+                update_heartbeat(daemon)
+            except Exception as e:
+                print(f"❌ Cycle failed: {e}")
+
+            last_wal = wait_for_trades(last_wal)
+    except KeyboardInterrupt:
+        print("\n🛑 Interrupted by user")
+    finally:
+        remove_pid()
+        print(f"👋 Detector Daemon stopped at {datetime.now().isoformat()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Event Flow
+Event-level view of whale flow across sibling markets (e.g. candidate A/B/C
+under one eventSlug)
+
+Whale trades are folded into hourly per-event buckets from a trade arrival
+cursor, so detectors can rank whole events from a small summary table and
+only then pull the trades of the few events that matter, via an
+(eventSlug, timestamp) index.
+
+Reading flow on one sibling as flow against the others only holds when the
+siblings are mutually exclusive (Polymarket neg-risk events).
+event_exclusivity caches that flag per event once a detector has looked it up.
+
+Usage:
+    python3 event_flow.py            # fold in new trades
+    python3 event_flow.py rebuild    # recompute from full history
+"""
+
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import trade_cursors
+
+TRADES_DB = '/home/clawdbot/polymarket_runtime/data/trades.db'
+CURSOR_NAME = 'event_flow'
+WHALE_THRESHOLD = 2000
+BUCKET_SECONDS = 3600
+
+
+def net_yes_flow(outcome, side, volume) -> float:
+    """Signed flow toward 'Yes' (BUY Yes / SELL No positive, BUY No / SELL Yes negative)"""
+    if outcome not in ('Yes', 'No'):
+        return 0.0
+    bullish = (outcome == 'Yes') == (side == 'BUY')
+    return volume if bullish else -volume
+
+
+class EventFlow:
+    """Incrementally maintained hourly whale flow per event and sibling market"""
+
+    def __init__(self, trades_db=TRADES_DB):
+        self.trades_db = trades_db
+        self._ensure_tables()
+
+    def _ensure_tables(self):
+        conn = sqlite3.connect(self.trades_db)
+        cur = conn.cursor()
+
+        # Event lookups on the raw trades table
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_event_ts ON trades(eventSlug, timestamp)
+        """)
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS event_flow_hourly (
+                event_slug TEXT NOT NULL,
+                hour INTEGER NOT NULL,
+                market_slug TEXT NOT NULL,
+                outcome TEXT,
+                side TEXT NOT NULL,
+                volume REAL DEFAULT 0,
+                trades INTEGER DEFAULT 0,
+                PRIMARY KEY (event_slug, hour, market_slug, outcome, side)
+            )
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_event_flow_hour ON event_flow_hourly(hour)
+        """)
+
+        # Whether an event's markets are mutually exclusive (neg-risk); never changes
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS event_exclusivity (
+                event_slug TEXT PRIMARY KEY,
+                neg_risk INTEGER NOT NULL,
+                checked_at INTEGER
+            )
+        """)
+        trade_cursors.ensure_table(conn)
+
+        conn.commit()
+        conn.close()
+
+    def update(self, conn=None) -> int:
+        """Fold whale trades added since the last run into the buckets"""
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(self.trades_db)
+
+        try:
+            processed = trade_cursors.consume(conn, CURSOR_NAME, self._consume)
+        finally:
+            if own_conn:
+                conn.close()
+
+        return processed
+
+    def rebuild(self) -> int:
+        """Recompute every bucket from full history"""
+        conn = sqlite3.connect(self.trades_db)
+        trade_cursors.reset(conn, CURSOR_NAME, ('event_flow_hourly',))
+
+        processed = self.update(conn)
+        conn.close()
+        return processed
+
+    def _consume(self, conn, start, end) -> int:
+        rows = conn.execute(f"""
+            SELECT eventSlug, (timestamp / {BUCKET_SECONDS}) * {BUCKET_SECONDS} as hour,
+                   marketSlug, outcome, side, SUM(sizeUsd), COUNT(*)
+            FROM {trade_cursors.ARRIVED}
+                AND sizeUsd >= ? AND eventSlug IS NOT NULL AND marketSlug IS NOT NULL
+            GROUP BY eventSlug, hour, marketSlug, outcome, side
+        """, (start, end, WHALE_THRESHOLD)).fetchall()
+
+        conn.executemany("""
+            INSERT INTO event_flow_hourly (event_slug, hour, market_slug, outcome, side,
+                                           volume, trades)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(event_slug, hour, market_slug, outcome, side) DO UPDATE SET
+                volume = volume + excluded.volume,
+                trades = trades + excluded.trades
+        """, rows)
+        return sum(row[6] for row in rows)
+
+    def get_event_flows(self, lookback_hours: int = 6, now: int = None) -> Dict[str, Dict]:
+        """
+        Rolling whale flow per event over the last N hours (whole buckets)
+        Returns event_slug -> {'total_volume', 'trades', 'markets': {slug: {...}}}
+        """
+        now = int(time.time()) if now is None else now
+        since = (now - lookback_hours * 3600) // BUCKET_SECONDS * BUCKET_SECONDS
+
+        conn = sqlite3.connect(self.trades_db)
+        rows = conn.execute("""
+            SELECT event_slug, market_slug, outcome, side, SUM(volume), SUM(trades)
+            FROM event_flow_hourly
+            WHERE hour >= ?
+            GROUP BY event_slug, market_slug, outcome, side
+        """, (since,)).fetchall()
+        conn.close()
+
+        events = defaultdict(lambda: {'total_volume': 0.0, 'trades': 0, 'markets': {}})
+        for event_slug, market_slug, outcome, side, volume, trades in rows:
+            event = events[event_slug]
+            event['total_volume'] += volume
+            event['trades'] += trades
+
+            market = event['markets'].setdefault(market_slug, {'volume': 0.0, 'net_yes': 0.0, 'trades': 0})
+            market['volume'] += volume
+            market['net_yes'] += net_yes_flow(outcome, side, volume)
+            market['trades'] += trades
+
+        return dict(events)
+
+    def get_exclusivity(self, event_slugs: List[str]) -> Dict[str, bool]:
+        """Cached neg-risk flags for the given events (unknown events are left out)"""
+        if not event_slugs:
+            return {}
+        conn = sqlite3.connect(self.trades_db)
+        rows = conn.execute(f"""
+            SELECT event_slug, neg_risk FROM event_exclusivity
+            WHERE event_slug IN ({','.join('?' * len(event_slugs))})
+        """, list(event_slugs)).fetchall()
+        conn.close()
+        return {slug: bool(neg_risk) for slug, neg_risk in rows}
+
+    def set_exclusivity(self, flags: Dict[str, bool]):
+        """Cache neg-risk flags looked up from the API"""
+        if not flags:
+            return
+        conn = sqlite3.connect(self.trades_db)
+        conn.executemany("""
+            INSERT OR REPLACE INTO event_exclusivity (event_slug, neg_risk, checked_at)
+            VALUES (?, ?, strftime('%s', 'now'))
+        """, [(slug, int(flag)) for slug, flag in flags.items()])
+        conn.commit()
+        conn.close()
+
+    def get_event_trades(self, event_slug: str, since: int, conn=None) -> List[tuple]:
+        """Whale trades for one event since a timestamp (uses the eventSlug index)"""
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(self.trades_db)
+        rows = conn.execute("""
+            SELECT trader, marketSlug, COALESCE(marketQuestion, 'Unknown'), outcome, side,
+                   price, sizeUsd, timestamp
+            FROM trades
+            WHERE eventSlug = ? AND timestamp >= ? AND sizeUsd >= ?
+            ORDER BY timestamp
+        """, (event_slug, since, WHALE_THRESHOLD)).fetchall()
+        if own_conn:
+            conn.close()
+        return rows
+
+
+if __name__ == '__main__':
+    flow = EventFlow()
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'rebuild':
+        print("🔁 Rebuilding event flow buckets from full trade history...")
+        print(f"✅ Processed {flow.rebuild()} whale trades")
+    else:
+        print(f"✅ Folded {flow.update()} new whale trades into event flow")
@@ -5,7 +5,7 @@ Gets endDate, full questions, and other important market info
 """
 
 import sqlite3
-import requests
+import http_client
 import json
 from datetime import datetime
 
@@ -15,7 +15,7 @@ GAMMA_API = 'https://gamma-api.polymarket.com'
 def fetch_event_metadata(event_slug):
     """Fetch event metadata from Polymarket API"""
     try:
-        response = requests.get(f"{GAMMA_API}/events?slug={event_slug}")
+        response = http_client.get(f"{GAMMA_API}/events?slug={event_slug}")
         if response.status_code == 200:
             events = response.json()
             if events and len(events) > 0:
@@ -5,10 +5,10 @@ Consults latest news context before opening positions
 """
 
 import os
-import requests
+import http_client
 import json
 import re
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 
 # Load environment variables from .env file
@@ -23,9 +23,44 @@ if os.path.exists('/workspace/.env'):
 
 GROK_API_KEY = os.getenv('XAI_API_KEY')
 GROK_API_URL = 'https://api.x.ai/v1/chat/completions'
+BATCH_SIZE = 8  # Markets per batched Grok request
+MAX_SINGLE_FALLBACKS = 3  # Per-item single calls allowed per validate_signals_batch run
+RECOMMENDATIONS = ('TRADE', 'HOLD', 'SKIP')
 
-def call_grok(prompt: str, temperature: float = 0.3) -> Optional[str]:
-    """Call Grok API with given prompt"""
+# Structured output schema for batched validation
+BATCH_RESPONSE_FORMAT = {
+    'type': 'json_schema',
+    'json_schema': {
+        'name': 'market_assessments',
+        'strict': True,
+        'schema': {
+            'type': 'object',
+            'properties': {
+                'assessments': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'id': {'type': 'integer'},
+                            'probability': {'type': 'number'},
+                            'key_factors': {'type': 'array', 'items': {'type': 'string'}},
+                            'concerns': {'type': 'string'},
+                            'recommendation': {'type': 'string', 'enum': list(RECOMMENDATIONS)}
+                        },
+                        'required': ['id', 'probability', 'key_factors', 'concerns', 'recommendation'],
+                        'additionalProperties': False
+                    }
+                }
+            },
+            'required': ['assessments'],
+            'additionalProperties': False
+        }
+    }
+}
+
+def call_grok(prompt: str, temperature: float = 0.3, max_tokens: int = 500,
+              response_format: Optional[Dict] = None, timeout: float = 30) -> Optional[str]:
+    """Call Grok API with given prompt (optionally with a structured response format)"""
     if not GROK_API_KEY:
         print("⚠️  Warning: XAI_API_KEY not set, skipping Grok validation")
         return None
@@ -42,11 +77,13 @@ def call_grok(prompt: str, temperature: float = 0.3) -> Optional[str]:
             {'role': 'user', 'content': prompt}
         ],
         'temperature': temperature,
-        'max_tokens': 500
+        'max_tokens': max_tokens
     }
+    if response_format:
+        payload['response_format'] = response_format
     
     try:
-        response = requests.post(GROK_API_URL, headers=headers, json=payload, timeout=30)
+        response = http_client.post(GROK_API_URL, headers=headers, json=payload, timeout=timeout)
         response.raise_for_status()
         return response.json()['choices'][0]['message']['content']
     except Exception as e:
@@ -75,13 +112,7 @@ Focus on facts from reputable sources and be specific about timing and definitio
 
     response = call_grok(prompt)
     if not response:
-        # Grok unavailable, proceed with algorithmic signal only
-        return {
-            'probability': current_confidence,
-            'reasoning': 'Grok validation unavailable',
-            'should_trade': current_confidence >= 70,
-            'grok_available': False
-        }
+        return unavailable_result(current_confidence)
     
     # Parse Grok response
     probability = parse_probability(response)
@@ -103,6 +134,142 @@ Focus on facts from reputable sources and be specific about timing and definitio
         'full_response': response
     }
 
+def unavailable_result(current_confidence: float) -> Dict:
+    """Grok unavailable, proceed with algorithmic signal only"""
+    return {
+        'probability': current_confidence,
+        'reasoning': 'Grok validation unavailable',
+        'should_trade': current_confidence >= 70,
+        'grok_available': False
+    }
+
+def validate_signals_batch(signals: List[Dict], batch_size: int = BATCH_SIZE,
+                           max_fallbacks: int = MAX_SINGLE_FALLBACKS) -> Dict[int, Dict]:
+    """
+    Validate many signals with one Grok request per batch of markets
+    signals: dicts with id, market_question, market_slug, confidence, outcome
+    Returns dict of signal id -> result (same shape as validate_signal_with_grok)
+    Items missing or malformed in a batch response fall back to single calls, at
+    most max_fallbacks per run. A batch whose request failed outright gets no
+    fallbacks - single calls to the same API would only fail the same way.
+    """
+    results = {}
+    fallbacks = 0
+    
+    for start in range(0, len(signals), batch_size):
+        batch = signals[start:start + batch_size]
+        
+        response = call_grok(build_batch_prompt(batch), max_tokens=300 * len(batch),
+                             response_format=BATCH_RESPONSE_FORMAT)
+        if not response:
+            for sig in batch:
+                results[sig['id']] = unavailable_result(sig['confidence'])
+            continue
+        
+        assessments = parse_batch_response(response, {sig['id'] for sig in batch})
+        for sig in batch:
+            assessment = assessments.get(sig['id'])
+            if assessment is not None:
+                results[sig['id']] = build_result(assessment, sig['confidence'])
+            elif fallbacks < max_fallbacks:
+                # Strict parse failed for this item - ask about it on its own
+                fallbacks += 1
+                results[sig['id']] = validate_signal_with_grok(
+                    sig['market_question'], sig['market_slug'], sig['confidence'], sig['outcome'])
+            else:
+                results[sig['id']] = unavailable_result(sig['confidence'])
+    
+    return results
+
+def build_batch_prompt(batch: List[Dict]) -> str:
+    """Build one prompt covering every market in the batch"""
+    markets = "\n".join(
+        f"- id {sig['id']}: {sig['market_question']} | Betting on: {sig['outcome']} | "
+        f"Algorithmic confidence: {sig['confidence']}%"
+        for sig in batch
+    )
+    
+    return f"""Based on the latest news from accurate sources on X/Twitter, analyze each of these prediction markets:
+
+{markets}
+
+Return one assessment per market id with:
+- probability: 0-100 chance the stated outcome happens
+- key_factors: relevant news items
+- concerns: any ambiguities, definitional issues, or red flags (empty string if none)
+- recommendation: TRADE, HOLD or SKIP
+
+Focus on facts from reputable sources and be specific about timing and definitions."""
+
+def parse_batch_response(text: str, expected_ids: set) -> Dict[int, Dict]:
+    """
+    Strictly parse a batched JSON response
+    Returns only items that are complete and well-typed, keyed by id
+    """
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return {}
+    
+    if not isinstance(data, dict) or not isinstance(data.get('assessments'), list):
+        return {}
+    
+    parsed = {}
+    for item in data['assessments']:
+        if not isinstance(item, dict):
+            continue
+        
+        item_id = item.get('id')
+        probability = item.get('probability')
+        concerns = item.get('concerns')
+        recommendation = item.get('recommendation')
+        key_factors = item.get('key_factors')
+        
+        if item_id not in expected_ids or item_id in parsed:
+            continue
+        if isinstance(probability, bool) or not isinstance(probability, (int, float)):
+            continue
+        if not 0 <= probability <= 100:
+            continue
+        if not isinstance(concerns, str) or not isinstance(key_factors, list):
+            continue
+        if not isinstance(recommendation, str) or recommendation.upper() not in RECOMMENDATIONS:
+            continue
+        
+        parsed[item_id] = {
+            'probability': float(probability),
+            'key_factors': [str(f) for f in key_factors],
+            'concerns': concerns.strip(),
+            'recommendation': recommendation.upper()
+        }
+    
+    return parsed
+
+def build_result(assessment: Dict, current_confidence: float) -> Dict:
+    """Turn a parsed batch assessment into a validation result"""
+    probability = assessment['probability']
+    concerns = flag_concerns(assessment['concerns'])
+    recommendation = assessment['recommendation']
+    
+    should_trade = decide_trade(probability, current_confidence, concerns, recommendation)
+    
+    reasoning = f"{current_confidence}% algo, {probability}% Grok"
+    if concerns:
+        reasoning += f" | Concerns: {concerns[:100]}"
+    
+    full_response = (f"PROBABILITY: {probability}%\n"
+                     f"KEY FACTORS: {'; '.join(assessment['key_factors'])}\n"
+                     f"CONCERNS: {assessment['concerns']}\n"
+                     f"RECOMMENDATION: {recommendation}")
+    
+    return {
+        'probability': probability,
+        'reasoning': reasoning,
+        'should_trade': should_trade,
+        'grok_available': True,
+        'full_response': full_response
+    }
+
 def parse_probability(text: str) -> float:
     """Extract probability from Grok response"""
     match = re.search(r'PROBABILITY:\s*(\d+(?:\.\d+)?)', text)
@@ -116,11 +283,14 @@ def extract_concerns(text: str) -> str:
     """Extract concerns section"""
     match = re.search(r'CONCERNS:\s*(.+?)(?=RECOMMENDATION:|$)', text, re.DOTALL)
     if match:
-        concerns = match.group(1).strip()
-        # Look for red flags
-        red_flags = ['partial', 'ambiguous', 'unclear', 'definition', 'depends on']
-        if any(flag in concerns.lower() for flag in red_flags):
-            return concerns[:200]  # Truncate
+        return flag_concerns(match.group(1).strip())
+    return ""
+
+def flag_concerns(concerns: str) -> str:
+    """Keep concerns only if they contain red flags"""
+    red_flags = ['partial', 'ambiguous', 'unclear', 'definition', 'depends on']
+    if any(flag in concerns.lower() for flag in red_flags):
+        return concerns[:200]  # Truncate
     return ""
 
 def extract_recommendation(text: str) -> str:
@@ -4,7 +4,7 @@ Cheap Grok calls using grok-3-mini for frequent position monitoring
 """
 
 import os
-import requests
+import http_client
 from typing import Optional
 
 
@@ -42,7 +42,7 @@ def call_grok_mini(prompt: str, temperature: float = 0.3) -> Optional[str]:
     }
     
     try:
-        response = requests.post(GROK_API_URL, headers=headers, json=payload, timeout=20)
+        response = http_client.post(GROK_API_URL, headers=headers, json=payload, timeout=20)
         response.raise_for_status()
         return response.json()['choices'][0]['message']['content']
     except Exception as e:
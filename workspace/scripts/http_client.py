@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client
+Keep-alive connection pools, rate limiting, retries and circuit breaking
+for every outbound call (gamma-api, data-api, clob, x.ai, Mission Control)
+
+Usage:
+    import http_client
+    response = http_client.get(url, params={...}, timeout=5)
+
+Drop-in for requests.get/post/head - returns a requests.Response.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Requests per second / burst size per host (token bucket)
+HOST_RATE_LIMITS = {
+    'gamma-api.polymarket.com': (10, 20),
+    'data-api.polymarket.com': (10, 20),
+    'clob.polymarket.com': (10, 20),
+    'polymarket.com': (5, 10),
+    'api.x.ai': (2, 4),
+}
+DEFAULT_RATE_LIMIT = (5, 10)
+UNLIMITED_HOSTS = {'localhost', '127.0.0.1'}
+
+POOL_SIZE = 16            # Keep-alive connections per host
+MAX_RETRIES = 3           # Retries on 429/5xx and connection errors
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS'}  # Only these retry unless asked
+BACKOFF_BASE = 0.5        # Seconds, doubled each attempt
+BACKOFF_MAX = 10.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+BREAKER_THRESHOLD = 5     # Consecutive failures before the circuit opens
+BREAKER_COOLDOWN = 30     # Seconds before a half-open trial request
+
+LATENCY_SAMPLES = 200     # Recent latencies kept per host for percentiles
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised when a host's circuit breaker is open"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures -> half-open (one trial) after cooldown"""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False        # Half-open trial request in flight
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            # Half-open: let exactly one trial through until it reports back
+            self.trial = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.trial = False
+
+    def release(self):
+        """Outcome says nothing about host health (e.g. 429) - free the trial slot"""
+        with self.lock:
+            self.trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        return 'half-open' if self.trial else 'open'
+
+
+class HostMetrics:
+    """Per-host request counters and latency samples"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.rejected = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples = deque(maxlen=LATENCY_SAMPLES)
+        self.lock = threading.Lock()
+
+    def record(self, latency_ms: float, ok: bool):
+        with self.lock:
+            self.requests += 1
+            self.total_ms += latency_ms
+            self.max_ms = max(self.max_ms, latency_ms)
+            self.samples.append(latency_ms)
+            if not ok:
+                self.errors += 1
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            samples = sorted(self.samples)
+
+            def pct(p):
+                return round(samples[min(len(samples) - 1, int(len(samples) * p))], 1) if samples else 0
+
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'retries': self.retries,
+                'rejected': self.rejected,
+                'avg_ms': round(self.total_ms / self.requests, 1) if self.requests else 0,
+                'p50_ms': pct(0.50),
+                'p95_ms': pct(0.95),
+                'max_ms': round(self.max_ms, 1)
+            }
+
+
+class HttpClient:
+    """Session-per-host client with rate limiting, retries and circuit breaking"""
+
+    def __init__(self, rate_limits: Optional[Dict] = None, max_retries: int = MAX_RETRIES):
+        self.rate_limits = rate_limits if rate_limits is not None else HOST_RATE_LIMITS
+        self.max_retries = max_retries
+        self.sessions = {}
+        self.buckets = {}
+        self.breakers = {}
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _host_state(self, host: str):
+        with self.lock:
+            if host not in self.sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self.sessions[host] = session
+
+                if host not in UNLIMITED_HOSTS:
+                    rate, burst = self.rate_limits.get(host, DEFAULT_RATE_LIMIT)
+                    self.buckets[host] = TokenBucket(rate, burst)
+                self.breakers[host] = CircuitBreaker()
+                self.metrics[host] = HostMetrics()
+
+            return (self.sessions[host], self.buckets.get(host),
+                    self.breakers[host], self.metrics[host])
+
+    def request(self, method: str, url: str, retries: Optional[int] = None, **kwargs) -> requests.Response:
+        """
+        Send a request; retries 429/5xx and connection errors with jittered backoff
+        Only idempotent methods retry by default - pass retries= to opt a POST in
+        Returns the final response (which may still be an error status)
+        Raises CircuitOpenError if the host is failing, or the last connection error
+        """
+        host = urlsplit(url).hostname or ''
+        session, bucket, breaker, metrics = self._host_state(host)
+        kwargs.setdefault('timeout', 10)
+        if retries is not None:
+            max_retries = retries
+        else:
+            max_retries = self.max_retries if method.upper() in IDEMPOTENT_METHODS else 0
+
+        for attempt in range(max_retries + 1):
+            if not breaker.allow():
+                with metrics.lock:
+                    metrics.rejected += 1
+                raise CircuitOpenError(f"Circuit open for {host} (cooling down)")
+
+            if bucket:
+                bucket.acquire()
+
+            started = time.monotonic()
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                metrics.record((time.monotonic() - started) * 1000, ok=False)
+                breaker.record_failure()
+                if attempt == max_retries:
+                    raise
+                self._backoff(attempt, metrics)
+                continue
+            except Exception:
+                breaker.release()
+                raise
+
+            latency_ms = (time.monotonic() - started) * 1000
+            failed = response.status_code in RETRY_STATUSES
+            metrics.record(latency_ms, ok=not failed)
+
+            if not failed:
+                breaker.record_success()
+                return response
+
+            # Rate limiting means the host is up - back off without tripping the breaker
+            if response.status_code == 429:
+                breaker.release()
+            else:
+                breaker.record_failure()
+            if attempt == max_retries:
+                return response
+            self._backoff(attempt, metrics, response.headers.get('Retry-After'))
+
+        return response
+
+    def _backoff(self, attempt: int, metrics: HostMetrics, retry_after: Optional[str] = None):
+        """Sleep with full jitter (or honour Retry-After)"""
+        with metrics.lock:
+            metrics.retries += 1
+
+        delay = None
+        if retry_after:
+            try:
+                delay = min(float(retry_after), BACKOFF_MAX)
+            except ValueError:
+                pass
+        if delay is None:
+            delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+        time.sleep(delay)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request('HEAD', url, **kwargs)
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Per-host latency/error metrics plus breaker state"""
+        with self.lock:
+            hosts = list(self.metrics.items())
+
+        result = {}
+        for host, metrics in hosts:
+            result[host] = metrics.snapshot()
+            result[host]['circuit'] = self.breakers[host].state
+        return result
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+
+# Shared process-wide client
+_client = None
+_client_lock = threading.Lock()
+
+def get_client() -> HttpClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+def get(url: str, **kwargs) -> requests.Response:
+    return get_client().get(url, **kwargs)
+
+def post(url: str, **kwargs) -> requests.Response:
+    return get_client().post(url, **kwargs)
+
+def head(url: str, **kwargs) -> requests.Response:
+    return get_client().head(url, **kwargs)
+
+def get_metrics() -> Dict[str, Dict]:
+    return get_client().get_metrics()
+
+def format_metrics() -> str:
+    """One line per host for end-of-run logging"""
+    lines = []
+    for host, m in sorted(get_metrics().items()):
+        lines.append(f"   🌐 {host}: {m['requests']} req, {m['errors']} err, {m['retries']} retries, "
+                     f"avg {m['avg_ms']}ms, p95 {m['p95_ms']}ms, circuit {m['circuit']}")
+    return "\n".join(lines)
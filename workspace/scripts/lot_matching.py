@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+FIFO Lot Matching
+Keeps open BUY lots per (trader, market, outcome) in trades.db and consumes
+SELLs against them oldest-first, with partial fills
+
+Lots are held in shares (sizeUsd / price) so a fill realizes
+(sell price - buy price) x shares; matched volume is the cost basis of the
+shares closed. Realized P&L per trader is updated incrementally from the
+trade arrival log (trade_cursors), which lists each trade id once even when
+the collector re-inserts it, so each run only touches new trades instead of
+replaying all history. A first
+run (or rebuild) replays history as the leaderboard pass: every whale trade in
+one scan sorted by (trader, market, outcome, timestamp), matched a segment at
+a time, and the books written back in bulk.
+"""
+
+import sqlite3
+from collections import deque, defaultdict
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, List, Optional
+
+import trade_cursors
+
+TRADES_DB = '/home/clawdbot/polymarket_runtime/data/trades.db'
+WHALE_MIN_SIZE = 1000     # Only whale trades open/close lots
+CURSOR_NAME = 'lot_matching_shares'   # Renamed when lots moved from USD to shares: forces one replay
+
+
+class LotMatcher:
+    """Persistent FIFO inventory of whale BUY lots and realized trade P&L"""
+
+    def __init__(self, trades_db=TRADES_DB):
+        self.trades_db = trades_db
+        self._ensure_tables()
+
+    def _ensure_tables(self):
+        conn = sqlite3.connect(self.trades_db)
+        cur = conn.cursor()
+
+        # Remaining size of each BUY not yet matched by a SELL
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS open_lots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                trader TEXT NOT NULL,
+                market_slug TEXT NOT NULL,
+                outcome TEXT,
+                price REAL NOT NULL,
+                size_remaining REAL NOT NULL,   -- Shares
+                opened_at INTEGER NOT NULL,
+                trade_rowid INTEGER             -- trade_first_seen.seq of the BUY
+            )
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_open_lots_position
+            ON open_lots(trader, market_slug, outcome, opened_at)
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_open_lots_market
+            ON open_lots(market_slug)
+        """)
+
+        # Realized P&L from matched BUY/SELL size (Case #1)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS trader_realized (
+                trader TEXT PRIMARY KEY,
+                realized_pnl REAL DEFAULT 0,
+                closed_count INTEGER DEFAULT 0,
+                wins INTEGER DEFAULT 0,
+                matched_volume REAL DEFAULT 0,
+                last_updated INTEGER
+            )
+        """)
+        trade_cursors.ensure_table(conn)
+
+        conn.commit()
+        conn.close()
+
+    def update(self, conn=None) -> int:
+        """
+        Match trades added since the last run
+        Returns number of new whale trades processed
+        """
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(self.trades_db)
+
+        try:
+            if trade_cursors.get_cursor(conn, CURSOR_NAME) == 0:
+                processed = self._replay(conn)
+            else:
+                processed = trade_cursors.consume(conn, CURSOR_NAME, self._consume)
+        finally:
+            if own_conn:
+                conn.close()
+
+        return processed
+
+    def rebuild(self) -> int:
+        """Drop all lots and realized P&L and replay every whale trade"""
+        conn = sqlite3.connect(self.trades_db)
+        processed = self._replay(conn)
+        conn.close()
+        return processed
+
+    def _replay(self, conn) -> int:
+        """Single pass over all whale trades into fresh books"""
+        conn.execute("DELETE FROM open_lots")
+        conn.execute("DELETE FROM trader_realized")
+        end = trade_cursors.max_seq(conn)
+        cur = conn.execute("""
+            SELECT trader, marketSlug, outcome, side, price, sizeUsd / price, timestamp, f.seq
+            FROM trade_first_seen f
+            JOIN trades t ON t.id = f.id
+            WHERE f.seq <= ? AND sizeUsd >= ? AND price > 0 AND marketSlug IS NOT NULL
+            ORDER BY trader, marketSlug, outcome, timestamp, f.seq
+        """, (end, WHALE_MIN_SIZE))
+
+        lots = []
+        realized = []
+        processed = 0
+        for trader, trader_trades in groupby(cur, key=itemgetter(0)):
+            stats = [0.0, 0, 0, 0.0]  # pnl, closed, wins, volume
+            for key, segment in groupby(trader_trades, key=itemgetter(0, 1, 2)):
+                book = deque()
+                for _, _, _, side, price, shares, ts, seq in segment:
+                    processed += 1
+                    if side == 'BUY':
+                        book.append([price, shares, ts, seq])
+                    else:
+                        _record_sell(stats, *_consume(book, price, shares))
+                lots.extend(key + tuple(lot) for lot in book)
+            if stats[1]:
+                realized.append((trader,) + tuple(stats))
+
+        conn.executemany("""
+            INSERT INTO open_lots (trader, market_slug, outcome, price, size_remaining,
+                                   opened_at, trade_rowid)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, lots)
+        conn.executemany("""
+            INSERT INTO trader_realized (trader, realized_pnl, closed_count, wins,
+                                         matched_volume, last_updated)
+            VALUES (?, ?, ?, ?, ?, strftime('%s', 'now'))
+        """, realized)
+        trade_cursors.set_cursor(conn, CURSOR_NAME, end)
+        conn.commit()
+        return processed
+
+    def _consume(self, conn, start, end) -> int:
+        rows = conn.execute(f"""
+            SELECT f.seq, trader, marketSlug, outcome, side, price, sizeUsd / price, timestamp
+            FROM {trade_cursors.ARRIVED}
+                AND sizeUsd >= ? AND price > 0 AND marketSlug IS NOT NULL
+            ORDER BY timestamp, f.seq
+        """, (start, end, WHALE_MIN_SIZE)).fetchall()
+        self._apply(conn, rows)
+        return len(rows)
+
+    def _apply(self, conn, rows: List[tuple]):
+        """Run one chunk of trades (timestamp order) through the FIFO books"""
+        if not rows:
+            return
+
+        cur = conn.cursor()
+        books = {}
+        realized = defaultdict(lambda: [0.0, 0, 0, 0.0])  # pnl, closed, wins, volume
+
+        for seq, trader, market, outcome, side, price, shares, ts in rows:
+            key = (trader, market, outcome)
+            if key not in books:
+                cur.execute("""
+                    SELECT price, size_remaining, opened_at, trade_rowid
+                    FROM open_lots
+                    WHERE trader = ? AND market_slug = ? AND outcome IS ?
+                    ORDER BY opened_at, id
+                """, key)
+                books[key] = deque(list(lot) for lot in cur.fetchall())
+            book = books[key]
+
+            if side == 'BUY':
+                book.append([price, shares, ts, seq])
+                continue
+
+            _record_sell(realized[trader], *_consume(book, price, shares))
+
+        # Write back every touched book
+        for key, book in books.items():
+            cur.execute("""
+                DELETE FROM open_lots WHERE trader = ? AND market_slug = ? AND outcome IS ?
+            """, key)
+            cur.executemany("""
+                INSERT INTO open_lots (trader, market_slug, outcome, price, size_remaining,
+                                       opened_at, trade_rowid)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [key + tuple(lot) for lot in book])
+
+        cur.executemany("""
+            INSERT INTO trader_realized (trader, realized_pnl, closed_count, wins,
+                                         matched_volume, last_updated)
+            VALUES (?, ?, ?, ?, ?, strftime('%s', 'now'))
+            ON CONFLICT(trader) DO UPDATE SET
+                realized_pnl = realized_pnl + excluded.realized_pnl,
+                closed_count = closed_count + excluded.closed_count,
+                wins = wins + excluded.wins,
+                matched_volume = matched_volume + excluded.matched_volume,
+                last_updated = excluded.last_updated
+        """, [(trader,) + tuple(stats) for trader, stats in realized.items()])
+
+    def get_realized(self, trader: str, conn=None) -> Optional[tuple]:
+        """(realized_pnl, closed_count, wins, matched_volume) for one trader"""
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(self.trades_db)
+        row = conn.execute("""
+            SELECT realized_pnl, closed_count, wins, matched_volume
+            FROM trader_realized WHERE trader = ?
+        """, (trader,)).fetchone()
+        if own_conn:
+            conn.close()
+        return row
+
+    def get_all_realized(self, conn=None) -> Dict[str, tuple]:
+        """trader -> (realized_pnl, closed_count, wins, matched_volume)"""
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(self.trades_db)
+        rows = conn.execute("""
+            SELECT trader, realized_pnl, closed_count, wins, matched_volume
+            FROM trader_realized
+        """).fetchall()
+        if own_conn:
+            conn.close()
+        return {row[0]: row[1:] for row in rows}
+
+
+def _consume(book: deque, price: float, shares: float):
+    """
+    SELL shares against a book: oldest lots first, partially if needed
+    Returns (pnl, matched cost basis in USD)
+    """
+    remaining = shares
+    pnl = 0.0
+    matched = 0.0
+    while remaining > 1e-9 and book:
+        lot = book[0]
+        fill = min(lot[1], remaining)
+        pnl += (price - lot[0]) * fill
+        matched += lot[0] * fill
+        remaining -= fill
+        lot[1] -= fill
+        if lot[1] <= 1e-9:
+            book.popleft()
+    return pnl, matched
+
+def _record_sell(stats: list, pnl: float, matched: float):
+    # Any unmatched remainder is a sell with no tracked inventory - ignored
+    if matched > 0:
+        stats[0] += pnl
+        stats[1] += 1
+        stats[2] += 1 if pnl > 0 else 0
+        stats[3] += matched
+
+
+if __name__ == '__main__':
+    import sys
+
+    matcher = LotMatcher()
+    if len(sys.argv) > 1 and sys.argv[1] == 'rebuild':
+        print("🔁 Rebuilding lots from full trade history...")
+        count = matcher.rebuild()
+    else:
+        count = matcher.update()
+    print(f"✅ Matched {count} new whale trades")
@@ -2,12 +2,18 @@
 """
 Mark expired/invalid signals so they don't show as "untapped"
 Checks untapped signals and marks them as position_opened=1 if:
-- Market deadline has passed
+- Market deadline has passed, or the signal outlived its detector's TTL
+  (same expiry rules as auto-trader - see signal_scheduler.py)
 - Market is high-frequency (< 24 hours from now)
 """
 import sqlite3
-from datetime import datetime, timedelta
-import re
+import sys
+import os
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from signal_scheduler import expires_at, market_deadline, signal_time
 
 TRADING_DB = '/opt/polymarket/data/trading.db'
 
@@ -19,7 +25,7 @@ cur = conn.cursor()
 
 # Get untapped signals
 cur.execute("""
-    SELECT id, market_question, market_slug, timestamp, confidence
+    SELECT id, type, market_question, market_slug, timestamp, confidence
     FROM signals
     WHERE position_opened = 0
     ORDER BY confidence DESC
@@ -31,37 +37,21 @@ print(f"Found {len(signals)} untapped signals\n")
 marked_count = 0
 reasons = {}
 
-for sig_id, question, slug, ts, conf in signals:
+now = time.time()
+
+for sig_id, sig_type, question, slug, ts, conf in signals:
     should_mark = False
     reason = None
+    signal = {'type': sig_type, 'market_question': question, 'timestamp': ts}
     
-    # Check for date patterns in question
-    # "by February 9, 2026", "on February 10", "March 2, 2AM ET"
-    date_patterns = [
-        r'by (\w+ \d+),? (\d{4})',          # "by February 9, 2026"
-        r'on (\w+ \d+),? (\d{4})',          # "on February 10, 2026"
-        r'(\w+ \d+),? (\d+)(?:AM|PM)',      # "March 2, 2AM"
-        r'end of (\w+)',                     # "end of February"
-    ]
-    
-    for pattern in date_patterns:
-        match = re.search(pattern, question, re.IGNORECASE)
-        if match:
-            try:
-                # Try to parse the date
-                date_str = match.group(0)
-                
-                # Check for common expired dates
-                if 'February 9' in date_str or 'February 10' in date_str:
-                    should_mark = True
-                    reason = 'Expired (Feb deadline passed)'
-                    break
-                elif 'March 2' in date_str:
-                    should_mark = True
-                    reason = 'Expired (March 2 deadline passed)'
-                    break
-            except:
-                pass
+    # Market deadline named in the question ("by February 9, 2026", "March 2, 2AM ET")
+    deadline = market_deadline(question, signal_time(signal))
+    if deadline is not None and deadline <= now:
+        should_mark = True
+        reason = f"Expired ({datetime.fromtimestamp(deadline - 1):%B %-d} deadline passed)"
+    elif expires_at(signal) <= now:
+        should_mark = True
+        reason = f"Stale ({sig_type} signal past its TTL)"
     
     # Check for high-frequency markets (Up or Down hourly)
     if 'Up or Down' in question and any(x in question for x in ['AM ET', 'PM ET', '1AM', '2AM', '1PM', '2PM']):
@@ -8,20 +8,24 @@ import re
 import calendar
 from datetime import datetime, timedelta
 
-def should_skip_market(market_question, market_slug):
+def should_skip_market(market_question, market_slug, now=None):
     """
     Check if a market should be skipped based on various criteria
     Returns: (should_skip, reason)
     
+    now: the datetime the date-based filters (past years, expired, same-day)
+    judge against - defaults to the wall clock; replays pass their own clock
+    
     Philosophy: Only trade markets where whale activity signals insider information,
     not just rich gamblers. Skip sports, entertainment, weather, and short-term gambling.
     """
     
     slug_lower = market_slug.lower()
     question_lower = market_question.lower()
+    now = now or datetime.now()
     
     # Filter 1: Markets about past years
-    current_year = datetime.now().year
+    current_year = now.year
     years_in_question = re.findall(r'\b(20\d{2})\b', market_question)
     
     for year_str in years_in_question:
@@ -89,7 +93,7 @@ def should_skip_market(market_question, market_slug):
     
     # Filter 7: Expired markets (deadline has passed)
     # Check for date patterns in slug: march-3, march-4, march-5, etc.
-    current_date = datetime.now()
+    current_date = now
     
     # Pattern: month-day in slug (e.g., "march-3", "february-28")
     for month_num in range(1, 13):
@@ -117,8 +121,8 @@ def should_skip_market(market_question, market_slug):
         if any(x in question_lower for x in ['3pm', '2pm', '1pm', '4pm', '5pm', 'march 6', 'march 7', 'march 8', 'march 9']):
             return True, "High-frequency market (resolves too quickly for our cycle)"
         # Generic "up or down" on current/next day
-        today = datetime.now().strftime('%B %d').lower()  # e.g., "march 6"
-        tomorrow = (datetime.now() + timedelta(days=1)).strftime('%B %d').lower()
+        today = now.strftime('%B %d').lower()  # e.g., "march 6"
+        tomorrow = (now + timedelta(days=1)).strftime('%B %d').lower()
         if today in question_lower or tomorrow in question_lower or 'today' in question_lower:
             return True, "High-frequency market (resolves same-day)"
     
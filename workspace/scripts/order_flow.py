@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Order Flow Imbalance
+Streaming per-(market, outcome) state: exponentially weighted signed whale
+volume and total volume, plus an EWMA baseline of the resulting imbalance
+
+Each trade updates its market's state in O(1) from a trade arrival cursor, so
+a run costs only the trades that arrived since the last one. A crossing is
+reported when the imbalance z-score leaves its baseline band; the market then
+stays quiet until it falls back inside Z_REARM.
+
+Usage:
+    python3 order_flow.py            # fold in new trades
+    python3 order_flow.py rebuild    # recompute from full history
+"""
+
+import math
+import sqlite3
+import sys
+from typing import Dict, List, Optional
+
+import trade_cursors
+
+TRADES_DB = '/home/clawdbot/polymarket_runtime/data/trades.db'
+CURSOR_NAME = 'order_flow'
+SQL_PARAM_CHUNK = 500     # Markets per state-load query
+
+# Every stored trade carries signed flow: the collector only keeps trades of
+# $2K and up (MIN_TRADE_SIZE in src/utils/sqlite_database.ts), so all of them
+# are whale prints already
+TAU_FLOW = 900            # Flow EWMA time constant (seconds)
+BASELINE_ALPHA = 0.005    # Per-trade weight of the imbalance baseline (slow)
+WARMUP_TRADES = 50        # Trades before a market's baseline is trusted
+MIN_FLOW_VOLUME = 5000    # Minimum decayed total volume for a crossing
+Z_THRESHOLD = 2.5         # |z| that fires a crossing
+Z_REARM = 1.0             # |z| below which a market can fire again
+MIN_STD = 0.05            # Floor on baseline std (quiet markets)
+
+STATE_COLUMNS = ('signed_flow', 'total_flow', 'imb_mean', 'imb_var',
+                 'last_ts', 'trades', 'alert_state', 'last_price')
+
+
+class OrderFlowState:
+    """Persisted EWMA order-flow state per (market, outcome)"""
+
+    def __init__(self, trades_db=TRADES_DB):
+        self.trades_db = trades_db
+        self._ensure_tables()
+
+    def _ensure_tables(self):
+        conn = sqlite3.connect(self.trades_db)
+        cur = conn.cursor()
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS order_flow_state (
+                market_slug TEXT NOT NULL,
+                outcome TEXT NOT NULL,
+                signed_flow REAL DEFAULT 0,
+                total_flow REAL DEFAULT 0,
+                imb_mean REAL DEFAULT 0,
+                imb_var REAL DEFAULT 0,
+                last_ts INTEGER DEFAULT 0,
+                trades INTEGER DEFAULT 0,
+                alert_state INTEGER DEFAULT 0,
+                last_price REAL,
+                PRIMARY KEY (market_slug, outcome)
+            )
+        """)
+        trade_cursors.ensure_table(conn)
+
+        conn.commit()
+        conn.close()
+
+    def update(self, conn=None, emit_since: int = 0) -> List[Dict]:
+        """
+        Fold trades added since the last run into the state
+        Returns crossings from trades with timestamp > emit_since
+        """
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(self.trades_db)
+
+        crossings = []
+
+        def consume(conn, start, end):
+            rows = conn.execute(f"""
+                SELECT marketSlug, COALESCE(marketQuestion, 'Unknown'), outcome,
+                       side, price, sizeUsd, timestamp
+                FROM {trade_cursors.ARRIVED}
+                    AND marketSlug IS NOT NULL AND outcome IS NOT NULL
+                ORDER BY timestamp, f.seq
+            """, (start, end)).fetchall()
+            crossings.extend(self._apply(conn, rows, emit_since))
+            return len(rows)
+
+        try:
+            trade_cursors.consume(conn, CURSOR_NAME, consume)
+        finally:
+            if own_conn:
+                conn.close()
+
+        return crossings
+
+    def rebuild(self) -> int:
+        """Drop all state and replay every trade (no crossings reported)"""
+        conn = sqlite3.connect(self.trades_db)
+        trade_cursors.reset(conn, CURSOR_NAME, ('order_flow_state',))
+
+        self.update(conn, emit_since=2 ** 62)
+        count = conn.execute("SELECT COUNT(*) FROM order_flow_state").fetchone()[0]
+        conn.close()
+        return count
+
+    def _apply(self, conn, rows, emit_since) -> List[Dict]:
+        if not rows:
+            return []
+
+        cur = conn.cursor()
+        states = self._load(cur, {(row[0], row[2]) for row in rows})
+        crossings = []
+
+        for market, question, outcome, side, price, size, ts in rows:
+            key = (market, outcome)
+            s = states.get(key)
+            if s is None:
+                s = states[key] = dict.fromkeys(STATE_COLUMNS, 0)
+                s['last_ts'] = ts
+
+            crossing = step(s, side, price, size, ts)
+            if crossing and ts > emit_since:
+                crossing.update({'market_slug': market, 'market_question': question,
+                                 'outcome': outcome, 'timestamp': ts})
+                crossings.append(crossing)
+
+        cur.executemany(f"""
+            INSERT OR REPLACE INTO order_flow_state (market_slug, outcome, {', '.join(STATE_COLUMNS)})
+            VALUES (?, ?{', ?' * len(STATE_COLUMNS)})
+        """, [key + tuple(s[c] for c in STATE_COLUMNS) for key, s in states.items()])
+
+        return crossings
+
+    def _load(self, cur, keys) -> Dict[tuple, Dict]:
+        """Stored state for the given (market, outcome) keys, one query per market chunk"""
+        states = {}
+        markets = sorted({market for market, _ in keys})
+        for i in range(0, len(markets), SQL_PARAM_CHUNK):
+            chunk = markets[i:i + SQL_PARAM_CHUNK]
+            cur.execute(f"""
+                SELECT market_slug, outcome, {', '.join(STATE_COLUMNS)} FROM order_flow_state
+                WHERE market_slug IN ({','.join('?' * len(chunk))})
+            """, chunk)
+            for market, outcome, *row in cur.fetchall():
+                if (market, outcome) in keys:
+                    states[(market, outcome)] = dict(zip(STATE_COLUMNS, row))
+        return states
+
+
+def step(s: Dict, side: str, price: float, size: float, ts: int) -> Optional[Dict]:
+    """Apply one trade to a state dict in place; returns a crossing or None"""
+    decay = math.exp(-max(ts - s['last_ts'], 0) / TAU_FLOW)
+    s['signed_flow'] *= decay
+    s['total_flow'] *= decay
+    s['last_ts'] = max(s['last_ts'], ts)
+    s['last_price'] = price
+
+    s['total_flow'] += size
+    s['signed_flow'] += size if side == 'BUY' else -size
+
+    imbalance = s['signed_flow'] / s['total_flow'] if s['total_flow'] > 0 else 0.0
+
+    # Score against the baseline as it stood before this trade
+    std = max(math.sqrt(s['imb_var']), MIN_STD)
+    z = (imbalance - s['imb_mean']) / std
+    s['trades'] += 1
+
+    delta = imbalance - s['imb_mean']
+    s['imb_mean'] += BASELINE_ALPHA * delta
+    s['imb_var'] = (1 - BASELINE_ALPHA) * (s['imb_var'] + BASELINE_ALPHA * delta * delta)
+
+    if abs(z) < Z_REARM:
+        s['alert_state'] = 0
+        return None
+
+    if (abs(z) < Z_THRESHOLD or s['trades'] <= WARMUP_TRADES
+            or s['total_flow'] < MIN_FLOW_VOLUME):
+        return None
+
+    direction = 1 if z > 0 else -1
+    if s['alert_state'] == direction:
+        return None  # Already fired for this excursion
+    s['alert_state'] = direction
+
+    return {
+        'side': 'BUY' if direction > 0 else 'SELL',
+        'z_score': round(z, 2),
+        'imbalance': round(imbalance, 3),
+        'baseline': round(s['imb_mean'], 3),
+        'signed_flow': round(s['signed_flow'], 2),
+        'total_flow': round(s['total_flow'], 2),
+        'price': price
+    }
+
+
+if __name__ == '__main__':
+    state = OrderFlowState()
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'rebuild':
+        print("🔁 Rebuilding order flow state from full trade history...")
+        print(f"✅ Tracking {state.rebuild()} market/outcomes")
+    else:
+        crossings = state.update()
+        print(f"✅ Order flow state updated ({len(crossings)} crossing(s))")
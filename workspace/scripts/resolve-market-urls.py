@@ -6,9 +6,8 @@ This script queries Polymarket's API to find the correct event slug for each mar
 """
 
 import sqlite3
-import requests
+import http_client
 import json
-import time
 
 TRADING_DB = '/home/clawdbot/polymarket_runtime/data/trading.db'
 GAMMA_API = 'https://gamma-api.polymarket.com'
@@ -21,7 +20,7 @@ def search_event_by_market_question(question):
     
     try:
         # Search events
-        response = requests.get(f"{GAMMA_API}/events?limit=100&active=true")
+        response = http_client.get(f"{GAMMA_API}/events?limit=100&active=true")
         if response.status_code == 200:
             events = response.json()
             
@@ -32,7 +31,7 @@ def search_event_by_market_question(question):
                         return event.get('slug'), event.get('id')
         
         # Try with closed events too
-        response = requests.get(f"{GAMMA_API}/events?limit=100&closed=true")
+        response = http_client.get(f"{GAMMA_API}/events?limit=100&closed=true")
         if response.status_code == 200:
             events = response.json()
             
@@ -114,8 +113,7 @@ def update_position_urls():
                 WHERE market_slug = ?
             """, (json.dumps(notes_obj), market_slug))
         
-        print()
-        time.sleep(0.5)  # Rate limit
+        print()  # Rate limiting handled by http_client
     
     conn.commit()
     conn.close()
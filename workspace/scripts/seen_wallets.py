@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Seen-Wallet Set
+Compact membership set of every wallet that has ever traded, persisted next
+to trades.db as a sorted array of 64-bit address hashes and memory-mapped
+on load. Membership is a bucket lookup on the top 16 hash bits followed by a
+binary search over a handful of mapped entries.
+
+Saves append a small delta segment holding only the wallets added since the
+last save; the file is rewritten (deltas merged into the base) only once the
+deltas grow past COMPACT_FRACTION of the base or MAX_SEGMENTS segments.
+
+File layout (little-endian):
+    magic 'SWS1' | version u32 | count u64 | last_seq u64
+    (BUCKETS + 1) x u64 bucket start offsets | count x u64 sorted hashes
+    then any number of delta segments:
+    magic 'SWD1' | version u32 | count u64 | last_seq u64 | count x u64 sorted hashes
+
+last_seq is the trade_first_seen.seq (see trade_cursors) covered so far.
+"""
+
+import bisect
+import hashlib
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+from array import array
+from typing import Iterable
+
+import trade_cursors
+
+MAGIC = b'SWS1'
+DELTA_MAGIC = b'SWD1'
+VERSION = 1
+HEADER = struct.Struct('<4sIQQ')  # 24 bytes keeps the arrays 8-byte aligned
+LAST_SEQ_OFFSET = 16              # Position of last_seq within a header
+BUCKET_BITS = 16
+BUCKETS = 1 << BUCKET_BITS
+SET_FILENAME = 'seen_wallets.bin'
+COMPACT_FRACTION = 0.10    # Merge deltas into the base once they pass 10% of it
+MAX_SEGMENTS = 256         # ...or once this many delta segments pile up
+
+
+def wallet_hash(address: str) -> int:
+    """Stable 64-bit hash of a wallet address (case-insensitive)"""
+    digest = hashlib.blake2b(address.lower().encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def default_set_path(trades_db: str) -> str:
+    return os.path.join(os.path.dirname(trades_db), SET_FILENAME)
+
+
+class SeenWalletSet:
+    """
+    Memory-mapped sorted hash array, the delta segments appended after it
+    (held as a set), and an in-memory set of wallets added since load
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.loaded = False        # A valid base was found on disk
+        self.last_seq = 0
+        self.added = set()
+        self.delta = set()
+        self.segments = 0
+        self._end = 0              # End of the last intact segment
+        self._last_header = 0      # Offset of the header holding last_seq
+        self._file = None
+        self._mmap = None
+        self._hashes = memoryview(b'').cast('Q')
+        self._buckets = None
+
+        if os.path.exists(path) and os.path.getsize(path) > HEADER.size:
+            self._file = open(path, 'rb')
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, count, last_seq = HEADER.unpack_from(self._mmap, 0)
+            hashes_start = HEADER.size + 8 * (BUCKETS + 1)
+            base_end = hashes_start + 8 * count
+            if (magic == MAGIC and version == VERSION and sys.byteorder == 'little'
+                    and base_end <= len(self._mmap)):
+                self.loaded = True
+                self.last_seq = last_seq
+                self._end = base_end
+                view = memoryview(self._mmap)
+                self._buckets = view[HEADER.size:hashes_start].cast('Q')
+                self._hashes = view[hashes_start:base_end].cast('Q')
+                self._load_deltas()
+
+    def _load_deltas(self):
+        """Read delta segments after the base, stopping at a torn or foreign tail"""
+        size = len(self._mmap)
+        offset = self._end
+        while offset + HEADER.size <= size:
+            magic, version, count, last_seq = HEADER.unpack_from(self._mmap, offset)
+            end = offset + HEADER.size + 8 * count
+            if magic != DELTA_MAGIC or version != VERSION or end > size:
+                break
+            segment = self._mmap[offset + HEADER.size:end]
+            self.delta.update(array('Q', segment))
+            self.last_seq = last_seq
+            self.segments += 1
+            self._last_header = offset
+            offset = self._end = end
+
+    def __len__(self) -> int:
+        return len(self._hashes) + len(self.delta) + len(self.added)
+
+    def __contains__(self, address: str) -> bool:
+        return self.contains_hash(wallet_hash(address))
+
+    def contains_hash(self, h: int) -> bool:
+        if h in self.added or h in self.delta:
+            return True
+        if self._buckets is None:
+            return False
+        bucket = h >> (64 - BUCKET_BITS)
+        hi = self._buckets[bucket + 1]
+        i = bisect.bisect_left(self._hashes, h, self._buckets[bucket], hi)
+        return i < hi and self._hashes[i] == h
+
+    def add(self, address: str):
+        h = wallet_hash(address)
+        if not self.contains_hash(h):
+            self.added.add(h)
+
+    def add_many(self, addresses: Iterable[str]):
+        for address in addresses:
+            self.add(address)
+
+    def refresh(self, conn) -> int:
+        """Add wallets from trades first seen past last_seq; returns trades scanned"""
+        end = trade_cursors.max_seq(conn)
+        rows = conn.execute(f"""
+            SELECT t.trader FROM {trade_cursors.ARRIVED}
+        """, (self.last_seq, end)).fetchall()
+        self.add_many(trader for trader, in rows)
+        self.last_seq = max(self.last_seq, end)
+        return len(rows)
+
+    def save(self):
+        """Persist wallets added since load: append a delta segment, or compact"""
+        if not self.loaded:
+            self.compact()
+            return
+        if len(self.delta) + len(self.added) > COMPACT_FRACTION * len(self._hashes) \
+                or self.segments >= MAX_SEGMENTS:
+            self.compact()
+            return
+
+        with open(self.path, 'r+b') as f:
+            f.truncate(self._end)  # Drop any torn tail left by an interrupted append
+            if self.added:
+                f.seek(self._end)
+                f.write(HEADER.pack(DELTA_MAGIC, VERSION, len(self.added), self.last_seq))
+                f.write(array('Q', sorted(self.added)).tobytes())
+            else:
+                # Nothing new: just advance last_seq in the newest header
+                f.seek(self._last_header + LAST_SEQ_OFFSET)
+                f.write(struct.pack('<Q', self.last_seq))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.close()
+        self.__init__(self.path)
+
+    def compact(self):
+        """Merge base, deltas and added wallets into a fresh file (atomic replace)"""
+        merged = array('Q', sorted(set(self._hashes) | self.delta | self.added))
+
+        shift = 64 - BUCKET_BITS
+        buckets = array('Q', (bisect.bisect_left(merged, b << shift) for b in range(BUCKETS)))
+        buckets.append(len(merged))
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(merged), self.last_seq))
+            f.write(buckets.tobytes())
+            f.write(merged.tobytes())
+
+        self.close()
+        os.replace(tmp_path, self.path)
+        self.__init__(self.path)
+
+    def close(self):
+        self._hashes.release()
+        self._hashes = memoryview(b'').cast('Q')
+        if self._buckets is not None:
+            self._buckets.release()
+            self._buckets = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def rebuild(trades_db: str) -> SeenWalletSet:
+    """Recreate the set from every wallet in trades.db"""
+    path = default_set_path(trades_db)
+    if os.path.exists(path):
+        os.remove(path)
+
+    seen = SeenWalletSet(path)
+    conn = sqlite3.connect(trades_db)
+    trade_cursors.ensure_first_seen(conn)
+    # Cursor first: a trade landing in between is counted as seen and rescanned
+    seen.last_seq = trade_cursors.max_seq(conn)
+    seen.add_many(row[0] for row in conn.execute("SELECT DISTINCT trader FROM trades"))
+    conn.close()
+
+    seen.compact()
+    return seen
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Signal Fusion
+Collapses signals from different detectors that call the same bet on the same
+market into one, so auto-trader validates and trades each bet once
+
+Signals are hash-joined on (market_slug, bought outcome): "SELL Yes" and
+"BUY No" are the same bet, since Polymarket positions are always BUYs. The
+strongest signal is kept as the primary; every other detector that agrees
+closes part of the remaining gap to 100 in proportion to its own confidence.
+Repeats from the same detector add nothing.
+
+Non-directional signals (NON_DIRECTIONAL, e.g. a two-leg complement
+arbitrage) buy no single outcome, so they pass through on their own and
+never corroborate or conflict with a directional bet.
+"""
+
+from typing import Dict, List, Tuple
+
+CORROBORATION_WEIGHT = 0.5   # Share of a second detector's confidence that closes the gap
+NON_DIRECTIONAL = ('complement_arbitrage',)   # "BUY/SELL Yes+No" - both legs, no side
+
+
+def bought_outcome(action: str, outcome: str) -> str:
+    """Outcome actually bought: SELL X means BUY the other side of a binary market"""
+    if action == 'SELL':
+        return 'Yes' if outcome == 'No' else 'No'
+    return outcome
+
+
+def bet_key(signal: Dict) -> Tuple[str, str]:
+    """(market_slug, bought outcome) for a top_signals-format signal"""
+    action, _, outcome = signal['signal'].partition(' ')
+    return signal['market_slug'], bought_outcome(action, outcome)
+
+
+def fused_confidence(confidences: List[int]) -> int:
+    """Combine one confidence per detector, strongest first"""
+    ordered = sorted(confidences, reverse=True)
+    fused = ordered[0]
+    for confidence in ordered[1:]:
+        fused += (100 - fused) * confidence / 100 * CORROBORATION_WEIGHT
+    return min(round(fused), 100)
+
+
+def fuse_signals(signals: List[Dict]) -> List[Dict]:
+    """
+    One signal per (market, bought outcome), sorted by fused confidence
+    Fused signals keep the primary's fields and add 'detectors' and
+    'fused_from'; 'conflict' marks markets with signals on both sides.
+    """
+    groups = {}
+    fused = []
+    for signal in signals:
+        if signal['type'] in NON_DIRECTIONAL:
+            fused.append({**signal, 'detectors': [signal['type']], 'conflict': False})
+            continue
+        groups.setdefault(bet_key(signal), []).append(signal)
+
+    for (market_slug, outcome), group in groups.items():
+        group.sort(key=lambda s: s['confidence'], reverse=True)
+        primary = group[0]
+
+        # Best signal per detector
+        best = {}
+        for signal in group:
+            best.setdefault(signal['type'], signal)
+
+        result = dict(primary)
+        result['detectors'] = list(best)
+        result['conflict'] = (market_slug, 'No' if outcome == 'Yes' else 'Yes') in groups
+        if len(group) > 1:
+            result['confidence'] = fused_confidence([s['confidence'] for s in best.values()])
+            result['fused_from'] = [{
+                'type': s['type'],
+                'confidence': s['confidence'],
+                'signal': s['signal'],
+                **({'id': s['id']} if 'id' in s else {})
+            } for s in group]
+            result['details'] = {**primary.get('details', {}), 'fused_from': result['fused_from']}
+        fused.append(result)
+
+    fused.sort(key=lambda s: s['confidence'], reverse=True)
+    return fused
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Signal Scheduler
+Gives every signal a time-to-live and hands auto-trader the live ones in
+priority order within a per-cycle time budget
+
+A signal expires at whichever comes first:
+- its detector's TTL after it was emitted (SIGNAL_TTL, DEFAULT_TTL)
+- CLOSE_BUFFER before the market's end date, when the question names one
+  ("by March 31, 2026", "on February 10", "end of June", "in 2025");
+  "before X" ends where X starts
+
+Live signals sit in a heap ordered by expected value x freshness:
+    expected value = confidence/100 - price of the outcome bought (per $1 share)
+    freshness      = share of the signal's lifetime still remaining (1 → 0)
+A negative expected value is scaled by (2 - freshness) instead, so staler
+losers still sink below fresher ones. Expiry is checked again when each
+signal is popped, and popping stops once the budget (started by start()) is
+spent, so nothing stale is traded. batches() pops a few at a time so
+per-signal network work (market checks, Grok) only happens for signals
+the budget reaches.
+"""
+
+import calendar
+import heapq
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+# Seconds a signal stays actionable, by detector (roughly its lookback window:
+# after that the flow it saw is old news and the price has had time to move)
+SIGNAL_TTL = {
+    'whale_cluster': 2 * 3600,
+    'smart_money_divergence': 4 * 3600,
+    'momentum_reversal': 6 * 3600,
+    'volume_spike': 3600,
+    'order_flow': 3600,
+    'event_flow': 6 * 3600,
+    'fresh_wallet': 6 * 3600,
+    'complement_arbitrage': 600,   # Mispricings close within minutes
+}
+DEFAULT_TTL = 3 * 3600
+CLOSE_BUFFER = 3600        # Stop acting on a market an hour before it closes
+CYCLE_BUDGET = 300         # Seconds per auto-trader cycle
+
+MONTHS = {name.lower(): num for num, name in enumerate(calendar.month_name) if name}
+MONTHS.update({abbr.lower(): num for num, abbr in enumerate(calendar.month_abbr) if abbr})
+MONTHS['sept'] = 9
+_MONTH = '(' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + r')\.?'
+
+DATE_PATTERNS = [
+    # "by March 31, 2026", "on Feb 10", "before July 1 2026", "March 2, 2AM"
+    ('day', re.compile(rf'\b(?:(before)\s+)?{_MONTH}\s+(\d{{1,2}})(?:st|nd|rd|th)?(?:,?\s+(20\d{{2}}))?\b', re.I)),
+    # "end of June", "in March 2026", "before Sept"
+    ('month', re.compile(rf'\b(end of|in|by|before)\s+{_MONTH}(?:\s+(20\d{{2}}))?\b', re.I)),
+    # "in 2025", "by end of 2026", "before 2027"
+    ('year', re.compile(r'\b(in|by|before|end of)\s+(20\d{2})\b', re.I)),
+]
+
+
+def signal_time(signal: Dict) -> float:
+    """Emission time in unix seconds (writers store both seconds and milliseconds)"""
+    ts = signal.get('timestamp') or 0
+    return ts / 1000 if ts > 1e11 else ts
+
+
+def _month_end(year, month):
+    return datetime(year, month, calendar.monthrange(year, month)[1]) + timedelta(days=1)
+
+
+def _nearby_years(day):
+    return (day.year - 1, day.year, day.year + 1)
+
+
+def _nearest(candidates, day):
+    return min(candidates, key=lambda d: abs(d - day))
+
+
+def market_deadline(question: str, emitted: float) -> Optional[float]:
+    """
+    End of the first date named in a market question (unix seconds), or None
+    ("before X" gives the start of X). Dates without a year take the year
+    that puts them nearest the signal.
+    """
+    if not question:
+        return None
+    emitted_day = datetime.fromtimestamp(emitted).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    for kind, pattern in DATE_PATTERNS:
+        match = pattern.search(question)
+        if not match:
+            continue
+        try:
+            before = (match.group(1) or '').lower() == 'before'
+            if kind == 'day':
+                month, day, year = MONTHS[match.group(2).lower()], int(match.group(3)), match.group(4)
+                years = [int(year)] if year else _nearby_years(emitted_day)
+                end = _nearest([datetime(y, month, day) + timedelta(days=0 if before else 1)
+                                for y in years], emitted_day)
+            elif kind == 'month':
+                month, year = MONTHS[match.group(2).lower()], match.group(3)
+                years = [int(year)] if year else _nearby_years(emitted_day)
+                end = _nearest([datetime(y, month, 1) if before else _month_end(y, month)
+                                for y in years], emitted_day)
+            else:
+                end = datetime(int(match.group(2)) + (0 if before else 1), 1, 1)
+        except ValueError:
+            continue  # "February 30"
+        return end.timestamp()
+
+    return None
+
+
+def expires_at(signal: Dict) -> float:
+    """When a signal stops being actionable (unix seconds)"""
+    emitted = signal_time(signal)
+    expiry = emitted + SIGNAL_TTL.get(signal['type'], DEFAULT_TTL)
+    deadline = market_deadline(signal.get('market_question', ''), emitted)
+    if deadline is not None:
+        expiry = min(expiry, deadline - CLOSE_BUFFER)
+    return expiry
+
+
+def split_expired(signals: List[Dict], now: Optional[float] = None) -> Tuple[List[Dict], List[Dict]]:
+    """(live, expired) - run before fusion so stale detectors can't corroborate"""
+    now = time.time() if now is None else now
+    live, expired = [], []
+    for signal in signals:
+        (live if expires_at(signal) > now else expired).append(signal)
+    return live, expired
+
+
+def expected_value(signal: Dict) -> float:
+    """Expected profit per $1 share of the outcome bought, taking confidence as win probability"""
+    price = signal.get('price') or 0
+    if not 0 < price < 1:
+        price = 0.5  # Unknown price: assume even odds
+    if signal['signal'].startswith('SELL'):
+        price = 1 - price  # SELL X buys the other side
+    return signal['confidence'] / 100 - price
+
+
+def priority(signal: Dict, freshness: float) -> float:
+    """Expected value x freshness; losers are scaled up as they go stale so they still rank lower"""
+    ev = expected_value(signal)
+    return ev * freshness if ev >= 0 else ev * (2 - freshness)
+
+
+class SignalScheduler:
+    """Max-heap of live signals by expected value x freshness, drained within a time budget"""
+
+    def __init__(self, signals: List[Dict], budget: float = CYCLE_BUDGET, now: Optional[float] = None):
+        self.started = time.time() if now is None else now
+        self.budget = budget
+        self.deadline = self.started + budget
+        self.heap = []
+        self.expired = []
+        self.deferred = []
+        for seq, signal in enumerate(signals):
+            self.push(signal, seq)
+
+    def push(self, signal: Dict, seq: int = 0):
+        emitted, expiry = signal_time(signal), expires_at(signal)
+        if expiry <= self.started:
+            self.expired.append(signal)
+            return
+        freshness = min((expiry - self.started) / max(expiry - emitted, 1), 1.0)
+        heapq.heappush(self.heap, (-priority(signal, freshness), seq, expiry, signal))
+
+    def start(self, now: Optional[float] = None):
+        """Restart the time budget (from when draining begins rather than construction)"""
+        self.deadline = (time.time() if now is None else now) + self.budget
+
+    def __len__(self):
+        return len(self.heap)
+
+    def live(self) -> List[Dict]:
+        """Queued signals in priority order (without draining)"""
+        return [entry[3] for entry in sorted(self.heap)]
+
+    def batches(self, size: int):
+        """Pop up to size signals at a time, best-first, until the heap or the budget runs out"""
+        batch = []
+        for signal in self:
+            batch.append(signal)
+            if len(batch) == size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def __iter__(self):
+        """Pop signals best-first until the heap or the budget runs out"""
+        while self.heap:
+            now = time.time()
+            if now >= self.deadline:
+                self.deferred = [entry[3] for entry in sorted(self.heap)]
+                self.heap = []
+                return
+            _, _, expiry, signal = heapq.heappop(self.heap)
+            if expiry <= now:
+                self.expired.append(signal)
+                continue
+            yield signal
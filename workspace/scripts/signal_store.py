@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Signal Store
+Writes detector signals to trading.db, at most one per market, type and day
+
+Every detector hands save_signals() its signals plus a row function that
+maps one signal to its (direction, price, details) columns; the dedup check,
+insert and summary output are shared.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+TRADING_DB = '/home/clawdbot/polymarket_runtime/data/trading.db'
+
+SignalRow = Callable[[Dict], Tuple[str, Optional[float], Dict]]
+
+
+def save_signals(signals: List[Dict], signal_type: str, row: SignalRow, db_path: str = TRADING_DB):
+    """Save signals to trading database (with deduplication)"""
+    if not signals:
+        return
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cur = conn.cursor()
+
+        inserted_count = 0
+        skipped_count = 0
+
+        for sig in signals:
+            # Check if signal already exists for this market today
+            # Handle both second and millisecond timestamps
+            cur.execute("""
+                SELECT id FROM signals
+                WHERE market_slug = ?
+                AND type = ?
+                AND (
+                    DATE(timestamp, 'unixepoch') = DATE('now')
+                    OR DATE(timestamp/1000, 'unixepoch') = DATE('now')
+                )
+                LIMIT 1
+            """, (sig['market_slug'], signal_type))
+
+            if cur.fetchone():
+                skipped_count += 1
+                continue  # Skip duplicate
+
+            direction, price, details = row(sig)
+            cur.execute("""
+                INSERT INTO signals (
+                    timestamp, type, market_slug, market_question,
+                    outcome, confidence, direction, price, details
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                int(datetime.now().timestamp()),
+                signal_type,
+                sig['market_slug'],
+                sig['market_question'],
+                sig['outcome'],
+                sig['confidence'],
+                direction,
+                price,
+                json.dumps(details)
+            ))
+            inserted_count += 1
+
+        conn.commit()
+        conn.close()
+
+        if inserted_count > 0:
+            print(f"✅ Saved {inserted_count} new signals to trading.db")
+        if skipped_count > 0:
+            print(f"⏭️  Skipped {skipped_count} duplicate signals (already exist today)")
+
+    except Exception as e:
+        print(f"⚠️ Failed to save to database: {e}")
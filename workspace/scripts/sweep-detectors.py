@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Detector Parameter Sweep
+Runs backtest.py at every point of a parameter grid, one point per worker
+process across all cores, and checkpoints each result in sweeps.db so an
+interrupted sweep picks up where it stopped
+
+The replay window is copied once into a compact snapshot DB (trades in time
+order plus market_resolutions). Every worker reads that one file through
+SQLite's mmap, so all processes share a single page-cache copy instead of
+each scanning the live trades.db.
+
+Grid file (JSON): parameter name -> list of values, names as in backtest.py
+    {"whale_detector.WHALE_THRESHOLD": [2000, 3000, 5000],
+     "reversal_detector.MIN_PRICE_MOVE": [0.10, 0.15, 0.20],
+     "auto_trader.AUTO_TRADE_THRESHOLD": [70, 80]}
+
+Usage:
+    python3 sweep-detectors.py <name> <grid.json> [days] [cadence_minutes]
+    python3 sweep-detectors.py <name> results          # best points so far
+"""
+
+import itertools
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import backtest
+
+SWEEP_DB = '/home/clawdbot/polymarket_runtime/data/sweeps.db'
+SNAPSHOT_DIR = '/home/clawdbot/polymarket_runtime/data/sweeps'
+TOP_N = 10
+
+def expand_grid(grid):
+    """Every combination of a {name: [values]} grid, as param dicts"""
+    names = sorted(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        yield {name: as_tuple(value) for name, value in zip(names, values)}
+
+def as_tuple(value):
+    """JSON lists -> tuples (e.g. CLUSTER_WINDOWS pairs)"""
+    if isinstance(value, list):
+        return tuple(as_tuple(v) for v in value)
+    return value
+
+def param_key(params):
+    """Stable text key for a grid point"""
+    return json.dumps(params, sort_keys=True)
+
+def _run_point(args):
+    """Worker: replay one grid point against the shared snapshot"""
+    snapshot, start, end, cadence, max_hold, key = args
+    params = {name: as_tuple(value) for name, value in json.loads(key).items()}
+    try:
+        report = backtest.Backtester(snapshot, cadence=cadence, max_hold=max_hold,
+                                     params=params).run(start, end)
+        return key, report, None
+    except Exception as e:
+        return key, None, f"{type(e).__name__}: {e}"
+
+class ParameterSweep:
+    """One named sweep: fixed replay window, snapshot, checkpointed results"""
+
+    def __init__(self, name, sweep_db=SWEEP_DB, trades_db=backtest.TRADES_DB):
+        self.name = name
+        self.sweep_db = sweep_db
+        self.trades_db = trades_db
+        self.snapshot = os.path.join(SNAPSHOT_DIR, f"{name}.db")
+        self._ensure_tables()
+
+    def _ensure_tables(self):
+        conn = sqlite3.connect(self.sweep_db)
+        cur = conn.cursor()
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS sweeps (
+                name TEXT PRIMARY KEY,
+                start INTEGER NOT NULL,
+                end INTEGER NOT NULL,
+                cadence INTEGER NOT NULL,
+                max_hold INTEGER,
+                created_at INTEGER
+            )
+        """)
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS sweep_results (
+                sweep TEXT NOT NULL,
+                params TEXT NOT NULL,
+                positions INTEGER,
+                total_pnl REAL,
+                roi REAL,
+                win_rate REAL,
+                brier_score REAL,
+                report TEXT,
+                error TEXT,
+                finished_at INTEGER,
+                PRIMARY KEY (sweep, params)
+            )
+        """)
+
+        conn.commit()
+        conn.close()
+
+    def configure(self, start, end, cadence, max_hold=None):
+        """Fix the replay window on first run; a resumed sweep keeps its original one"""
+        conn = sqlite3.connect(self.sweep_db)
+        conn.execute("""
+            INSERT OR IGNORE INTO sweeps (name, start, end, cadence, max_hold, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (self.name, start, end, cadence, max_hold, int(time.time())))
+        conn.commit()
+        self.start, self.end, self.cadence, self.max_hold = conn.execute("""
+            SELECT start, end, cadence, max_hold FROM sweeps WHERE name = ?
+        """, (self.name,)).fetchone()
+        conn.close()
+
+    def build_snapshot(self):
+        """Copy the replay window out of trades.db once (reused on resume)"""
+        if os.path.exists(self.snapshot):
+            return False
+
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        tmp = self.snapshot + '.tmp'
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+        conn = sqlite3.connect(tmp)
+        conn.execute("ATTACH DATABASE ? AS src", (self.trades_db,))
+        conn.execute("""
+            CREATE TABLE trades AS
+            SELECT * FROM src.trades
+            WHERE timestamp > ? AND timestamp <= ? AND marketSlug IS NOT NULL
+            ORDER BY timestamp, rowid
+        """, (self.start - backtest.daemon_module.MAX_LOOKBACK, self.end))
+        conn.execute("CREATE INDEX idx_trades_timestamp ON trades(timestamp)")
+
+        has_resolutions = conn.execute("""
+            SELECT 1 FROM src.sqlite_master WHERE type = 'table' AND name = 'market_resolutions'
+        """).fetchone()
+        if has_resolutions:
+            conn.execute("CREATE TABLE market_resolutions AS SELECT * FROM src.market_resolutions")
+
+        conn.commit()
+        conn.execute("DETACH DATABASE src")
+        conn.close()
+        os.replace(tmp, self.snapshot)
+        return True
+
+    def pending(self, grid):
+        """Grid points without a stored result"""
+        conn = sqlite3.connect(self.sweep_db)
+        done = {row[0] for row in conn.execute(
+            "SELECT params FROM sweep_results WHERE sweep = ? AND error IS NULL", (self.name,))}
+        conn.close()
+        return [key for key in map(param_key, expand_grid(grid)) if key not in done]
+
+    def run(self, grid, workers=None):
+        """Replay every pending grid point in parallel; returns points run"""
+        keys = self.pending(grid)
+        if not keys:
+            return 0
+
+        workers = workers or multiprocessing.cpu_count()
+        tasks = [(self.snapshot, self.start, self.end, self.cadence, self.max_hold, key)
+                 for key in keys]
+
+        conn = sqlite3.connect(self.sweep_db)
+        completed = 0
+        try:
+            with multiprocessing.Pool(workers) as pool:
+                for key, report, error in pool.imap_unordered(_run_point, tasks):
+                    self._store(conn, key, report, error)
+                    completed += 1
+                    status = f"${report['total_pnl']:+,.2f}" if report else f"❌ {error}"
+                    print(f"   [{completed}/{len(keys)}] {key} → {status}")
+        finally:
+            conn.close()
+
+        return completed
+
+    def _store(self, conn, key, report, error):
+        """Checkpoint one grid point"""
+        report = report or {}
+        conn.execute("""
+            INSERT OR REPLACE INTO sweep_results
+            (sweep, params, positions, total_pnl, roi, win_rate, brier_score, report, error, finished_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (self.name, key, report.get('positions'), report.get('total_pnl'), report.get('roi'),
+              report.get('win_rate'), report.get('brier_score'),
+              json.dumps(report) if report else None, error, int(time.time())))
+        conn.commit()
+
+    def top(self, n=TOP_N):
+        """Best grid points by total P&L"""
+        conn = sqlite3.connect(self.sweep_db)
+        rows = conn.execute("""
+            SELECT params, positions, total_pnl, roi, win_rate, brier_score
+            FROM sweep_results
+            WHERE sweep = ? AND error IS NULL
+            ORDER BY total_pnl DESC
+            LIMIT ?
+        """, (self.name, n)).fetchall()
+        conn.close()
+        return rows
+
+def format_top(sweep, rows):
+    """Format the best grid points for output"""
+    output = f"\n🏆 TOP {len(rows)} POINTS - sweep '{sweep.name}'\n\n"
+    for i, (params, positions, total_pnl, roi, win_rate, brier) in enumerate(rows, 1):
+        output += f"#{i} ${total_pnl:+,.2f}"
+        if positions:
+            output += f" (ROI {roi:+.1%}, {positions} positions, win rate {win_rate:.0%}, Brier {brier:.3f})"
+        output += f"\n   {params}\n"
+    return output
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    sweep = ParameterSweep(sys.argv[1])
+    if sys.argv[2] == 'results':
+        print(format_top(sweep, sweep.top()))
+        sys.exit(0)
+
+    with open(sys.argv[2]) as f:
+        grid = json.load(f)
+    days = float(sys.argv[3]) if len(sys.argv) > 3 else backtest.DEFAULT_DAYS
+    cadence = int(float(sys.argv[4]) * 60) if len(sys.argv) > 4 else backtest.DEFAULT_CADENCE
+
+    end = int(time.time())
+    sweep.configure(end - int(days * 86400), end, cadence)
+    print(f"🧪 Sweep '{sweep.name}': {datetime.fromtimestamp(sweep.start):%Y-%m-%d %H:%M} → "
+          f"{datetime.fromtimestamp(sweep.end):%Y-%m-%d %H:%M}, every {sweep.cadence // 60}m")
+
+    if sweep.build_snapshot():
+        print(f"📸 Snapshot written to {sweep.snapshot}")
+
+    pending = sweep.pending(grid)
+    total = sum(1 for _ in expand_grid(grid))
+    print(f"🔁 {len(pending)} of {total} grid points to run on {multiprocessing.cpu_count()} cores...\n")
+
+    started = time.time()
+    sweep.run(grid)
+    print(f"\n✅ Done in {time.time() - started:.0f}s")
+    print(format_top(sweep, sweep.top()))
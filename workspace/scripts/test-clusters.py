@@ -1,40 +1,18 @@
 #!/usr/bin/env python3
-import sqlite3
-from datetime import datetime, timedelta
+import os
+import importlib.util
 
-conn = sqlite3.connect('/home/clawdbot/polymarket_runtime/data/trades.db')
-cur = conn.cursor()
+# Same multi-window detector as detect-whale-clusters.py, over a longer lookback
+spec = importlib.util.spec_from_file_location(
+    'whale_detector', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'detect-whale-clusters.py'))
+whale_detector = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(whale_detector)
 
-# Look for clusters in last 24 hours with lower threshold
-query = """
-SELECT 
-    marketQuestion,
-    outcome,
-    side,
-    COUNT(*) as whale_count,
-    SUM(sizeUsd) as total_size,
-    MIN(timestamp) as first_trade,
-    MAX(timestamp) as last_trade
-FROM trades
-WHERE 
-    sizeUsd >= 2000
-    AND timestamp > ?
-GROUP BY marketSlug, outcome, side
-HAVING whale_count >= 3
-    AND (MAX(timestamp) - MIN(timestamp)) <= 3600
-ORDER BY whale_count DESC
-LIMIT 10
-"""
-
-cutoff = int((datetime.now() - timedelta(hours=24)).timestamp())
-cur.execute(query, (cutoff,))
-
-results = cur.fetchall()
+results = whale_detector.detect_clusters(lookback_hours=24)[:10]
 print(f"Found {len(results)} clusters in last 24h:\n")
 
-for row in results:
-    market, outcome, side, count, total, first, last = row
-    span = (last - first) / 60
-    print(f'✅ {count} whales | ${total:,.0f} | {span:.0f}min | {side} {outcome}')
-    print(f'   {market[:80]}')
+for sig in results:
+    windows = ', '.join(f"{w}m" for w in sig['qualifying_windows'])
+    print(f"✅ {sig['whale_count']} whales | ${sig['total_size']:,.0f} | {sig['time_span_minutes']:.0f}min | {sig['side']} {sig['outcome']} | windows: {windows}")
+    print(f"   {sig['market_question'][:80]}")
     print()
@@ -0,0 +1,63 @@
+"""Shared fixtures: scripts on sys.path, script loader, collector-shaped trades.db"""
+
+import importlib.util
+import os
+import sqlite3
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+# Same columns as the collector's table (src/utils/sqlite_database.ts)
+TRADES_TABLE = """
+    CREATE TABLE trades (
+        id TEXT PRIMARY KEY,
+        trader TEXT NOT NULL,
+        marketId TEXT NOT NULL,
+        marketSlug TEXT,
+        eventSlug TEXT,
+        marketQuestion TEXT,
+        marketCategory TEXT,
+        outcome TEXT,
+        side TEXT NOT NULL,
+        price REAL NOT NULL,
+        sizeUsd REAL NOT NULL,
+        timestamp INTEGER NOT NULL,
+        feeRateBps INTEGER,
+        makerAddress TEXT
+    )
+"""
+
+
+def load_script(filename, module_name):
+    """Import a hyphenated script (detect-whale-clusters.py) as a module"""
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(SCRIPTS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def trade(id, trader, slug, side, price, size, ts, outcome='Yes'):
+    """One trades row in column order"""
+    return (id, trader, f"token-{slug}-{outcome}", slug, None, f"Will {slug} happen?", None,
+            outcome, side, price, size, ts, None, None)
+
+
+def insert_trades(conn, rows, replace=False):
+    """Write rows the way the collector does (INSERT OR REPLACE)"""
+    verb = 'INSERT OR REPLACE' if replace else 'INSERT'
+    conn.executemany(f"{verb} INTO trades VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)", rows)
+    conn.commit()
+
+
+@pytest.fixture
+def trades_db(tmp_path):
+    """Path of an empty collector-shaped trades.db"""
+    path = str(tmp_path / 'trades.db')
+    conn = sqlite3.connect(path)
+    conn.execute(TRADES_TABLE)
+    conn.commit()
+    conn.close()
+    return path
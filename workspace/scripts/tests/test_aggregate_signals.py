@@ -0,0 +1,54 @@
+"""Detector cache fingerprints (aggregate-signals.py)"""
+
+import sqlite3
+
+from conftest import insert_trades, load_script, trade
+
+aggregator = load_script('aggregate-signals.py', 'aggregator')
+WHALE = [d for d in aggregator.DETECTORS if d[0] == 'whale_clusters']
+NOW = 1_760_000_000
+
+
+def quiet_cluster(trades_db):
+    """Whale cluster on a market that then goes quiet: last trade 1h50m before NOW"""
+    conn = sqlite3.connect(trades_db)
+    insert_trades(conn, [trade(f"t{i}", f"0xwhale{i}", 'quiet-market', 'BUY', 0.4, 5000,
+                               NOW - 6600 - 60 * i) for i in range(4)])
+    conn.close()
+
+
+def test_fingerprint_changes_when_cluster_ages_past_cutoff(trades_db):
+    quiet_cluster(trades_db)
+    before = aggregator.input_fingerprints(WHALE, trades_db, now=NOW)
+    still_fresh = aggregator.input_fingerprints(WHALE, trades_db, now=NOW + 300)
+    aged = aggregator.input_fingerprints(WHALE, trades_db, now=NOW + 900)
+
+    assert before == still_fresh
+    assert before != aged  # No trade left the 6h window, but the cluster passed the 2h cutoff
+
+
+def test_cache_misses_once_cluster_ages_past_cutoff(trades_db, tmp_path):
+    quiet_cluster(trades_db)
+    stub = tmp_path / 'stub_detector.py'
+    stub.write_text("def detect_clusters(lookback_hours):\n    return ['fresh']\n")
+    detectors = [(key, str(stub), func, kwargs, 30, windows, size)
+                 for key, _, func, kwargs, _, windows, size in WHALE]
+
+    fingerprints = aggregator.input_fingerprints(detectors, trades_db, now=NOW)
+    cache = {'whale_clusters': {'fingerprint': fingerprints['whale_clusters'], 'signals': ['stale']}}
+
+    results, timings = aggregator.run_detectors(detectors, fingerprints, cache)
+    assert timings['whale_clusters']['status'] == 'cached'
+    assert results['whale_clusters'] == ['stale']
+
+    fingerprints = aggregator.input_fingerprints(detectors, trades_db, now=NOW + 900)
+    results, timings = aggregator.run_detectors(detectors, fingerprints, cache)
+    assert timings['whale_clusters']['status'] == 'ok'
+    assert results['whale_clusters'] == ['fresh']
+
+
+def test_fingerprint_changes_with_the_date(trades_db):
+    quiet_cluster(trades_db)
+    midnight = NOW - NOW % 86400 + 86400 * 2   # Well past every window, only the date moves
+    assert (aggregator.input_fingerprints(WHALE, trades_db, now=midnight - 60)
+            != aggregator.input_fingerprints(WHALE, trades_db, now=midnight + 86400 - 60))
@@ -0,0 +1,33 @@
+"""Installing as_of.py never writes to a trades.db the collector hasn't created"""
+
+import os
+import sqlite3
+
+import as_of
+import trade_cursors
+
+
+def test_install_leaves_trades_db_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr(as_of, 'TRADES_DB', str(tmp_path / 'trades.db'))
+    as_of.install(trading_db=str(tmp_path / 'trading.db'))
+    assert not os.path.exists(tmp_path / 'trades.db')
+
+
+def test_trade_log_waits_for_the_collector(tmp_path):
+    missing = str(tmp_path / 'trades.db')
+    assert as_of.install_trade_log(missing) is False
+    assert not os.path.exists(missing)
+
+    sqlite3.connect(missing).close()  # File exists, no trades table yet
+    assert as_of.install_trade_log(missing) is False
+    conn = sqlite3.connect(missing)
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+    conn.close()
+
+
+def test_trade_log_arms_existing_trades(trades_db):
+    assert as_of.install_trade_log(trades_db) is True
+    conn = sqlite3.connect(trades_db)
+    assert trade_cursors.max_seq(conn) == 0
+    assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'trades_first_seen'").fetchone()
+    conn.close()
@@ -0,0 +1,166 @@
+"""Band tables agree with the if/elif ladders they replaced (confidence_scoring.py)"""
+
+import itertools
+
+import pytest
+
+import confidence_scoring
+
+
+# The detectors' ladders before SCORECARDS, verbatim
+def old_whale_cluster(whale_count, total_size, time_span, syndicate_members=0):
+    score = 0
+    if whale_count >= 5:
+        score += 50
+    elif whale_count >= 4:
+        score += 35
+    else:
+        score += 20
+    if total_size > 50000:
+        score += 30
+    elif total_size > 25000:
+        score += 20
+    elif total_size > 15000:
+        score += 15
+    elif total_size > 10000:
+        score += 10
+    if time_span < 1:
+        score += 25
+    elif time_span < 5:
+        score += 20
+    elif time_span < 15:
+        score += 15
+    elif time_span < 30:
+        score += 10
+    if syndicate_members >= 3:
+        score += 15
+    elif syndicate_members >= 2:
+        score += 5
+    return min(score, 100)
+
+
+def old_divergence(whale_size, whale_count, price_extremity, ratio):
+    score = 0
+    if whale_size > 50000:
+        score += 35
+    elif whale_size > 25000:
+        score += 25
+    elif whale_size > 15000:
+        score += 20
+    else:
+        score += 10
+    if whale_count >= 5:
+        score += 25
+    elif whale_count >= 3:
+        score += 15
+    else:
+        score += 5
+    if price_extremity > 0.35:
+        score += 25
+    elif price_extremity > 0.25:
+        score += 20
+    elif price_extremity > 0.15:
+        score += 15
+    else:
+        score += 5
+    if ratio > 5:
+        score += 15
+    elif ratio > 3:
+        score += 10
+    elif ratio > 2:
+        score += 5
+    return min(score, 100)
+
+
+def old_reversal(whale_size, whale_count, price_move, current_price):
+    score = 0
+    if whale_size > 40000:
+        score += 35
+    elif whale_size > 20000:
+        score += 25
+    elif whale_size > 10000:
+        score += 15
+    else:
+        score += 10
+    if whale_count >= 4:
+        score += 20
+    elif whale_count >= 3:
+        score += 15
+    else:
+        score += 10
+    if price_move > 0.30:
+        score += 30
+    elif price_move > 0.20:
+        score += 20
+    elif price_move > 0.15:
+        score += 15
+    else:
+        score += 10
+    if current_price > 0.80 or current_price < 0.20:
+        score += 15
+    elif current_price > 0.70 or current_price < 0.30:
+        score += 10
+    return min(score, 100)
+
+
+def around(*edges, eps=1e-6):
+    """Every band edge, just either side of it, and a value past the ends"""
+    values = {0}
+    for edge in edges:
+        values.update((edge - eps, edge, edge + eps))
+    values.add(max(edges) * 2)
+    return sorted(values)
+
+
+@pytest.fixture(autouse=True)
+def no_fitted_weights(tmp_path, monkeypatch):
+    monkeypatch.setattr(confidence_scoring, 'WEIGHTS_FILE', str(tmp_path / 'none.json'))
+
+
+def check(signal_type, old, grid):
+    names = list(grid)
+    cases = list(itertools.product(*grid.values()))
+    features = {name: [case[i] for case in cases] for i, name in enumerate(names)}
+    extra = {f: [0] * len(cases) for f, *_ in confidence_scoring.SCORECARDS[signal_type] if f not in grid}
+    scores = confidence_scoring.score_batch(signal_type, {**features, **extra})
+    assert scores == [old(*case) for case in cases]
+
+
+def test_whale_cluster_matches_ladder():
+    check('whale_cluster', old_whale_cluster, {
+        'whale_count': [3, 4, 5, 6],
+        'total_size': around(10000, 15000, 25000, 50000),
+        'time_span': around(1, 5, 15, 30),
+        'syndicate_members': [0, 1, 2, 3, 4],
+    })
+
+
+def test_divergence_matches_ladder():
+    check('smart_money_divergence', old_divergence, {
+        'whale_size': around(15000, 25000, 50000),
+        'whale_count': [1, 2, 3, 4, 5, 6],
+        'price_extremity': around(0.15, 0.25, 0.35),
+        'ratio': around(2, 3, 5),
+    })
+
+
+def test_reversal_matches_ladder():
+    check('momentum_reversal', old_reversal, {
+        'whale_size': around(10000, 20000, 40000),
+        'whale_count': [1, 2, 3, 4, 5],
+        'price_move': around(0.15, 0.20, 0.30),
+        'current_price': around(0.20, 0.30, 0.70, 0.80),
+    })
+
+
+def test_established_whales_band():
+    base = dict(whale_count=3, total_size=0, time_span=60, syndicate_members=0)
+    assert [confidence_scoring.score('whale_cluster', **base, established_whales=n)
+            for n in range(5)] == [20, 20, 25, 30, 30]
+
+
+def test_score_candidates_fills_confidence_in_order():
+    candidates = [({'id': i}, dict(whale_size=50001, whale_count=n, price_move=0.31, current_price=0.5))
+                  for i, n in enumerate([5, 2, 3])]
+    signals = confidence_scoring.score_candidates('momentum_reversal', candidates)
+    assert [(s['id'], s['confidence']) for s in signals] == [(0, 85), (1, 75), (2, 80)]
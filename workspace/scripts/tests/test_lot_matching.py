@@ -0,0 +1,91 @@
+"""FIFO lot books in shares, incremental vs full replay (lot_matching.py)"""
+
+import random
+import sqlite3
+
+import pytest
+
+import lot_matching
+import trade_cursors
+from conftest import insert_trades, trade
+
+T0 = 1_760_000_000
+
+
+def books(conn):
+    return sorted(conn.execute("""
+        SELECT trader, market_slug, outcome, ROUND(price, 6), ROUND(size_remaining, 6), opened_at
+        FROM open_lots
+    """).fetchall())
+
+
+def test_sell_fills_oldest_lots_first_in_shares(trades_db):
+    conn = sqlite3.connect(trades_db)
+    insert_trades(conn, [
+        trade('b1', '0xa', 'mkt', 'BUY', 0.5, 1000, T0),        # 2000 shares
+        trade('b2', '0xa', 'mkt', 'BUY', 0.6, 1200, T0 + 60),   # 2000 shares
+        trade('s1', '0xa', 'mkt', 'SELL', 0.7, 1750, T0 + 120), # 2500 shares
+    ])
+    matcher = lot_matching.LotMatcher(trades_db)
+    assert matcher.update(conn) == 3
+
+    # 2000 @ 0.5 closed in full, 500 of the 0.6 lot: (0.2 x 2000) + (0.1 x 500)
+    assert matcher.get_realized('0xa', conn) == pytest.approx((450.0, 1, 1, 1300.0))
+    assert books(conn) == [('0xa', 'mkt', 'Yes', 0.6, 1500.0, T0 + 60)]
+    conn.close()
+
+
+def test_unmatched_sell_is_ignored(trades_db):
+    conn = sqlite3.connect(trades_db)
+    insert_trades(conn, [trade('s1', '0xa', 'mkt', 'SELL', 0.7, 5000, T0)])
+    matcher = lot_matching.LotMatcher(trades_db)
+    matcher.update(conn)
+    assert matcher.get_realized('0xa', conn) is None
+    conn.close()
+
+
+def random_tape(n, seed=7):
+    rng = random.Random(seed)
+    return [trade(f"t{i}", f"0xw{rng.randrange(6)}", f"m{rng.randrange(4)}",
+                  rng.choice(['BUY', 'BUY', 'SELL']), round(rng.uniform(0.05, 0.95), 2),
+                  round(rng.uniform(500, 8000), 2), T0 + 30 * i, rng.choice(['Yes', 'No']))
+            for i in range(n)]
+
+
+def test_incremental_update_matches_rebuild(trades_db):
+    tape = random_tape(400)
+    conn = sqlite3.connect(trades_db)
+    matcher = lot_matching.LotMatcher(trades_db)
+
+    insert_trades(conn, tape[:100])
+    matcher.update(conn)                       # First run replays history
+    for start in range(100, 400, 60):
+        insert_trades(conn, tape[start:start + 60])
+        trade_cursors.consume(conn, lot_matching.CURSOR_NAME, matcher._consume, chunk_size=7)
+
+    lots, realized = books(conn), matcher.get_all_realized(conn)
+    conn.close()
+
+    matcher.rebuild()
+    conn = sqlite3.connect(trades_db)
+    assert lots == books(conn)
+    assert realized == {trader: pytest.approx(stats) for trader, stats in matcher.get_all_realized(conn).items()}
+    conn.close()
+
+
+def test_reinserted_trades_leave_books_unchanged(trades_db):
+    tape = random_tape(200)
+    conn = sqlite3.connect(trades_db)
+    matcher = lot_matching.LotMatcher(trades_db)
+    insert_trades(conn, tape[:150])
+    matcher.update(conn)
+    matcher.update(conn)
+    before = (books(conn), matcher.get_all_realized(conn))
+
+    insert_trades(conn, tape[100:150], replace=True)   # Collector rewrites, fresh rowids
+    assert matcher.update(conn) == 0
+    assert (books(conn), matcher.get_all_realized(conn)) == before
+
+    insert_trades(conn, tape[150:], replace=True)
+    assert matcher.update(conn) == sum(1 for row in tape[150:] if row[10] >= lot_matching.WHALE_MIN_SIZE)
+    conn.close()
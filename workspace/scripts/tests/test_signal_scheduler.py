@@ -0,0 +1,78 @@
+"""Signal TTLs, queue order and the per-cycle budget (signal_scheduler.py)"""
+
+from datetime import datetime
+
+import pytest
+
+import signal_scheduler as ss
+
+NOW = 1_760_000_000
+EMITTED = datetime(2026, 6, 15, 12).timestamp()
+
+
+def sig(confidence, age, price=0.6, signal_type='whale_cluster'):
+    return {'type': signal_type, 'signal': 'BUY Yes', 'price': price,
+            'confidence': confidence, 'timestamp': NOW - age, 'market_question': ''}
+
+
+def test_queue_orders_by_value_then_freshness():
+    queue = ss.SignalScheduler([sig(70, 3000), sig(90, 3000), sig(70, 60)], now=NOW)
+    assert [(s['confidence'], NOW - s['timestamp']) for s in queue.live()] == [(90, 3000), (70, 60), (70, 3000)]
+
+
+def test_negative_value_prefers_fresher():
+    queue = ss.SignalScheduler([sig(50, 7000), sig(50, 60)], now=NOW)
+    assert [NOW - s['timestamp'] for s in queue.live()] == [60, 7000]
+
+
+def test_batches_stop_at_the_budget(monkeypatch):
+    clock = [NOW]
+    monkeypatch.setattr(ss.time, 'time', lambda: clock[0])
+    queue = ss.SignalScheduler([sig(70 + i, 60) for i in range(20)], budget=100, now=NOW)
+    queue.start(NOW)
+
+    seen = []
+    for batch in queue.batches(8):
+        seen.append(len(batch))
+        clock[0] += 60   # Validating and trading a batch takes a minute
+
+    assert seen == [8, 8]
+    assert len(queue.deferred) == 4
+    assert [s['confidence'] for s in queue.deferred] == [73, 72, 71, 70]
+
+
+@pytest.mark.parametrize('question, deadline', [
+    ("Will X win by March 31, 2026?", datetime(2026, 4, 1)),
+    ("Fed cut on Feb. 10?", datetime(2026, 2, 11)),            # Year-less: nearest to the signal
+    ("Bitcoin above 100k on June 20th?", datetime(2026, 6, 21)),
+    ("Up or Down - June 16, 2AM ET", datetime(2026, 6, 17)),
+    ("Ceasefire by Sept 5?", datetime(2026, 9, 6)),
+    ("Ceasefire by Sept. 5?", datetime(2026, 9, 6)),
+    ("Launch by end of June?", datetime(2026, 7, 1)),
+    ("Recession in March 2027?", datetime(2027, 4, 1)),
+    ("Shutdown by November?", datetime(2026, 12, 1)),
+    ("Champion in 2026?", datetime(2027, 1, 1)),
+    ("Treaty by end of 2026?", datetime(2027, 1, 1)),
+    ("Released before 2027?", datetime(2027, 1, 1)),
+    ("Released before July 1 2026?", datetime(2026, 7, 1)),
+    ("Announced before September?", datetime(2026, 9, 1)),
+])
+def test_market_deadline(question, deadline):
+    assert ss.market_deadline(question, EMITTED) == deadline.timestamp()
+
+
+@pytest.mark.parametrize('question', ["", "Will the Lakers win the title?", "Deal on February 30?"])
+def test_no_market_deadline(question):
+    assert ss.market_deadline(question, EMITTED) is None
+
+
+def test_expiry_is_ttl_capped_by_deadline():
+    late = datetime(2026, 6, 15, 22).timestamp()
+    signal = {'type': 'whale_cluster', 'timestamp': late * 1000,   # Milliseconds are accepted
+              'market_question': "Closes on June 15?"}
+    assert ss.expires_at(signal) == datetime(2026, 6, 16).timestamp() - ss.CLOSE_BUFFER
+    signal['market_question'] = "Closes on June 30?"
+    assert ss.expires_at(signal) == late + ss.SIGNAL_TTL['whale_cluster']
+
+    live, expired = ss.split_expired([signal], now=late + ss.SIGNAL_TTL['whale_cluster'])
+    assert (live, expired) == ([], [signal])
@@ -0,0 +1,77 @@
+"""First-arrival log and the shared consume() loop (trade_cursors.py)"""
+
+import sqlite3
+
+import trade_cursors
+from conftest import insert_trades, trade
+from wallet_features import WalletFeatureStore
+
+T0 = 1_760_000_000
+
+
+def tape(start, stop):
+    return [trade(f"t{i}", f"0xw{i % 5}", f"m{i % 3}", 'BUY', 0.5, 1000 + i, T0 + 60 * i)
+            for i in range(start, stop)]
+
+
+def arrived_ids(conn, name):
+    """Consume with a consumer that records every trade id it is handed"""
+    ids = []
+
+    def apply(conn, start, end):
+        rows = conn.execute(f"SELECT t.id FROM {trade_cursors.ARRIVED}", (start, end)).fetchall()
+        ids.extend(id for id, in rows)
+        return len(rows)
+
+    assert trade_cursors.consume(conn, name, apply, chunk_size=4) == len(ids)
+    return ids
+
+
+def test_log_seeds_from_rowids(trades_db):
+    conn = sqlite3.connect(trades_db)
+    insert_trades(conn, tape(0, 10))
+    trade_cursors.ensure_table(conn)
+    assert conn.execute("""
+        SELECT COUNT(*) FROM trade_first_seen f JOIN trades t ON t.id = f.id WHERE f.seq = t.rowid
+    """).fetchone()[0] == 10
+    conn.close()
+
+
+def test_reinserted_trades_are_consumed_once(trades_db):
+    conn = sqlite3.connect(trades_db)
+    trade_cursors.ensure_table(conn)
+    insert_trades(conn, tape(0, 10))
+    assert arrived_ids(conn, 'counter') == [f"t{i}" for i in range(10)]
+
+    # Collector re-inserts old trades (new rowids) alongside new ones
+    insert_trades(conn, tape(5, 15), replace=True)
+    assert trade_cursors.max_seq(conn) == 15
+    assert arrived_ids(conn, 'counter') == [f"t{i}" for i in range(10, 15)]
+    assert arrived_ids(conn, 'counter') == []
+    conn.close()
+
+
+def test_wallet_features_ignore_reinserts(trades_db):
+    conn = sqlite3.connect(trades_db)
+    insert_trades(conn, tape(0, 10))
+    store = WalletFeatureStore(trades_db)
+    assert store.update() == 10
+    before = store.get_many([f"0xw{i}" for i in range(5)], now=T0 + 3600)
+
+    insert_trades(conn, tape(0, 10), replace=True)
+    assert store.update() == 0
+    assert store.get_many([f"0xw{i}" for i in range(5)], now=T0 + 3600) == before
+    conn.close()
+
+
+def test_reset_rewinds_a_consumer(trades_db):
+    conn = sqlite3.connect(trades_db)
+    trade_cursors.ensure_table(conn)
+    insert_trades(conn, tape(0, 6))
+    arrived_ids(conn, 'counter')
+    conn.execute("CREATE TABLE summary (x)")
+    conn.execute("INSERT INTO summary VALUES (1)")
+    trade_cursors.reset(conn, 'counter', ('summary',))
+    assert conn.execute("SELECT COUNT(*) FROM summary").fetchone()[0] == 0
+    assert len(arrived_ids(conn, 'counter')) == 6
+    conn.close()
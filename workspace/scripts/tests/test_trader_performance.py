@@ -0,0 +1,30 @@
+"""Incremental market_activity summary (trader_performance.py)"""
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip('requests')   # trader_performance imports http_client
+
+from conftest import insert_trades, trade
+from trader_performance import TraderPerformance
+
+T0 = 1_760_000_000
+
+
+def test_refresh_counts_trades_folded_in(trades_db):
+    conn = sqlite3.connect(trades_db)
+    insert_trades(conn, [trade(f"t{i}", '0xa', 'mkt', 'BUY', 0.5, 500 + 1000 * i, T0 + i) for i in range(4)])
+    no_slug = trade('t9', '0xa', None, 'BUY', 0.5, 5000, T0 + 9)
+    insert_trades(conn, [no_slug])
+    perf = TraderPerformance(trades_db)
+    assert perf.refresh_market_activity(conn) == 4
+
+    # Re-inserted trades get new seqs in trades but no new arrivals
+    insert_trades(conn, [trade('t0', '0xa', 'mkt', 'BUY', 0.5, 500, T0)], replace=True)
+    insert_trades(conn, [trade('t4', '0xa', 'mkt', 'BUY', 0.5, 2000, T0 + 4)])
+    assert perf.refresh_market_activity(conn) == 1
+    assert conn.execute("""
+        SELECT first_trade, last_trade, whale_trade_count, whale_volume FROM market_activity
+    """).fetchall() == [(T0, T0 + 4, 4, 1500 + 2500 + 3500 + 2000)]
+    conn.close()
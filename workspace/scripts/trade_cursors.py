@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Trade Cursors
+Remember how far into the trade arrival log each incremental summary has
+consumed, so summary tables only ever process new trades
+
+The collector writes trades with INSERT OR REPLACE, and a re-inserted trade
+gets a fresh rowid, so "rowid > cursor" would fold the same trade in again.
+trade_first_seen logs each trade id once, on first arrival, under an
+increasing seq; consumers read seq ranges joined back to trades instead.
+Seq numbers are seeded from the rowids of the time, so cursors saved
+before the log existed stay valid.
+
+consume() is the shared update loop: it hands a consumer one seq range at a
+time, advances its cursor and commits, and the consumer selects
+"FROM {ARRIVED}" with the range bound to the two placeholders.
+"""
+
+from typing import Callable, Iterable
+
+CHUNK_SIZE = 50000        # Trades per consumer transaction
+
+# Trades first seen in (start, end]: bind (start, end) first; trades columns
+# are unqualified or t.*, the arrival seq is f.seq
+ARRIVED = """
+    trade_first_seen f
+    JOIN trades t ON t.id = f.id
+    WHERE f.seq > ? AND f.seq <= ?
+"""
+
+CURSORS_TABLE = """
+    CREATE TABLE IF NOT EXISTS trade_cursors (
+        name TEXT PRIMARY KEY,
+        last_rowid INTEGER NOT NULL DEFAULT 0,   -- trade_first_seen.seq
+        updated_at INTEGER
+    )
+"""
+
+FIRST_SEEN_TABLE = """
+    CREATE TABLE IF NOT EXISTS trade_first_seen (
+        seq INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        arrived_at INTEGER NOT NULL
+    )
+"""
+
+# Guarded with WHEN rather than INSERT OR IGNORE: a trigger's conflict clause
+# is overridden by the outer statement's, so the collector's INSERT OR REPLACE
+# would otherwise replace the first-seen row and hand it a new seq
+FIRST_SEEN_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS trades_first_seen AFTER INSERT ON trades
+    WHEN NOT EXISTS (SELECT 1 FROM trade_first_seen WHERE id = NEW.id)
+    BEGIN
+        INSERT INTO trade_first_seen (id, arrived_at)
+        VALUES (NEW.id, CAST(strftime('%s', 'now') AS INTEGER));
+    END
+"""
+
+def ensure_table(conn):
+    conn.execute(CURSORS_TABLE)
+    ensure_first_seen(conn)
+
+def ensure_first_seen(conn):
+    """Create the first-arrival log and its trigger, seeding it from trades once"""
+    conn.execute(FIRST_SEEN_TABLE)
+    armed = conn.execute("""
+        SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'trades_first_seen'
+    """).fetchone()
+    if armed:
+        return
+
+    # Seed and arm in one transaction so no trade lands in between.
+    # A fresh log takes seq = rowid; a log whose trigger went missing (trades
+    # table rebuilt) appends the ids it hasn't seen after its last seq.
+    if conn.execute("SELECT 1 FROM trade_first_seen LIMIT 1").fetchone():
+        conn.execute("""
+            INSERT OR IGNORE INTO trade_first_seen (id, arrived_at)
+            SELECT id, timestamp FROM trades ORDER BY rowid
+        """)
+    else:
+        conn.execute("""
+            INSERT INTO trade_first_seen (seq, id, arrived_at)
+            SELECT rowid, id, timestamp FROM trades
+        """)
+    conn.execute(FIRST_SEEN_TRIGGER)
+    conn.commit()
+
+def get_cursor(conn, name: str) -> int:
+    """Last processed trade_first_seen.seq for this consumer (0 if never run)"""
+    row = conn.execute("SELECT last_rowid FROM trade_cursors WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else 0
+
+def set_cursor(conn, name: str, last_seq: int):
+    """Advance a consumer's cursor (caller commits with its own writes)"""
+    conn.execute("""
+        INSERT INTO trade_cursors (name, last_rowid, updated_at)
+        VALUES (?, ?, strftime('%s', 'now'))
+        ON CONFLICT(name) DO UPDATE SET
+            last_rowid = excluded.last_rowid,
+            updated_at = excluded.updated_at
+    """, (name, last_seq))
+
+def max_seq(conn) -> int:
+    """Newest trade_first_seen.seq (0 for an empty log)"""
+    return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM trade_first_seen").fetchone()[0]
+
+def consume(conn, name: str, apply: Callable[..., int], chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Feed a consumer every trade that arrived since its cursor
+    apply(conn, start, end) handles seq range (start, end] and returns a count;
+    each chunk commits together with the cursor. Returns the summed counts.
+    """
+    total = 0
+    while True:
+        start = get_cursor(conn, name)
+        end = min(max_seq(conn), start + chunk_size)
+        if end <= start:
+            return total
+
+        total += apply(conn, start, end)
+        set_cursor(conn, name, end)
+        conn.commit()
+
+def reset(conn, name: str, tables: Iterable[str]):
+    """Empty a consumer's summary tables and rewind its cursor (for rebuilds)"""
+    for table in tables:
+        conn.execute(f"DELETE FROM {table}")
+    set_cursor(conn, name, 0)
+    conn.commit()
@@ -5,13 +5,21 @@ Uses slug-based market lookups instead of broken ID approach
 """
 
 import sqlite3
-import requests
-from collections import defaultdict
+import http_client
+import trade_cursors
+import whale_weights
+from lot_matching import LotMatcher
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 
 TRADES_DB = '/home/clawdbot/polymarket_runtime/data/trades.db'
 POLYMARKET_API = 'https://gamma-api.polymarket.com'
+RESOLUTION_WORKERS = 8    # Concurrent API lookups (http_client enforces the host rate limit)
+RESOLUTION_BATCH = 200    # Markets written per transaction
+WHALE_MIN_SIZE = 1000     # Trades at or above this size count as whale trades
+SQL_PARAM_CHUNK = 500     # Max bound parameters per IN (...) query
+MIN_WEIGHT_CLOSED = 3     # Closed positions needed before a whale gets any weight
 
 class TraderPerformance:
     """Calculate and track trader profitability"""
@@ -19,6 +27,7 @@ class TraderPerformance:
     def __init__(self, trades_db=TRADES_DB):
         self.trades_db = trades_db
         self._ensure_tables()
+        self.lots = LotMatcher(trades_db)
     
     def _ensure_tables(self):
         """Create cache tables if they don't exist"""
@@ -53,6 +62,43 @@ class TraderPerformance:
             )
         """)
         
+        # Resolution P&L per (trader, market) - whale_stats is derived from this
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS resolution_ledger (
+                trader TEXT NOT NULL,
+                market_slug TEXT NOT NULL,
+                pnl REAL DEFAULT 0,
+                lot_count INTEGER DEFAULT 0,
+                wins INTEGER DEFAULT 0,
+                volume REAL DEFAULT 0,
+                winning_outcome TEXT,
+                resolved_at INTEGER,
+                PRIMARY KEY (trader, market_slug)
+            )
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_resolution_ledger_market
+            ON resolution_ledger(market_slug)
+        """)
+        
+        # Per-market activity summary (maintained incrementally from the trade arrival log)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS market_activity (
+                market_slug TEXT PRIMARY KEY,
+                first_trade INTEGER,
+                last_trade INTEGER,
+                first_whale_trade INTEGER,
+                last_whale_trade INTEGER,
+                whale_trade_count INTEGER DEFAULT 0,
+                whale_volume REAL DEFAULT 0
+            )
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_market_activity_last_whale
+            ON market_activity(last_whale_trade)
+        """)
+        trade_cursors.ensure_table(conn)
+        
         conn.commit()
         conn.close()
     
@@ -61,11 +107,10 @@ class TraderPerformance:
         Check if market has resolved using slug-based API query (FIXED)
         Returns resolution info or None if not resolved
         """
-        conn = sqlite3.connect(self.trades_db)
-        cur = conn.cursor()
-        
         # Check cache first
         if not force:
+            conn = sqlite3.connect(self.trades_db)
+            cur = conn.cursor()
             cur.execute("""
                 SELECT resolved, winning_outcome, winning_outcome_index, outcome_prices
                 FROM market_resolutions
@@ -73,8 +118,8 @@ class TraderPerformance:
             """, (market_slug, int((datetime.now() - timedelta(hours=24)).timestamp())))
             
             cached = cur.fetchone()
+            conn.close()
             if cached:
-                conn.close()
                 if not cached[0]:
                     return None
                 return {
@@ -84,30 +129,38 @@ class TraderPerformance:
                     'outcome_prices': eval(cached[3])
                 }
         
-        # Query API by slug
+        cache_row, resolution = self.fetch_market_resolution(market_slug)
+        if cache_row:
+            conn = sqlite3.connect(self.trades_db)
+            self._cache_resolutions(conn, [cache_row])
+            conn.commit()
+            conn.close()
+        
+        return resolution
+    
+    def fetch_market_resolution(self, market_slug: str) -> Tuple[Optional[tuple], Optional[Dict]]:
+        """
+        Query the API for one market (network only - safe to call from worker threads)
+        Returns (cache_row, resolution); cache_row is None when nothing should be cached
+        """
+        now = int(datetime.now().timestamp())
+        unresolved_row = (market_slug, 0, None, None, None, None, now)
+        
         try:
-            response = requests.get(
+            response = http_client.get(
                 f"{POLYMARKET_API}/markets",
                 params={'slug': market_slug},
                 timeout=5
             )
             
             if response.status_code != 200:
-                conn.close()
-                return None
+                return None, None
             
             data = response.json()
             
             if not data or len(data) == 0:
                 # Market not found, cache negative
-                cur.execute("""
-                    INSERT OR REPLACE INTO market_resolutions 
-                    (market_slug, resolved, last_checked)
-                    VALUES (?, 0, ?)
-                """, (market_slug, int(datetime.now().timestamp())))
-                conn.commit()
-                conn.close()
-                return None
+                return unresolved_row, None
             
             market = data[0]  # API returns array
             
@@ -116,14 +169,7 @@ class TraderPerformance:
             
             if not is_closed or len(outcome_prices) < 2:
                 # Not resolved yet
-                cur.execute("""
-                    INSERT OR REPLACE INTO market_resolutions 
-                    (market_slug, resolved, last_checked)
-                    VALUES (?, 0, ?)
-                """, (market_slug, int(datetime.now().timestamp())))
-                conn.commit()
-                conn.close()
-                return None
+                return unresolved_row, None
             
             # Determine winner
             if float(outcome_prices[0]) > 0.98:
@@ -132,8 +178,7 @@ class TraderPerformance:
                 winning_index = 1
             else:
                 # Not clearly resolved
-                conn.close()
-                return None
+                return None, None
             
             winning_outcome = eval(market.get('outcomes', '[]'))[winning_index]
             
@@ -144,178 +189,320 @@ class TraderPerformance:
                 'outcome_prices': outcome_prices
             }
             
-            # Cache it
-            cur.execute("""
-                INSERT OR REPLACE INTO market_resolutions 
-                (market_slug, resolved, winning_outcome, winning_outcome_index, 
-                 outcome_prices, resolution_date, last_checked)
-                VALUES (?, 1, ?, ?, ?, ?, ?)
-            """, (market_slug, winning_outcome, winning_index, 
-                  str(outcome_prices), int(datetime.now().timestamp()),
-                  int(datetime.now().timestamp())))
-            
-            conn.commit()
-            conn.close()
-            return result
+            cache_row = (market_slug, 1, winning_outcome, winning_index,
+                         str(outcome_prices), now, now)
+            return cache_row, result
             
         except Exception as e:
             print(f"Error checking {market_slug}: {e}")
+            return None, None
+    
+    def _cache_resolutions(self, conn, cache_rows: List[tuple]):
+        """Write market_resolutions cache rows in one statement"""
+        conn.executemany("""
+            INSERT OR REPLACE INTO market_resolutions 
+            (market_slug, resolved, winning_outcome, winning_outcome_index, 
+             outcome_prices, resolution_date, last_checked)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, cache_rows)
+    
+    def refresh_market_activity(self, conn=None) -> int:
+        """
+        Fold trades added since the last refresh into market_activity
+        Returns number of new trades consumed
+        """
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(self.trades_db)
+        
+        consumed = trade_cursors.consume(conn, 'market_activity', self._fold_market_activity)
+        
+        if own_conn:
             conn.close()
-            return None
+        return consumed
+    
+    def _fold_market_activity(self, conn, start: int, end: int) -> int:
+        conn.execute(f"""
+            INSERT INTO market_activity (market_slug, first_trade, last_trade,
+                                         first_whale_trade, last_whale_trade,
+                                         whale_trade_count, whale_volume)
+            SELECT marketSlug,
+                   MIN(timestamp),
+                   MAX(timestamp),
+                   MIN(CASE WHEN whale THEN timestamp END),
+                   MAX(CASE WHEN whale THEN timestamp END),
+                   SUM(whale),
+                   SUM(CASE WHEN whale THEN sizeUsd ELSE 0 END)
+            FROM (
+                SELECT marketSlug, timestamp, sizeUsd, sizeUsd >= ? AS whale
+                FROM {trade_cursors.ARRIVED}
+                    AND marketSlug IS NOT NULL
+            )
+            GROUP BY marketSlug
+            ON CONFLICT(market_slug) DO UPDATE SET
+                first_trade = MIN(first_trade, excluded.first_trade),
+                last_trade = MAX(last_trade, excluded.last_trade),
+                first_whale_trade = COALESCE(MIN(first_whale_trade, excluded.first_whale_trade),
+                                             first_whale_trade, excluded.first_whale_trade),
+                last_whale_trade = COALESCE(MAX(last_whale_trade, excluded.last_whale_trade),
+                                            last_whale_trade, excluded.last_whale_trade),
+                whale_trade_count = whale_trade_count + excluded.whale_trade_count,
+                whale_volume = whale_volume + excluded.whale_volume
+        """, (WHALE_MIN_SIZE, start, end))
+        # Trades actually folded in: seq gaps, replaced ids and slug-less trades don't count
+        return conn.execute(f"""
+            SELECT COUNT(*) FROM {trade_cursors.ARRIVED}
+                AND marketSlug IS NOT NULL
+        """, (start, end)).fetchone()[0]
+    
+    def rebuild_market_activity(self):
+        """Recompute market_activity from scratch"""
+        conn = sqlite3.connect(self.trades_db)
+        trade_cursors.reset(conn, 'market_activity', ('market_activity',))
+        self.refresh_market_activity(conn)
+        conn.close()
     
     def detect_candidate_resolved_markets(self, days_inactive=3) -> List[str]:
-        """Find markets that likely resolved"""
+        """Find markets that likely resolved (no whale trades lately, not yet cached as resolved)"""
         conn = sqlite3.connect(self.trades_db)
-        cur = conn.cursor()
+        self.refresh_market_activity(conn)
+        conn.commit()
         
         cutoff = int((datetime.now() - timedelta(days=days_inactive)).timestamp())
         
+        cur = conn.cursor()
         cur.execute("""
-            SELECT DISTINCT marketSlug
-            FROM trades
-            WHERE sizeUsd >= 1000
-            AND timestamp < ?
-            GROUP BY marketSlug
-            HAVING MAX(timestamp) < ?
-        """, (cutoff, cutoff))
+            SELECT a.market_slug
+            FROM market_activity a
+            WHERE a.last_whale_trade < ?
+            AND NOT EXISTS (
+                SELECT 1 FROM market_resolutions r
+                WHERE r.market_slug = a.market_slug AND r.resolved = 1
+            )
+        """, (cutoff,))
         
         candidates = [row[0] for row in cur.fetchall()]
+        conn.close()
+        return candidates
+    
+    def process_resolved_market(self, market_slug: str, resolution: Dict, conn=None):
+        """
+        Calculate P&L for all whales with open positions
+        Pass conn to run inside a caller's transaction (caller commits)
+        """
+        self.process_resolved_markets({market_slug: resolution}, conn=conn)
+    
+    def process_resolved_markets(self, resolutions: Dict[str, Dict], conn=None):
+        """
+        Write resolution P&L for a batch of markets to resolution_ledger
+        One ledger row per (trader, market), replaced on reprocessing, so running
+        the same market twice never double-counts. whale_stats is then re-derived
+        for the affected traders from the ledger.
+        """
+        if not resolutions:
+            return
         
-        # Filter out already cached as resolved
-        filtered = []
-        for slug in candidates:
-            cur.execute("""
-                SELECT resolved FROM market_resolutions 
-                WHERE market_slug = ? AND resolved = 1
-            """, (slug,))
-            if not cur.fetchone():
-                filtered.append(slug)
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(self.trades_db)
+        cur = conn.cursor()
         
-        conn.close()
-        return filtered
+        # Open lots must reflect every trade before we settle them
+        self.lots.update(conn)
+        
+        ledger = {}
+        slugs = list(resolutions)
+        for i in range(0, len(slugs), SQL_PARAM_CHUNK):
+            chunk = slugs[i:i + SQL_PARAM_CHUNK]
+            cur.execute(f"""
+                SELECT trader, market_slug, outcome, price, size_remaining
+                FROM open_lots
+                WHERE market_slug IN ({','.join('?' * len(chunk))})
+            """, chunk)
+            
+            for trader, market_slug, outcome, price, shares in cur.fetchall():
+                winner = resolutions[market_slug]['winning_outcome']
+                if (outcome or '').lower() == winner.lower():
+                    pnl = (1.0 - price) * shares
+                    is_win = 1
+                else:
+                    pnl = (0.0 - price) * shares
+                    is_win = 0
+                
+                row = ledger.setdefault((trader, market_slug), [0.0, 0, 0, 0.0, winner])
+                row[0] += pnl
+                row[1] += 1
+                row[2] += is_win
+                row[3] += price * shares   # Cost basis
+        
+        # Traders on the replaced rows need re-deriving too
+        affected = {trader for trader, _ in ledger}
+        for i in range(0, len(slugs), SQL_PARAM_CHUNK):
+            chunk = slugs[i:i + SQL_PARAM_CHUNK]
+            cur.execute(f"""
+                SELECT DISTINCT trader FROM resolution_ledger
+                WHERE market_slug IN ({','.join('?' * len(chunk))})
+            """, chunk)
+            affected.update(row[0] for row in cur.fetchall())
+        
+        now = int(datetime.now().timestamp())
+        cur.executemany("DELETE FROM resolution_ledger WHERE market_slug = ?",
+                        [(slug,) for slug in slugs])
+        cur.executemany("""
+            INSERT INTO resolution_ledger (trader, market_slug, pnl, lot_count, wins,
+                                           volume, winning_outcome, resolved_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [key + tuple(row) + (now,) for key, row in ledger.items()])
+        
+        self._derive_whale_stats(conn, affected)
+        
+        if own_conn:
+            conn.commit()
+            conn.close()
     
-    def process_resolved_market(self, market_slug: str, resolution: Dict):
-        """Calculate P&L for all whales with open positions"""
-        conn = sqlite3.connect(self.trades_db)
+    def _derive_whale_stats(self, conn, traders=None):
+        """
+        Recompute whale_stats resolution fields from the ledger
+        traders=None rebuilds every trader with one aggregate query
+        """
         cur = conn.cursor()
+        aggregate = """
+            INSERT INTO whale_stats (trader, resolution_pnl, resolution_count,
+                                     resolution_wins, total_volume, last_updated)
+            SELECT trader, SUM(pnl), SUM(lot_count), SUM(wins), SUM(volume), strftime('%s', 'now')
+            FROM resolution_ledger
+            {where}
+            GROUP BY trader
+            ON CONFLICT(trader) DO UPDATE SET
+                resolution_pnl = excluded.resolution_pnl,
+                resolution_count = excluded.resolution_count,
+                resolution_wins = excluded.resolution_wins,
+                total_volume = excluded.total_volume,
+                last_updated = excluded.last_updated
+        """
         
+        if traders is None:
+            cur.execute("DELETE FROM whale_stats")
+            cur.execute(aggregate.format(where="WHERE 1"))
+            return
+        
+        traders = list(traders)
+        for i in range(0, len(traders), SQL_PARAM_CHUNK):
+            chunk = traders[i:i + SQL_PARAM_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            # Zero first so traders with no ledger rows left are cleared
+            cur.execute(f"""
+                UPDATE whale_stats
+                SET resolution_pnl = 0, resolution_count = 0, resolution_wins = 0, total_volume = 0
+                WHERE trader IN ({placeholders})
+            """, chunk)
+            cur.execute(aggregate.format(where=f"WHERE trader IN ({placeholders})"), chunk)
+    
+    def rebuild_resolution_stats(self) -> int:
+        """
+        Re-apply every cached resolution to the ledger and re-derive whale_stats
+        No API calls - uses market_resolutions. Returns markets processed.
+        """
+        conn = sqlite3.connect(self.trades_db)
+        cur = conn.cursor()
         cur.execute("""
-            SELECT trader, outcome, side, price, sizeUsd
-            FROM trades
-            WHERE marketSlug = ? AND sizeUsd >= 1000
-            ORDER BY trader, outcome, timestamp
-        """, (market_slug,))
-        
-        trades = cur.fetchall()
-        
-        whale_positions = defaultdict(lambda: defaultdict(list))
-        for trader, outcome, side, price, size in trades:
-            whale_positions[trader][outcome].append({
-                'side': side, 'price': price, 'size': size
-            })
-        
-        for trader, outcomes in whale_positions.items():
-            for outcome, trades_list in outcomes.items():
-                buys = [t for t in trades_list if t['side'] == 'BUY']
-                sells = [t for t in trades_list if t['side'] == 'SELL']
-                
-                matched = min(len(buys), len(sells))
-                open_buys = buys[matched:]
-                
-                for buy in open_buys:
-                    if outcome.lower() == resolution['winning_outcome'].lower():
-                        pnl = (1.0 - buy['price']) * buy['size']
-                        is_win = 1
-                    else:
-                        pnl = (0.0 - buy['price']) * buy['size']
-                        is_win = 0
-                    
-                    cur.execute("""
-                        INSERT INTO whale_stats (trader, resolution_pnl, resolution_count, 
-                                                resolution_wins, total_volume, last_updated)
-                        VALUES (?, ?, 1, ?, ?, ?)
-                        ON CONFLICT(trader) DO UPDATE SET
-                            resolution_pnl = resolution_pnl + ?,
-                            resolution_count = resolution_count + 1,
-                            resolution_wins = resolution_wins + ?,
-                            total_volume = total_volume + ?,
-                            last_updated = ?
-                    """, (trader, pnl, is_win, buy['size'], 
-                          int(datetime.now().timestamp()),
-                          pnl, is_win, buy['size'],
-                          int(datetime.now().timestamp())))
+            SELECT market_slug, winning_outcome FROM market_resolutions
+            WHERE resolved = 1 AND winning_outcome IS NOT NULL
+        """)
+        resolutions = {slug: {'resolved': True, 'winning_outcome': winner}
+                       for slug, winner in cur.fetchall()}
         
+        cur.execute("DELETE FROM resolution_ledger")
+        self.process_resolved_markets(resolutions, conn=conn)
+        self._derive_whale_stats(conn)  # Also drops traders with no resolutions left
         conn.commit()
         conn.close()
+        return len(resolutions)
     
-    def update_resolutions(self, limit=50):
-        """Find and process newly resolved markets"""
+    def update_resolutions(self, limit=None, workers=RESOLUTION_WORKERS):
+        """
+        Find and process newly resolved markets
+        Checks candidates concurrently (rate limited by http_client) and
+        writes results in batched transactions of RESOLUTION_BATCH markets
+        """
         print("🔍 Scanning for resolved markets...")
         candidates = self.detect_candidate_resolved_markets()
         
+        # Skip markets already checked (unresolved) in the last 24h
+        conn = sqlite3.connect(self.trades_db)
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT market_slug FROM market_resolutions
+            WHERE resolved = 0 AND last_checked > ?
+        """, (int((datetime.now() - timedelta(hours=24)).timestamp()),))
+        recently_checked = {row[0] for row in cur.fetchall()}
+        conn.close()
+        
+        candidates = [slug for slug in candidates if slug not in recently_checked]
+        if limit:
+            candidates = candidates[:limit]
+        
         if not candidates:
             print("   No new candidates found")
+            self.refresh_weight_index()
             return 0
         
-        print(f"   Found {len(candidates)} candidates to check")
+        print(f"   Found {len(candidates)} candidates to check ({workers} workers)")
         processed = 0
+        checked = 0
+        pending = []
         
-        for i, slug in enumerate(candidates[:limit], 1):
-            if i % 10 == 0:
-                print(f"   Checked {i}/{min(limit, len(candidates))}...")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self.fetch_market_resolution, slug): slug for slug in candidates}
             
-            resolution = self.check_market_resolution(slug)
-            if resolution:
-                print(f"   ✅ Resolved: {slug}")
-                self.process_resolved_market(slug, resolution)
-                processed += 1
+            for future in as_completed(futures):
+                slug = futures[future]
+                cache_row, resolution = future.result()
+                checked += 1
+                
+                if cache_row:
+                    pending.append((slug, cache_row, resolution))
+                if len(pending) >= RESOLUTION_BATCH:
+                    processed += self._write_resolution_batch(pending)
+                    pending = []
+                
+                if checked % 100 == 0:
+                    print(f"   Checked {checked}/{len(candidates)}...")
+        
+        if pending:
+            processed += self._write_resolution_batch(pending)
         
         print(f"✅ Processed {processed} newly resolved markets")
+        self.refresh_weight_index()
         return processed
     
-    def calculate_trade_pnl(self, trader: str) -> Dict:
-        """Case #1: Trade P&L from BUY/SELL pairs"""
+    def _write_resolution_batch(self, batch: List[Tuple[str, tuple, Optional[Dict]]]) -> int:
+        """Cache a batch of API results and apply resolved-market P&L in one transaction"""
         conn = sqlite3.connect(self.trades_db)
-        cur = conn.cursor()
-        
-        cur.execute("""
-            SELECT marketSlug, outcome, side, price, sizeUsd
-            FROM trades WHERE trader = ? AND sizeUsd >= 1000
-            ORDER BY marketSlug, outcome, timestamp
-        """, (trader,))
-        
-        trades = cur.fetchall()
-        conn.close()
-        
-        positions = defaultdict(lambda: defaultdict(list))
-        for market, outcome, side, price, size in trades:
-            positions[market][outcome].append({'side': side, 'price': price, 'size': size})
+        processed = 0
         
-        total_pnl = 0
-        closed_trades = 0
-        wins = 0
-        total_volume = 0
+        try:
+            self._cache_resolutions(conn, [cache_row for _, cache_row, _ in batch])
+            
+            resolved = {}
+            for slug, _, resolution in batch:
+                if resolution:
+                    print(f"   ✅ Resolved: {slug}")
+                    resolved[slug] = resolution
+            
+            self.process_resolved_markets(resolved, conn=conn)
+            processed = len(resolved)
+            
+            conn.commit()
+        finally:
+            conn.close()
         
-        for market, outcomes in positions.items():
-            for outcome, trades_list in outcomes.items():
-                buys = [t for t in trades_list if t['side'] == 'BUY']
-                sells = [t for t in trades_list if t['side'] == 'SELL']
-                
-                for i in range(min(len(buys), len(sells))):
-                    pnl = (sells[i]['price'] - buys[i]['price']) * min(buys[i]['size'], sells[i]['size'])
-                    total_pnl += pnl
-                    closed_trades += 1
-                    total_volume += min(buys[i]['size'], sells[i]['size'])
-                    if pnl > 0:
-                        wins += 1
-        
-        return {
-            'pnl': round(total_pnl, 2),
-            'trades': closed_trades,
-            'wins': wins,
-            'losses': closed_trades - wins,
-            'volume': round(total_volume, 2)
-        }
+        return processed
+    
+    def calculate_trade_pnl(self, trader: str) -> Dict:
+        """Case #1: Trade P&L from FIFO-matched BUY/SELL lots (incremental)"""
+        self.lots.update()
+        return _trade_stats_dict(self.lots.get_realized(trader))
     
     def get_trader_stats(self, trader: str) -> Dict:
         """Get complete stats (Case #1 + cached Case #2)"""
@@ -331,45 +518,31 @@ class TraderPerformance:
         row = cur.fetchone()
         conn.close()
         
-        if row:
-            res_pnl, res_count, res_wins, res_volume = row
-        else:
-            res_pnl, res_count, res_wins, res_volume = 0, 0, 0, 0
-        
-        total_pnl = trade_stats['pnl'] + res_pnl
-        total_closed = trade_stats['trades'] + res_count
-        total_wins = trade_stats['wins'] + res_wins
-        total_volume = trade_stats['volume'] + res_volume
-        
-        win_rate = total_wins / total_closed if total_closed > 0 else 0
-        roi = total_pnl / total_volume if total_volume > 0 else 0
-        
-        return {
-            'trader': trader,
-            'total_pnl': round(total_pnl, 2),
-            'total_closed': total_closed,
-            'total_wins': total_wins,
-            'total_losses': total_closed - total_wins,
-            'win_rate': round(win_rate, 3),
-            'roi': round(roi, 3),
-            'total_volume': round(total_volume, 2),
-            'trade_pnl': trade_stats['pnl'],
-            'trade_count': trade_stats['trades'],
-            'resolution_pnl': round(res_pnl, 2),
-            'resolution_count': res_count
-        }
+        return _combine_stats(trader, trade_stats, row)
     
     def get_trader_rankings(self, min_closed: int = 1) -> List[Tuple[str, Dict]]:
-        """Get all traders ranked by total P&L"""
+        """
+        Get all traders ranked by total P&L
+        Folds new trades into the lot books, then joins realized and
+        resolution stats from two bulk reads
+        """
         conn = sqlite3.connect(self.trades_db)
+        self.lots.update(conn)
+        
+        realized = self.lots.get_all_realized(conn)
+        
         cur = conn.cursor()
-        cur.execute("SELECT DISTINCT trader FROM trades WHERE sizeUsd >= 1000")
-        traders = [row[0] for row in cur.fetchall()]
+        cur.execute("""
+            SELECT trader, resolution_pnl, resolution_count, resolution_wins, total_volume
+            FROM whale_stats
+        """)
+        resolution_rows = {row[0]: row[1:] for row in cur.fetchall()}
         conn.close()
         
         rankings = []
-        for trader in traders:
-            stats = self.get_trader_stats(trader)
+        for trader in sorted(realized.keys() | resolution_rows.keys()):
+            stats = _combine_stats(trader, _trade_stats_dict(realized.get(trader)),
+                                   resolution_rows.get(trader))
             if stats['total_closed'] >= min_closed:
                 rankings.append((trader, stats))
         
@@ -378,17 +551,70 @@ class TraderPerformance:
     
     def get_whale_weight(self, trader: str) -> float:
         """Get signal boost weight (0.0 to 2.0)"""
-        stats = self.get_trader_stats(trader)
-        
-        if stats['total_closed'] < 3 or stats['total_pnl'] <= 0:
-            return 0.0
-        
-        pnl_weight = min(stats['total_pnl'] / 50000, 2.0)
-        winrate_weight = max(0, (stats['win_rate'] - 0.5) * 2)
-        roi_weight = min(stats['roi'] * 2, 1.0)
-        
-        weight = (pnl_weight * 0.5 + winrate_weight * 0.3 + roi_weight * 0.2)
-        return round(weight, 2)
+        return whale_weight_from_stats(self.get_trader_stats(trader))
+    
+    def refresh_weight_index(self) -> int:
+        """Rebuild the memory-mapped whale weight index next to trades.db"""
+        weights = {trader: whale_weight_from_stats(stats)
+                   for trader, stats in self.get_trader_rankings(min_closed=MIN_WEIGHT_CLOSED)}
+        path = whale_weights.default_index_path(self.trades_db)
+        count = whale_weights.write_index(weights, path)
+        print(f"⚖️  Whale weight index refreshed: {count} weighted traders")
+        return count
+
+
+def whale_weight_from_stats(stats: Dict) -> float:
+    """Signal boost weight (0.0 to 2.0) from get_trader_stats()-shaped stats"""
+    if stats['total_closed'] < MIN_WEIGHT_CLOSED or stats['total_pnl'] <= 0:
+        return 0.0
+    
+    pnl_weight = min(stats['total_pnl'] / 50000, 2.0)
+    winrate_weight = max(0, (stats['win_rate'] - 0.5) * 2)
+    roi_weight = min(stats['roi'] * 2, 1.0)
+    
+    weight = (pnl_weight * 0.5 + winrate_weight * 0.3 + roi_weight * 0.2)
+    return round(weight, 2)
+
+def _trade_stats_dict(realized: Optional[tuple]) -> Dict:
+    """Shape a trader_realized row (or None) as Case #1 stats"""
+    total_pnl, closed_trades, wins, total_volume = realized or (0, 0, 0, 0)
+    return {
+        'pnl': round(total_pnl, 2),
+        'trades': closed_trades,
+        'wins': wins,
+        'losses': closed_trades - wins,
+        'volume': round(total_volume, 2)
+    }
+
+def _combine_stats(trader: str, trade_stats: Dict, resolution_row: Optional[tuple]) -> Dict:
+    """Merge Case #1 trade stats with a whale_stats row (Case #2)"""
+    if resolution_row:
+        res_pnl, res_count, res_wins, res_volume = resolution_row
+    else:
+        res_pnl, res_count, res_wins, res_volume = 0, 0, 0, 0
+    
+    total_pnl = trade_stats['pnl'] + res_pnl
+    total_closed = trade_stats['trades'] + res_count
+    total_wins = trade_stats['wins'] + res_wins
+    total_volume = trade_stats['volume'] + res_volume
+    
+    win_rate = total_wins / total_closed if total_closed > 0 else 0
+    roi = total_pnl / total_volume if total_volume > 0 else 0
+    
+    return {
+        'trader': trader,
+        'total_pnl': round(total_pnl, 2),
+        'total_closed': total_closed,
+        'total_wins': total_wins,
+        'total_losses': total_closed - total_wins,
+        'win_rate': round(win_rate, 3),
+        'roi': round(roi, 3),
+        'total_volume': round(total_volume, 2),
+        'trade_pnl': trade_stats['pnl'],
+        'trade_count': trade_stats['trades'],
+        'resolution_pnl': round(res_pnl, 2),
+        'resolution_count': res_count
+    }
 
 
 if __name__ == '__main__':
@@ -4,7 +4,10 @@ Daily Whale Profitability Update
 Checks for newly resolved markets and updates whale stats
 """
 
+import sys
+
 from trader_performance import TraderPerformance
+from wallet_features import WalletFeatureStore
 
 if __name__ == '__main__':
     print("🐋 Daily Whale Profitability Update")
@@ -13,8 +16,19 @@ if __name__ == '__main__':
     
     tp = TraderPerformance()
     
-    # Check for newly resolved markets (fast, only checks ~10-50 candidates)
-    new_resolutions = tp.update_resolutions(limit=100)
+    # Full rebuild of resolution P&L from cached resolutions (no API calls)
+    if len(sys.argv) > 1 and sys.argv[1] == 'rebuild':
+        markets = tp.rebuild_resolution_stats()
+        print(f"✅ Rebuilt whale_stats from {markets} resolved markets")
+        sys.exit(0)
+    
+    # Keep rolling wallet features current (new trades only)
+    folded = WalletFeatureStore(tp.trades_db).update()
+    print(f"📇 Wallet features: folded in {folded} new trades")
+    print()
+    
+    # Check all candidate markets concurrently (no per-run cap)
+    new_resolutions = tp.update_resolutions()
     
     if new_resolutions > 0:
         print()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Volume Baselines
+Per-minute volume aggregates and rolling hourly-volume baselines per market,
+maintained in trades.db from a trade arrival cursor (Python counterpart of
+src/strategies/volume_spike_detector.ts, without the JSON history file)
+
+Baselines are Welford mean/variance over closed hours, with idle hours merged
+in as zeros and the sample count capped at BASELINE_HOURS so old history
+fades out. A spike scan is one query over the last hour of minute buckets.
+
+Usage:
+    python3 volume_baselines.py            # fold in new trades
+    python3 volume_baselines.py rebuild    # recompute from full history
+"""
+
+import math
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import trade_cursors
+from event_flow import net_yes_flow
+
+TRADES_DB = '/home/clawdbot/polymarket_runtime/data/trades.db'
+CURSOR_NAME = 'volume_baselines'
+BASELINE_HOURS = 168       # ~1 week of hourly observations
+MINUTE_RETENTION = 2 * 86400
+
+BASELINE_COLUMNS = ('n', 'mean', 'm2', 'open_hour', 'open_volume', 'market_question', 'yes_price')
+
+
+def welford_merge(n, mean, m2, n_b, mean_b, m2_b):
+    """Combine two (count, mean, M2) summaries (Chan et al.)"""
+    total = n + n_b
+    if total == 0:
+        return 0, 0.0, 0.0
+    delta = mean_b - mean
+    mean += delta * n_b / total
+    m2 += m2_b + delta * delta * n * n_b / total
+    return total, mean, m2
+
+
+def close_hours(b: Dict, volume: float, zero_hours: int):
+    """Fold one closed hour (plus any idle hours after it) into a baseline"""
+    for n_b, mean_b in ((1, volume), (zero_hours, 0.0)):
+        if n_b <= 0:
+            continue
+        # Cap history so the baseline keeps rolling instead of freezing
+        if b['n'] + n_b > BASELINE_HOURS:
+            keep = max(BASELINE_HOURS - n_b, 0)
+            scale = keep / b['n'] if b['n'] else 0
+            b['n'], b['m2'] = keep, b['m2'] * scale
+            n_b = min(n_b, BASELINE_HOURS)
+        b['n'], b['mean'], b['m2'] = welford_merge(b['n'], b['mean'], b['m2'], n_b, mean_b, 0.0)
+
+
+class VolumeBaselines:
+    """Incrementally maintained minute volumes and hourly baselines per market"""
+
+    def __init__(self, trades_db=TRADES_DB):
+        self.trades_db = trades_db
+        self._ensure_tables()
+
+    def _ensure_tables(self):
+        conn = sqlite3.connect(self.trades_db)
+        cur = conn.cursor()
+
+        # Recent per-minute volume and net Yes flow (pruned after MINUTE_RETENTION)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS market_volume_minutes (
+                market_slug TEXT NOT NULL,
+                minute INTEGER NOT NULL,
+                volume REAL DEFAULT 0,
+                net_yes REAL DEFAULT 0,
+                trades INTEGER DEFAULT 0,
+                PRIMARY KEY (market_slug, minute)
+            )
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_volume_minutes_minute ON market_volume_minutes(minute)
+        """)
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS market_volume_baselines (
+                market_slug TEXT PRIMARY KEY,
+                n INTEGER DEFAULT 0,
+                mean REAL DEFAULT 0,
+                m2 REAL DEFAULT 0,
+                open_hour INTEGER,
+                open_volume REAL DEFAULT 0,
+                market_question TEXT,
+                yes_price REAL
+            )
+        """)
+        trade_cursors.ensure_table(conn)
+
+        conn.commit()
+        conn.close()
+
+    def update(self, conn=None) -> int:
+        """Fold trades added since the last run; returns trades processed"""
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(self.trades_db)
+
+        try:
+            processed = trade_cursors.consume(conn, CURSOR_NAME, self._consume)
+
+            conn.execute("DELETE FROM market_volume_minutes WHERE minute < ?",
+                         (int(time.time()) - MINUTE_RETENTION,))
+            conn.commit()
+        finally:
+            if own_conn:
+                conn.close()
+
+        return processed
+
+    def rebuild(self) -> int:
+        """Drop minute buckets and baselines and replay every trade"""
+        conn = sqlite3.connect(self.trades_db)
+        trade_cursors.reset(conn, CURSOR_NAME, ('market_volume_minutes', 'market_volume_baselines'))
+
+        processed = self.update(conn)
+        conn.close()
+        return processed
+
+    def _consume(self, conn, start, end) -> int:
+        rows = conn.execute(f"""
+            SELECT marketSlug, COALESCE(marketQuestion, 'Unknown'), outcome, side,
+                   price, sizeUsd, timestamp
+            FROM {trade_cursors.ARRIVED}
+                AND marketSlug IS NOT NULL
+            ORDER BY timestamp, f.seq
+        """, (start, end)).fetchall()
+        self._apply(conn, rows)
+        return len(rows)
+
+    def _apply(self, conn, rows):
+        if not rows:
+            return
+
+        cur = conn.cursor()
+        baselines = {}
+        for market in {row[0] for row in rows}:
+            row = cur.execute(f"""
+                SELECT {', '.join(BASELINE_COLUMNS)} FROM market_volume_baselines
+                WHERE market_slug = ?
+            """, (market,)).fetchone()
+            if row:
+                baselines[market] = dict(zip(BASELINE_COLUMNS, row))
+
+        minutes = defaultdict(lambda: [0.0, 0.0, 0])  # (market, minute) -> volume, net_yes, trades
+        for market, question, outcome, side, price, size, ts in rows:
+            bucket = minutes[(market, ts // 60 * 60)]
+            bucket[0] += size
+            bucket[1] += net_yes_flow(outcome, side, size)
+            bucket[2] += 1
+
+            hour = ts // 3600 * 3600
+            b = baselines.get(market)
+            if b is None:
+                b = baselines[market] = {'n': 0, 'mean': 0.0, 'm2': 0.0, 'open_hour': hour,
+                                         'open_volume': 0.0, 'market_question': question,
+                                         'yes_price': None}
+            if hour > b['open_hour']:
+                close_hours(b, b['open_volume'], (hour - b['open_hour']) // 3600 - 1)
+                b['open_hour'], b['open_volume'] = hour, 0.0
+            if hour == b['open_hour']:
+                b['open_volume'] += size
+            # Late trades for already-closed hours only land in the minute buckets
+
+            b['market_question'] = question
+            if outcome == 'Yes':
+                b['yes_price'] = price
+            elif outcome == 'No':
+                b['yes_price'] = round(1 - price, 4)
+
+        cur.executemany("""
+            INSERT INTO market_volume_minutes (market_slug, minute, volume, net_yes, trades)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(market_slug, minute) DO UPDATE SET
+                volume = volume + excluded.volume,
+                net_yes = net_yes + excluded.net_yes,
+                trades = trades + excluded.trades
+        """, [key + tuple(v) for key, v in minutes.items()])
+
+        cur.executemany(f"""
+            INSERT OR REPLACE INTO market_volume_baselines (market_slug, {', '.join(BASELINE_COLUMNS)})
+            VALUES (?{', ?' * len(BASELINE_COLUMNS)})
+        """, [(market,) + tuple(b[c] for c in BASELINE_COLUMNS) for market, b in baselines.items()])
+
+    def get_recent_activity(self, window_seconds: int = 3600, now: int = None) -> List[Dict]:
+        """Volume in the last window per active market, joined with its hourly baseline"""
+        now = int(time.time()) if now is None else now
+
+        conn = sqlite3.connect(self.trades_db)
+        rows = conn.execute("""
+            SELECT m.market_slug, SUM(m.volume), SUM(m.net_yes), SUM(m.trades),
+                   b.n, b.mean, b.m2, b.market_question, b.yes_price
+            FROM market_volume_minutes m
+            JOIN market_volume_baselines b ON b.market_slug = m.market_slug
+            WHERE m.minute >= ?
+            GROUP BY m.market_slug
+        """, (now - window_seconds,)).fetchall()
+        conn.close()
+
+        return [{
+            'market_slug': slug,
+            'volume': volume,
+            'net_yes': net_yes,
+            'trades': trades,
+            'baseline_hours': n,
+            'baseline_mean': mean,
+            'baseline_std': math.sqrt(m2 / (n - 1)) if n > 1 else 0.0,
+            'market_question': question,
+            'yes_price': yes_price
+        } for slug, volume, net_yes, trades, n, mean, m2, question, yes_price in rows]
+
+
+if __name__ == '__main__':
+    baselines = VolumeBaselines()
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'rebuild':
+        print("🔁 Rebuilding volume baselines from full trade history...")
+        print(f"✅ Processed {baselines.rebuild()} trades")
+    else:
+        print(f"✅ Folded {baselines.update()} new trades into volume baselines")
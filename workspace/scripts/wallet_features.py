@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Wallet Feature Store
+Rolling per-wallet features kept in trades.db and updated from new trades only:
+7d/30d volume and trade counts (exponentially decayed), lifetime volume and
+count, average trade size, markets touched, typical hold time, first seen
+
+Updated by this script's batch run (alongside co_trading.py); the whale
+cluster detectors open the store with readonly=True and read features for
+the wallets in each cluster.
+
+Usage:
+    python3 wallet_features.py            # fold in new trades (batch job)
+    python3 wallet_features.py rebuild    # recompute from full history
+    python3 wallet_features.py show 0xabc...
+"""
+
+import math
+import sqlite3
+import sys
+import time
+from typing import Dict, Iterable, Optional
+
+import trade_cursors
+
+TRADES_DB = '/home/clawdbot/polymarket_runtime/data/trades.db'
+CURSOR_NAME = 'wallet_features'
+SQL_PARAM_CHUNK = 500
+
+TAU_7D = 7 * 86400        # Decay time constants (seconds)
+TAU_30D = 30 * 86400
+
+FEATURE_COLUMNS = ('first_seen', 'last_seen', 'trade_count', 'total_volume',
+                   'vol_7d', 'vol_30d', 'cnt_7d', 'cnt_30d',
+                   'markets_touched', 'hold_time_sum', 'hold_count')
+
+
+def _decay(value: float, elapsed: float, tau: float) -> float:
+    return value * math.exp(-max(elapsed, 0) / tau)
+
+
+class WalletFeatureStore:
+    """Incrementally maintained wallet_features table"""
+
+    def __init__(self, trades_db=TRADES_DB, readonly=False):
+        self.trades_db = trades_db
+        self.readonly = readonly
+        if not readonly:
+            self._ensure_tables()
+
+    def _ensure_tables(self):
+        conn = sqlite3.connect(self.trades_db)
+        cur = conn.cursor()
+
+        # Decayed aggregates are stored as of last_seen and decayed on read
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS wallet_features (
+                trader TEXT PRIMARY KEY,
+                first_seen INTEGER,
+                last_seen INTEGER,
+                trade_count INTEGER DEFAULT 0,
+                total_volume REAL DEFAULT 0,
+                vol_7d REAL DEFAULT 0,
+                vol_30d REAL DEFAULT 0,
+                cnt_7d REAL DEFAULT 0,
+                cnt_30d REAL DEFAULT 0,
+                markets_touched INTEGER DEFAULT 0,
+                hold_time_sum REAL DEFAULT 0,
+                hold_count INTEGER DEFAULT 0
+            )
+        """)
+
+        # Per-(wallet, market) entry/exit times for markets_touched and hold time
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS wallet_markets (
+                trader TEXT NOT NULL,
+                market_slug TEXT NOT NULL,
+                first_trade INTEGER,
+                first_buy INTEGER,
+                PRIMARY KEY (trader, market_slug)
+            )
+        """)
+        trade_cursors.ensure_table(conn)
+
+        conn.commit()
+        conn.close()
+
+    def update(self, conn=None) -> int:
+        """Fold trades added since the last run into the features; returns trades processed"""
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(self.trades_db)
+
+        try:
+            processed = trade_cursors.consume(conn, CURSOR_NAME, self._consume)
+        finally:
+            if own_conn:
+                conn.close()
+
+        return processed
+
+    def rebuild(self) -> int:
+        """Recompute every wallet's features from full history"""
+        conn = sqlite3.connect(self.trades_db)
+        trade_cursors.reset(conn, CURSOR_NAME, ('wallet_features', 'wallet_markets'))
+
+        processed = self.update(conn)
+        conn.close()
+        return processed
+
+    def _consume(self, conn, start, end) -> int:
+        rows = conn.execute(f"""
+            SELECT trader, marketSlug, side, sizeUsd, timestamp
+            FROM {trade_cursors.ARRIVED}
+            ORDER BY timestamp, f.seq
+        """, (start, end)).fetchall()
+        self._apply(conn, rows)
+        return len(rows)
+
+    def _apply(self, conn, rows):
+        if not rows:
+            return
+
+        cur = conn.cursor()
+        traders = list({row[0] for row in rows})
+        features = self._load(cur, traders)
+        markets = {}
+
+        for i in range(0, len(traders), SQL_PARAM_CHUNK):
+            chunk = traders[i:i + SQL_PARAM_CHUNK]
+            cur.execute(f"""
+                SELECT trader, market_slug, first_trade, first_buy FROM wallet_markets
+                WHERE trader IN ({','.join('?' * len(chunk))})
+            """, chunk)
+            for trader, market, first_trade, first_buy in cur.fetchall():
+                markets[(trader, market)] = [first_trade, first_buy]
+
+        touched_markets = set()
+        for trader, market, side, size, ts in rows:
+            f = features.get(trader)
+            if f is None:
+                f = dict.fromkeys(FEATURE_COLUMNS, 0)
+                f['first_seen'] = ts
+                f['last_seen'] = ts
+                features[trader] = f
+
+            # Decay stored aggregates to this trade (or the trade back to last_seen if late)
+            elapsed = ts - f['last_seen']
+            if elapsed >= 0:
+                for key, tau in (('vol_7d', TAU_7D), ('cnt_7d', TAU_7D),
+                                 ('vol_30d', TAU_30D), ('cnt_30d', TAU_30D)):
+                    f[key] = _decay(f[key], elapsed, tau)
+                f['last_seen'] = ts
+                weight_7d = weight_30d = 1.0
+            else:
+                weight_7d = _decay(1.0, -elapsed, TAU_7D)
+                weight_30d = _decay(1.0, -elapsed, TAU_30D)
+
+            f['vol_7d'] += size * weight_7d
+            f['cnt_7d'] += weight_7d
+            f['vol_30d'] += size * weight_30d
+            f['cnt_30d'] += weight_30d
+            f['trade_count'] += 1
+            f['total_volume'] += size
+            f['first_seen'] = min(f['first_seen'], ts)
+
+            if market is None:
+                continue
+
+            key = (trader, market)
+            entry = markets.get(key)
+            if entry is None:
+                entry = markets[key] = [ts, None]
+                f['markets_touched'] += 1
+            entry[0] = min(entry[0], ts)
+
+            if side == 'BUY':
+                if entry[1] is None or ts < entry[1]:
+                    entry[1] = ts
+            elif side == 'SELL' and entry[1] is not None and ts >= entry[1]:
+                # Hold time: first entry into the market until this exit
+                f['hold_time_sum'] += ts - entry[1]
+                f['hold_count'] += 1
+            touched_markets.add(key)
+
+        cur.executemany(f"""
+            INSERT OR REPLACE INTO wallet_features (trader, {', '.join(FEATURE_COLUMNS)})
+            VALUES (?{', ?' * len(FEATURE_COLUMNS)})
+        """, [(trader,) + tuple(f[c] for c in FEATURE_COLUMNS) for trader, f in features.items()])
+
+        cur.executemany("""
+            INSERT OR REPLACE INTO wallet_markets (trader, market_slug, first_trade, first_buy)
+            VALUES (?, ?, ?, ?)
+        """, [key + tuple(markets[key]) for key in touched_markets])
+
+    def _load(self, cur, traders) -> Dict[str, Dict]:
+        features = {}
+        for i in range(0, len(traders), SQL_PARAM_CHUNK):
+            chunk = traders[i:i + SQL_PARAM_CHUNK]
+            cur.execute(f"""
+                SELECT trader, {', '.join(FEATURE_COLUMNS)} FROM wallet_features
+                WHERE trader IN ({','.join('?' * len(chunk))})
+            """, chunk)
+            for row in cur.fetchall():
+                features[row[0]] = dict(zip(FEATURE_COLUMNS, row[1:]))
+        return features
+
+    def get_features(self, trader: str, now: Optional[int] = None) -> Optional[Dict]:
+        """Features for one wallet as of now (None if never seen)"""
+        return self.get_many([trader], now).get(trader)
+
+    def get_many(self, traders: Iterable[str], now: Optional[int] = None) -> Dict[str, Dict]:
+        """Features for many wallets (primary-key lookups), decayed to now"""
+        now = int(time.time()) if now is None else now
+        if self.readonly:
+            conn = sqlite3.connect(f"file:{self.trades_db}?mode=ro", uri=True)
+            if not conn.execute("""
+                SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'wallet_features'
+            """).fetchone():
+                conn.close()
+                return {}
+        else:
+            conn = sqlite3.connect(self.trades_db)
+        rows = self._load(conn.cursor(), list(set(traders)))
+        conn.close()
+
+        return {trader: _present(f, now) for trader, f in rows.items()}
+
+
+def _present(f: Dict, now: int) -> Dict:
+    """Decay stored aggregates to `now` and derive the reported features"""
+    elapsed = now - f['last_seen']
+    vol_7d = _decay(f['vol_7d'], elapsed, TAU_7D)
+    cnt_7d = _decay(f['cnt_7d'], elapsed, TAU_7D)
+    vol_30d = _decay(f['vol_30d'], elapsed, TAU_30D)
+    cnt_30d = _decay(f['cnt_30d'], elapsed, TAU_30D)
+
+    return {
+        'first_seen': f['first_seen'],
+        'last_seen': f['last_seen'],
+        'wallet_age_days': round((now - f['first_seen']) / 86400, 2),
+        'volume_7d': round(vol_7d, 2),
+        'volume_30d': round(vol_30d, 2),
+        'trades_7d': round(cnt_7d, 2),
+        'trades_30d': round(cnt_30d, 2),
+        'trade_count': f['trade_count'],
+        'total_volume': round(f['total_volume'], 2),
+        'avg_trade_size': round(f['total_volume'] / f['trade_count'], 2) if f['trade_count'] else 0,
+        'markets_touched': f['markets_touched'],
+        'avg_hold_hours': round(f['hold_time_sum'] / f['hold_count'] / 3600, 2) if f['hold_count'] else None
+    }
+
+
+if __name__ == '__main__':
+    store = WalletFeatureStore()
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'rebuild':
+        print("🔁 Rebuilding wallet features from full trade history...")
+        print(f"✅ Processed {store.rebuild()} trades")
+    elif len(sys.argv) > 2 and sys.argv[1] == 'show':
+        features = store.get_features(sys.argv[2])
+        if not features:
+            print(f"❌ No features for {sys.argv[2]}")
+        else:
+            for key, value in features.items():
+                print(f"   {key}: {value}")
+    else:
+        print(f"✅ Folded {store.update()} new trades into wallet features")
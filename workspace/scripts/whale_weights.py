@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Whale Weight Index
+Precomputed trader -> signal boost weight (0.0 to 2.0), persisted next to
+trades.db and memory-mapped on load so detectors can weight every whale
+trade without querying trader history
+
+File layout (little-endian):
+    magic 'WWIX' | version u32 | count u32 | blob_len u32
+    count x float32 weights | (count + 1) x u32 trader offsets into blob |
+    blob of concatenated UTF-8 trader addresses (sorted)
+Only traders with a non-zero weight are stored; everyone else is 0.0.
+Lookups bisect the sorted addresses in the mapping itself, so loading costs
+nothing beyond the header and memory stays shared with the page cache.
+"""
+
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from typing import Dict, Iterable, List
+
+MAGIC = b'WWIX'
+VERSION = 2
+HEADER = struct.Struct('<4sIII')
+WEIGHT = struct.Struct('<f')
+OFFSET = struct.Struct('<I')
+INDEX_FILENAME = 'whale_weights.idx'
+
+
+def default_index_path(trades_db: str) -> str:
+    return os.path.join(os.path.dirname(trades_db), INDEX_FILENAME)
+
+
+def write_index(weights: Dict[str, float], path: str) -> int:
+    """Write non-zero weights atomically; returns number of traders stored"""
+    keys = sorted(t.encode('utf-8') for t, w in weights.items() if w > 0)
+    offsets = [0]
+    for key in keys:
+        offsets.append(offsets[-1] + len(key))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(keys), offsets[-1]))
+        f.write(struct.pack(f'<{len(keys)}f', *(weights[k.decode('utf-8')] for k in keys)))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        f.write(b''.join(keys))
+    os.replace(tmp_path, path)
+
+    return len(keys)
+
+
+class _SortedTraders:
+    """Sequence view of the sorted trader addresses inside the mapping (for bisect)"""
+
+    def __init__(self, mm, count: int, offsets_at: int, blob_at: int):
+        self.mm = mm
+        self.count = count
+        self.offsets_at = offsets_at
+        self.blob_at = blob_at
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> bytes:
+        start, end = struct.unpack_from('<2I', self.mm, self.offsets_at + 4 * i)
+        return self.mm[self.blob_at + start:self.blob_at + end]
+
+
+class WhaleWeightIndex:
+    """Read-only trader -> weight lookups backed by a memory-mapped index file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mm = None
+        self.traders = []
+
+        if not os.path.exists(path) or os.path.getsize(path) < HEADER.size:
+            return
+
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, blob_len = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION:
+            mm.close()
+            return
+
+        # The writer replaces the file rather than rewriting it, so the
+        # mapping stays valid for as long as this index is in use
+        self.mm = mm
+        offsets_at = HEADER.size + WEIGHT.size * count
+        self.traders = _SortedTraders(mm, count, offsets_at, offsets_at + OFFSET.size * (count + 1))
+
+    def __len__(self) -> int:
+        return len(self.traders)
+
+    def get(self, trader: str) -> float:
+        """Weight for one trader (0.0 if unknown or unprofitable)"""
+        key = trader.encode('utf-8')
+        i = bisect_left(self.traders, key)
+        if i == len(self.traders) or self.traders[i] != key:
+            return 0.0
+        return round(WEIGHT.unpack_from(self.mm, HEADER.size + WEIGHT.size * i)[0], 2)
+
+    def lookup_many(self, traders: Iterable[str]) -> List[float]:
+        """Weights for a batch of traders, in order"""
+        memo = {}
+        weights = []
+        for trader in traders:
+            if trader not in memo:
+                memo[trader] = self.get(trader)
+            weights.append(memo[trader])
+        return weights
+
+
+_loaded = {}
+
+def load_index(trades_db: str) -> WhaleWeightIndex:
+    """Load (and cache per process) the index that lives next to trades_db"""
+    path = default_index_path(trades_db)
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+
+    cached = _loaded.get(path)
+    if cached is None or cached[0] != mtime:
+        _loaded[path] = (mtime, WhaleWeightIndex(path))
+    return _loaded[path][1]